@@ -4,6 +4,7 @@ import importlib
 import logging
 import os
 import sys
+import threading
 from types import SimpleNamespace
 from typing import Any, Callable, Optional
 
@@ -35,6 +36,8 @@ from .startup import (
 tk: Any = SimpleNamespace(Tk=None)
 TrayController: Any = None
 LayoutOnlyEngine: Any = None
+# Imported on a background thread while settings, logging and the engine are set up on the main thread.
+_UI_PREWARM_MODULES = ("tkinter", f"{__name__.rsplit('.', 1)[0]}.ui", "pystray", "PIL.Image", "PIL.ImageDraw")
 
 
 def _load_ui_dependencies() -> None:
@@ -49,6 +52,22 @@ def _load_ui_dependencies() -> None:
         TrayController = _TrayController
 
 
+def _prewarm_ui_imports() -> None:
+    # Only fills sys.modules; failures are left for the main-thread import paths to report.
+    for name in _UI_PREWARM_MODULES:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            continue
+
+
+def _start_ui_prewarm() -> None:
+    try:
+        threading.Thread(target=_prewarm_ui_imports, name="ui-prewarm", daemon=True).start()
+    except Exception:
+        pass
+
+
 def _load_engine_dependencies() -> None:
     global LayoutOnlyEngine
     if LayoutOnlyEngine is None:
@@ -194,6 +213,8 @@ def main(argv: Optional[list[str]] = None) -> int:
             report_path=args.self_check_report,
             strict=bool(args.strict_self_check),
         )
+    if not (args.dump_tree or args.dump_tree_series):
+        _start_ui_prewarm()
 
     ensure_runtime_files()
     settings = LayoutSettingsV11.load()
@@ -20,9 +20,11 @@ from .storage import (
     _coerce_int,
     _coerce_str,
     _coerce_str_list,
+    _ensure_dir,
     _json_with_trailing_newline,
     _load_json_object,
     _self_heal_broken_json,
+    _write_text_if_changed,
     _write_text_if_missing,
 )
 from .warnings import _is_mojibake_text, _push_load_warning, _warn_if_rules_text_corrupted, consume_load_warnings
@@ -57,7 +59,7 @@ def get_runtime_paths(create: bool = False) -> RuntimePaths:
         log_file=_runtime_path_override("LOG_FILE", _INITIAL_RUNTIME_PATHS.log_file, default_paths.log_file),
     )
     if create:
-        Path(paths.appdata_dir).mkdir(parents=True, exist_ok=True)
+        _ensure_dir(paths.appdata_dir)
     return paths
 
 
@@ -70,26 +72,46 @@ def get_app_data_dir() -> str:
 
 
 def _ensure_from_template(dst: str, default_text: str) -> None:
-    if os.path.exists(dst):
-        return
-    os.makedirs(os.path.dirname(dst), exist_ok=True)
     src = os.path.join(resource_base_dir(), os.path.basename(dst))
+    # Open the bundled template directly; a missing template is just another fallback to the default.
     try:
-        if os.path.exists(src):
-            with open(src, "r", encoding="utf-8") as f:
-                content = f.read()
-        else:
-            content = default_text
+        with open(src, "r", encoding="utf-8") as f:
+            content = f.read()
     except Exception:
         content = default_text
+    # _write_text_if_missing creates the directory and never clobbers a file created meanwhile.
     _write_text_if_missing(dst, _json_with_trailing_newline(content))
 
 
+def _listed_names(directory: str, listings: dict[str, set[str]]) -> set[str]:
+    names = listings.get(directory)
+    if names is None:
+        try:
+            with os.scandir(directory) as it:
+                names = {entry.name for entry in it}
+        except OSError:
+            names = set()
+        listings[directory] = names
+    return names
+
+
 def ensure_runtime_files() -> None:
     paths = get_runtime_paths(create=True)
-    _ensure_from_template(paths.settings_file, LayoutSettingsV11.default_json())
-    _ensure_from_template(paths.rules_file, LayoutRulesV11.default_json())
-    if not os.path.exists(paths.log_file):
+    # One directory listing decides which files are missing; a file created after the listing is left to
+    # _write_text_if_missing's exclusive create rather than re-checked here.
+    listings: dict[str, set[str]] = {}
+    missing = {
+        path
+        for path in (paths.settings_file, paths.rules_file, paths.log_file)
+        if os.path.basename(path) not in _listed_names(os.path.dirname(path) or ".", listings)
+    }
+    if not missing:
+        return
+    if paths.settings_file in missing:
+        _ensure_from_template(paths.settings_file, LayoutSettingsV11.default_json())
+    if paths.rules_file in missing:
+        _ensure_from_template(paths.rules_file, LayoutRulesV11.default_json())
+    if paths.log_file in missing:
         _write_text_if_missing(paths.log_file, "")
 
 
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import json
 from dataclasses import asdict, dataclass, field
-from typing import List, cast
+from typing import Any, ClassVar, Dict, List, Optional, Tuple, Union
 
 
 def _config_module():
@@ -11,6 +11,33 @@ def _config_module():
     return config_module
 
 
+_Bound = Optional[Union[int, float]]
+_SchemaEntry = Tuple[str, type, _Bound, _Bound]
+
+
+def _apply_schema(config_module: Any, raw: Dict[str, Any], defaults: Any, schema: Tuple[_SchemaEntry, ...]) -> Dict[str, Any]:
+    coerce_bool = config_module._coerce_bool
+    coerce_int = config_module._coerce_int
+    coerce_float = config_module._coerce_float
+    coerce_str = config_module._coerce_str
+    coerce_str_list = config_module._coerce_str_list
+    get = raw.get
+    values: Dict[str, Any] = {}
+    for name, kind, minimum, maximum in schema:
+        default = getattr(defaults, name)
+        if kind is bool:
+            values[name] = coerce_bool(get(name), default)
+        elif kind is int:
+            values[name] = coerce_int(get(name), default, minimum=minimum, maximum=maximum)
+        elif kind is float:
+            values[name] = coerce_float(get(name), default, minimum=minimum, maximum=maximum)
+        elif kind is str:
+            values[name] = coerce_str(get(name), default)
+        else:
+            values[name] = coerce_str_list(get(name), default)
+    return values
+
+
 @dataclass
 class LayoutSettingsV11:
     enabled: bool = True
@@ -22,9 +49,34 @@ class LayoutSettingsV11:
     cache_cleanup_interval_ms: int = 1000
     burst_scan_iterations: int = 3
     burst_scan_interval_ms: int = 20
+    stable_scan_ticks: int = 20
+    stable_poll_interval_ms: int = 200
+    stable_max_poll_interval_ms: int = 1000
+    win_event_hooks: bool = True
+    event_keepalive_interval_ms: int = 5000
     aggressive_mode: bool = True
     log_level: str = "INFO"
 
+    # (field, type, minimum, maximum); defaults come from the dataclass itself.
+    _SCHEMA: ClassVar[Tuple[_SchemaEntry, ...]] = (
+        ("enabled", bool, None, None),
+        ("run_on_startup", bool, None, None),
+        ("start_minimized", bool, None, None),
+        ("poll_interval_ms", int, 50, 5000),
+        ("idle_poll_interval_ms", int, 200, 5000),
+        ("pid_scan_interval_ms", int, 100, 5000),
+        ("cache_cleanup_interval_ms", int, 250, 10000),
+        ("burst_scan_iterations", int, 0, 20),
+        ("burst_scan_interval_ms", int, 10, 1000),
+        ("stable_scan_ticks", int, 0, 1000),
+        ("stable_poll_interval_ms", int, 50, 5000),
+        ("stable_max_poll_interval_ms", int, 50, 10000),
+        ("win_event_hooks", bool, None, None),
+        ("event_keepalive_interval_ms", int, 1000, 60000),
+        ("aggressive_mode", bool, None, None),
+        ("log_level", str, None, None),
+    )
+
     @classmethod
     def load(cls, path: str | None = None) -> "LayoutSettingsV11":
         config_module = _config_module()
@@ -35,54 +87,14 @@ class LayoutSettingsV11:
         raw = config_module._load_json_object(resolved_path, label, default_text=defaults.default_json())
         if raw is None:
             return defaults
-        return cls(
-            enabled=config_module._coerce_bool(raw.get("enabled"), defaults.enabled),
-            run_on_startup=config_module._coerce_bool(raw.get("run_on_startup"), defaults.run_on_startup),
-            start_minimized=config_module._coerce_bool(raw.get("start_minimized"), defaults.start_minimized),
-            poll_interval_ms=config_module._coerce_int(
-                raw.get("poll_interval_ms"),
-                defaults.poll_interval_ms,
-                minimum=50,
-                maximum=5000,
-            ),
-            idle_poll_interval_ms=config_module._coerce_int(
-                raw.get("idle_poll_interval_ms"),
-                defaults.idle_poll_interval_ms,
-                minimum=200,
-                maximum=5000,
-            ),
-            pid_scan_interval_ms=config_module._coerce_int(
-                raw.get("pid_scan_interval_ms"),
-                defaults.pid_scan_interval_ms,
-                minimum=100,
-                maximum=5000,
-            ),
-            cache_cleanup_interval_ms=config_module._coerce_int(
-                raw.get("cache_cleanup_interval_ms"),
-                defaults.cache_cleanup_interval_ms,
-                minimum=250,
-                maximum=10000,
-            ),
-            burst_scan_iterations=config_module._coerce_int(
-                raw.get("burst_scan_iterations"),
-                defaults.burst_scan_iterations,
-                minimum=0,
-                maximum=20,
-            ),
-            burst_scan_interval_ms=config_module._coerce_int(
-                raw.get("burst_scan_interval_ms"),
-                defaults.burst_scan_interval_ms,
-                minimum=10,
-                maximum=1000,
-            ),
-            aggressive_mode=config_module._coerce_bool(raw.get("aggressive_mode"), defaults.aggressive_mode),
-            log_level=config_module._coerce_str(raw.get("log_level"), defaults.log_level).upper(),
-        )
+        values = _apply_schema(config_module, raw, defaults, cls._SCHEMA)
+        values["log_level"] = values["log_level"].upper()
+        return cls(**values)
 
     def save(self, path: str | None = None) -> None:
         config_module = _config_module()
         payload = json.dumps(asdict(self), indent=2, ensure_ascii=False) + "\n"
-        config_module._atomic_write_text(path or config_module.get_runtime_paths().settings_file, payload)
+        config_module._write_text_if_changed(path or config_module.get_runtime_paths().settings_file, payload)
 
     @classmethod
     def default_json(cls) -> str:
@@ -119,9 +131,43 @@ class LayoutRulesV11:
     cache_ttl_seconds: float = 8.0
     log_rate_limit_seconds: float = 8.0
 
+    # Window classes and banner height bounds depend on each other and are resolved in load().
+    _SCHEMA: ClassVar[Tuple[_SchemaEntry, ...]] = (
+        ("main_window_titles", list, None, None),
+        ("main_view_prefix", str, None, None),
+        ("lock_view_prefix", str, None, None),
+        ("eva_child_class", str, None, None),
+        ("custom_scroll_prefix", str, None, None),
+        ("chrome_legacy_title", str, None, None),
+        ("chrome_legacy_title_contains", list, None, None),
+        ("chrome_widget_prefixes", list, None, None),
+        ("popup_ad_classes", list, None, None),
+        ("popup_search_depth", int, 1, 2),
+        ("popup_host_text_contains", list, None, None),
+        ("popup_host_require_empty_text", bool, None, None),
+        ("aggressive_ad_tokens", list, None, None),
+        ("banner_min_width_ratio", float, 0.1, 1.0),
+        ("banner_bottom_margin_px", int, 0, None),
+        ("hide_bottom_banner_without_token", bool, None, None),
+        ("close_empty_eva_child_requires_ad_signal", bool, None, None),
+        ("layout_shadow_padding_px", int, 0, None),
+        ("main_view_padding_px", int, 0, None),
+        ("weak_signal_confirm_ticks", int, 1, 10),
+        ("hidden_restore_grace_ms", int, 0, 5000),
+        ("cache_ttl_seconds", float, 0.1, None),
+        ("log_rate_limit_seconds", float, 0.1, None),
+    )
+
     @property
-    def aggressive_ad_tokens_lc(self) -> List[str]:
-        return [t.lower() for t in self.aggressive_ad_tokens]
+    def aggressive_ad_tokens_lc(self) -> Tuple[str, ...]:
+        # Lowered once per distinct token list value (in-place edits included); kept outside the
+        # dataclass fields so asdict()/save() skip it.
+        tokens = tuple(self.aggressive_ad_tokens)
+        cached = self.__dict__.get("_aggressive_ad_tokens_lc")
+        if cached is None or cached[0] != tokens:
+            cached = (tokens, tuple(t.lower() for t in tokens))
+            self.__dict__["_aggressive_ad_tokens_lc"] = cached
+        return cached[1]
 
     @classmethod
     def load(cls, path: str | None = None) -> "LayoutRulesV11":
@@ -157,95 +203,13 @@ class LayoutRulesV11:
                 "layout_rules_v11.json banner 높이 범위(min/max)가 역전되어 자동 교정했습니다."
             )
 
+        values = _apply_schema(config_module, raw, defaults, cls._SCHEMA)
         rules = cls(
             main_window_classes=main_window_classes,
             ad_candidate_classes=ad_candidate_classes,
-            main_window_titles=config_module._coerce_str_list(raw.get("main_window_titles"), defaults.main_window_titles),
-            main_view_prefix=config_module._coerce_str(raw.get("main_view_prefix"), defaults.main_view_prefix),
-            lock_view_prefix=config_module._coerce_str(raw.get("lock_view_prefix"), defaults.lock_view_prefix),
-            eva_child_class=config_module._coerce_str(raw.get("eva_child_class"), defaults.eva_child_class),
-            custom_scroll_prefix=config_module._coerce_str(raw.get("custom_scroll_prefix"), defaults.custom_scroll_prefix),
-            chrome_legacy_title=config_module._coerce_str(raw.get("chrome_legacy_title"), defaults.chrome_legacy_title),
-            chrome_legacy_title_contains=config_module._coerce_str_list(
-                raw.get("chrome_legacy_title_contains"),
-                defaults.chrome_legacy_title_contains,
-            ),
-            chrome_widget_prefixes=config_module._coerce_str_list(
-                raw.get("chrome_widget_prefixes"),
-                defaults.chrome_widget_prefixes,
-            ),
-            popup_ad_classes=config_module._coerce_str_list(raw.get("popup_ad_classes"), defaults.popup_ad_classes),
-            popup_search_depth=config_module._coerce_int(
-                raw.get("popup_search_depth"),
-                defaults.popup_search_depth,
-                minimum=1,
-                maximum=2,
-            ),
-            popup_host_text_contains=config_module._coerce_str_list(
-                raw.get("popup_host_text_contains"),
-                defaults.popup_host_text_contains,
-            ),
-            popup_host_require_empty_text=config_module._coerce_bool(
-                raw.get("popup_host_require_empty_text"),
-                defaults.popup_host_require_empty_text,
-            ),
-            aggressive_ad_tokens=config_module._coerce_str_list(
-                raw.get("aggressive_ad_tokens"),
-                defaults.aggressive_ad_tokens,
-            ),
             banner_min_height_px=banner_min_height_px,
             banner_max_height_px=banner_max_height_px,
-            banner_min_width_ratio=config_module._coerce_float(
-                raw.get("banner_min_width_ratio"),
-                defaults.banner_min_width_ratio,
-                minimum=0.1,
-                maximum=1.0,
-            ),
-            banner_bottom_margin_px=config_module._coerce_int(
-                raw.get("banner_bottom_margin_px"),
-                defaults.banner_bottom_margin_px,
-                minimum=0,
-            ),
-            hide_bottom_banner_without_token=config_module._coerce_bool(
-                raw.get("hide_bottom_banner_without_token"),
-                defaults.hide_bottom_banner_without_token,
-            ),
-            close_empty_eva_child_requires_ad_signal=config_module._coerce_bool(
-                raw.get("close_empty_eva_child_requires_ad_signal"),
-                defaults.close_empty_eva_child_requires_ad_signal,
-            ),
-            layout_shadow_padding_px=config_module._coerce_int(
-                raw.get("layout_shadow_padding_px"),
-                defaults.layout_shadow_padding_px,
-                minimum=0,
-            ),
-            main_view_padding_px=config_module._coerce_int(
-                raw.get("main_view_padding_px"),
-                defaults.main_view_padding_px,
-                minimum=0,
-            ),
-            weak_signal_confirm_ticks=config_module._coerce_int(
-                raw.get("weak_signal_confirm_ticks"),
-                defaults.weak_signal_confirm_ticks,
-                minimum=1,
-                maximum=10,
-            ),
-            hidden_restore_grace_ms=config_module._coerce_int(
-                raw.get("hidden_restore_grace_ms"),
-                defaults.hidden_restore_grace_ms,
-                minimum=0,
-                maximum=5000,
-            ),
-            cache_ttl_seconds=config_module._coerce_float(
-                raw.get("cache_ttl_seconds"),
-                defaults.cache_ttl_seconds,
-                minimum=0.1,
-            ),
-            log_rate_limit_seconds=config_module._coerce_float(
-                raw.get("log_rate_limit_seconds"),
-                defaults.log_rate_limit_seconds,
-                minimum=0.1,
-            ),
+            **values,
         )
         config_module._warn_if_rules_text_corrupted(rules, "layout_rules_v11.json")
         return rules
@@ -253,7 +217,7 @@ class LayoutRulesV11:
     def save(self, path: str | None = None) -> None:
         config_module = _config_module()
         payload = json.dumps(asdict(self), indent=2, ensure_ascii=False) + "\n"
-        config_module._atomic_write_text(path or config_module.get_runtime_paths().rules_file, payload)
+        config_module._write_text_if_changed(path or config_module.get_runtime_paths().rules_file, payload)
 
     @classmethod
     def default_json(cls) -> str:
@@ -7,13 +7,15 @@ import shutil
 import tempfile
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, List
+from typing import Any, List, Tuple, Union
 
 from .warnings import _push_load_warning
 
 BROKEN_BACKUP_KEEP_COUNT = 10
 BROKEN_BACKUP_MAX_AGE_DAYS = 30
 _BROKEN_SUFFIX_RE = re.compile(r"\.broken-(\d{8}-\d{6})$")
+# Directories already created by this process; a write that still hits a missing directory re-creates it.
+_ENSURED_DIRS: set[str] = set()
 
 
 def _coerce_bool(value: Any, default: bool) -> bool:
@@ -55,14 +57,26 @@ def _coerce_str_list(value: Any, default: List[str]) -> List[str]:
     return out if out else list(default)
 
 
+def _ensure_dir(directory: str) -> None:
+    if directory in _ENSURED_DIRS:
+        return
+    os.makedirs(directory, exist_ok=True)
+    _ENSURED_DIRS.add(directory)
+
+
 def _atomic_write_text(path: str, text: str) -> None:
     directory = os.path.dirname(path) or "."
-    os.makedirs(directory, exist_ok=True)
+    _ensure_dir(directory)
     prefix = f".{os.path.basename(path)}."
-    fd, temp_path = tempfile.mkstemp(prefix=prefix, suffix=".tmp", dir=directory)
     try:
-        with os.fdopen(fd, "w", encoding="utf-8", newline="\n") as f:
-            f.write(text)
+        fd, temp_path = tempfile.mkstemp(prefix=prefix, suffix=".tmp", dir=directory)
+    except FileNotFoundError:
+        _ENSURED_DIRS.discard(directory)
+        _ensure_dir(directory)
+        fd, temp_path = tempfile.mkstemp(prefix=prefix, suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(text.encode("utf-8"))
             f.flush()
             os.fsync(f.fileno())
         os.replace(temp_path, path)
@@ -74,48 +88,115 @@ def _atomic_write_text(path: str, text: str) -> None:
         raise
 
 
+def _write_text_if_changed(path: str, text: str) -> bool:
+    import kakao_adblocker.config as config_module
+
+    # Reading a few hundred bytes is far cheaper than the fsync + replace of an atomic write.
+    # A size mismatch already proves a change, so the file is only opened when it could match,
+    # and then compared as raw bytes without decoding a second copy of the old text.
+    data = text.encode("utf-8")
+    try:
+        if os.stat(path).st_size == len(data):
+            with open(path, "rb") as f:
+                if f.read() == data:
+                    return False
+    except OSError:
+        # Missing or unreadable files just get rewritten; bytes are compared, so nothing is decoded.
+        pass
+    config_module._atomic_write_text(path, text)
+    return True
+
+
 def _write_text_if_missing(path: str, text: str) -> None:
     directory = os.path.dirname(path) or "."
-    os.makedirs(directory, exist_ok=True)
+    _ensure_dir(directory)
     try:
-        with open(path, "x", encoding="utf-8", newline="\n") as f:
-            f.write(text)
+        try:
+            f = open(path, "x", encoding="utf-8", newline="\n")
+        except FileNotFoundError:
+            _ENSURED_DIRS.discard(directory)
+            _ensure_dir(directory)
+            f = open(path, "x", encoding="utf-8", newline="\n")
     except FileExistsError:
         return
+    with f:
+        f.write(text)
 
 
 def _json_with_trailing_newline(text: str) -> str:
     return text if text.endswith("\n") else f"{text}\n"
 
 
-def _backup_broken_json(path: str, label: str, reason: str) -> bool:
-    if not os.path.exists(path):
-        _push_load_warning(f"{label} 손상 감지: {reason}. 원본 파일이 없어 백업을 건너뜁니다.")
-        return False
+def _link_or_copy(src: str, dst: str) -> None:
+    try:
+        os.link(src, dst)
+    except FileNotFoundError:
+        raise
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _detach_backup(backup_path: str) -> None:
+    # Turns a hard-linked backup into its own file, so later in-place writes to the original leave it alone.
+    temp_path = f"{backup_path}.tmp"
+    try:
+        shutil.copy2(backup_path, temp_path)
+        os.replace(temp_path, backup_path)
+    except OSError:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+
+
+def _write_broken_backup(path: str, label: str, reason: str, link: bool) -> str | None:
     timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
     backup_path = f"{path}.broken-{timestamp}"
     try:
-        shutil.copy2(path, backup_path)
+        if link:
+            _link_or_copy(path, backup_path)
+        else:
+            shutil.copy2(path, backup_path)
         _push_load_warning(f"{label} 손상 감지: {reason}. 백업 생성: {backup_path}.")
         _cleanup_broken_backups(path, label)
-        return True
+        return backup_path
+    except FileNotFoundError:
+        _push_load_warning(f"{label} 손상 감지: {reason}. 원본 파일이 없어 백업을 건너뜁니다.")
+        return None
     except Exception as exc:
         _push_load_warning(f"{label} 손상 감지: {reason}. 백업 실패({exc.__class__.__name__}).")
         _cleanup_broken_backups(path, label)
-        return False
+        return None
+
+
+def _backup_broken_json(path: str, label: str, reason: str) -> bool:
+    return _write_broken_backup(path, label, reason, link=False) is not None
 
 
-def _self_heal_broken_json(path: str, label: str, default_text: str) -> None:
+def _self_heal_broken_json(path: str, label: str, default_text: str) -> bool:
     import kakao_adblocker.config as config_module
 
     try:
         config_module._atomic_write_text(path, _json_with_trailing_newline(default_text))
         _push_load_warning(f"{label} 자동 복구 성공: 기본값 JSON으로 재생성했습니다.")
+        return True
     except Exception as exc:
         _push_load_warning(f"{label} 자동 복구 실패({exc.__class__.__name__}). 기본값으로 동작합니다.")
+        return False
 
 
-def _backup_timestamp(path: Path) -> datetime:
+def _recover_broken_json(path: str, label: str, reason: str, default_text: str | None) -> None:
+    if default_text is None:
+        _backup_broken_json(path, label, reason)
+        return
+    # Self-heal swaps a new file in via os.replace, so a hard link keeps the broken bytes without copying;
+    # if the original stays in place the backup must not keep sharing its inode.
+    backup_path = _write_broken_backup(path, label, reason, link=True)
+    if not _self_heal_broken_json(path, label, default_text) and backup_path is not None:
+        _detach_backup(backup_path)
+
+
+def _backup_timestamp(path: Union[Path, "os.DirEntry[str]"]) -> datetime:
     match = _BROKEN_SUFFIX_RE.search(path.name)
     if match:
         try:
@@ -131,33 +212,38 @@ def _backup_timestamp(path: Path) -> datetime:
 def _cleanup_broken_backups(path: str, label: str) -> None:
     base_path = Path(path)
     parent = base_path.parent
-    pattern = f"{base_path.name}.broken-*"
+    prefix = f"{base_path.name}.broken-"
     now = datetime.now()
     max_age = timedelta(days=BROKEN_BACKUP_MAX_AGE_DAYS)
 
     try:
-        backups = list(parent.glob(pattern))
+        with os.scandir(parent) as it:
+            entries = [
+                (backup, _backup_timestamp(backup))
+                for backup in it
+                if backup.name.startswith(prefix) and backup.is_file()
+            ]
+    except FileNotFoundError:
+        return
     except Exception as exc:
         _push_load_warning(f"{label} 백업 정리 실패({exc.__class__.__name__}).")
         return
 
-    for backup in backups:
-        backup_time = _backup_timestamp(backup)
+    keep: List[Tuple["os.DirEntry[str]", datetime]] = []
+    for backup, backup_time in entries:
         if now - backup_time <= max_age:
+            keep.append((backup, backup_time))
             continue
         try:
-            backup.unlink()
+            os.unlink(backup.path)
         except Exception as exc:
             _push_load_warning(f"{label} 백업 정리 실패: {backup.name} ({exc.__class__.__name__})")
+            keep.append((backup, backup_time))
 
-    keep = sorted(
-        [p for p in parent.glob(pattern) if p.exists()],
-        key=_backup_timestamp,
-        reverse=True,
-    )
-    for old in keep[BROKEN_BACKUP_KEEP_COUNT:]:
+    keep.sort(key=lambda entry: entry[1], reverse=True)
+    for old, _ in keep[BROKEN_BACKUP_KEEP_COUNT:]:
         try:
-            old.unlink()
+            os.unlink(old.path)
         except Exception as exc:
             _push_load_warning(f"{label} 백업 정리 실패: {old.name} ({exc.__class__.__name__})")
 
@@ -169,13 +255,9 @@ def _load_json_object(path: str, label: str, default_text: str | None = None) ->
     except FileNotFoundError:
         return None
     except Exception as exc:
-        _backup_broken_json(path, label, f"JSON 파싱 실패({exc.__class__.__name__})")
-        if default_text is not None:
-            _self_heal_broken_json(path, label, default_text)
+        _recover_broken_json(path, label, f"JSON 파싱 실패({exc.__class__.__name__})", default_text)
         return None
     if not isinstance(raw, dict):
-        _backup_broken_json(path, label, "최상위 타입이 object(dict)가 아님")
-        if default_text is not None:
-            _self_heal_broken_json(path, label, default_text)
+        _recover_broken_json(path, label, "최상위 타입이 object(dict)가 아님", default_text)
         return None
     return raw
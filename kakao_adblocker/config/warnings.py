@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import re
 import threading
 from typing import TYPE_CHECKING, List
 
@@ -13,6 +14,8 @@ _LOAD_WARNINGS_LOCK = threading.Lock()
 _MOJIBAKE_KAKAOTALK = "\u79fb\ub301\ubb45?\u317d\ub11a"
 _MOJIBAKE_AD = "\u613f\ubb0e\ud02c"
 _MOJIBAKE_SIGNATURES = (_MOJIBAKE_KAKAOTALK, _MOJIBAKE_AD)
+# The replacement character and every signature checked in one regex scan.
+_MOJIBAKE_RE = re.compile("|".join(re.escape(text) for text in ("\ufffd", *_MOJIBAKE_SIGNATURES)))
 
 
 def _push_load_warning(message: str) -> None:
@@ -30,9 +33,7 @@ def consume_load_warnings() -> List[str]:
 def _is_mojibake_text(value: str) -> bool:
     if not value:
         return False
-    if "\ufffd" in value:
-        return True
-    return any(signature in value for signature in _MOJIBAKE_SIGNATURES)
+    return _MOJIBAKE_RE.search(value) is not None
 
 
 def _warn_if_rules_text_corrupted(rules: "LayoutRulesV11", source_label: str) -> None:
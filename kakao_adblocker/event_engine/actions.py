@@ -3,7 +3,7 @@ from __future__ import annotations
 import time
 from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
 
-from ..protocols import Rect, WindowIdentity
+from ..protocols import Rect, WindowIdentity, WindowMove
 from ..win32_api import SW_HIDE, SW_SHOW, SWP_NOACTIVATE, SWP_NOSIZE, SWP_NOZORDER, WM_CLOSE
 from .constants import (
     ACTION_HIDE,
@@ -29,6 +29,7 @@ class WindowActionExecutor:
 
         with self.engine._data_lock:
             main_handles = list(self.engine._main_window_handles)
+            main_identities = set(self.engine._main_window_identities)
             candidates = list(self.engine._ad_subwindow_candidates)
             kakao_pids = set(self.engine._kakao_pids)
 
@@ -40,70 +41,90 @@ class WindowActionExecutor:
         popup_zero_size_fallbacks = 0
         now = time.time()
         matched_hidden_identities: Set[WindowIdentity] = set()
-        legacy_text_memo: Dict[Tuple[int, str, int], bool] = {}
-        legacy_contains_memo: Dict[Tuple[int, str, int], bool] = {}
-        ad_token_memo: Dict[Tuple[int, int, bool], bool] = {}
+        legacy_memo: Dict[int, str] = {}
+        ad_token_memo: Dict[Tuple[int, bool], bool] = {}
         custom_scroll_memo: Dict[WindowIdentity, bool] = {}
+        # Coarse snapshot of the windows this pass saw; if it stops changing the watch loop backs off.
+        tree_signature: List[object] = [tuple(sorted(kakao_pids)), tuple(sorted(main_handles)), tuple(sorted(candidates))]
+
+        # The per-child loops below run for every child of every main window on every pass; bind the
+        # lookups and per-pass settings once instead of resolving them through self.engine each time.
+        engine = self.engine
+        is_stopping = engine._is_stopping
+        is_window = engine.api.is_window
+        get_window_rect = engine.api.get_window_rect
+        get_pid = engine._get_pid
+        get_class = engine._get_class
+        get_text = engine._get_text
+        has_tracked_state = engine._has_tracked_state
+        signals = engine._signals
+        layout = engine._layout
+        aggressive_mode = bool(engine.settings.aggressive_mode)
+        check_legacy_signal = bool(engine.rules.close_empty_eva_child_requires_ad_signal)
+        eva_child_class = engine.rules.eva_child_class
 
         for wnd in main_handles:
-            if self.engine._is_stopping():
+            if is_stopping():
                 return
-            if not self.engine.api.is_window(wnd):
+            if not is_window(wnd):
                 continue
-            pid = self.engine.api.get_window_thread_process_id(wnd)
+            pid = get_pid(wnd)
             if pid not in kakao_pids:
                 continue
-            parent_rect = self.engine.api.get_window_rect(wnd)
+            parent_rect = get_window_rect(wnd)
             if not parent_rect:
                 continue
-            if not self.engine._scanner.is_confirmed_main_window(wnd):
+            parent_class_name = get_class(wnd)
+            # Trust the watch pass's confirmation while the handle still names the same window.
+            if (wnd, pid, parent_class_name) not in main_identities and not engine._scanner.is_confirmed_main_window(wnd):
                 continue
-            parent_class_name = self.engine._get_class(wnd)
 
-            children = self.engine._scanner.enum_children(wnd)
-            parent_text = self.engine._get_text(wnd, pid, parent_class_name)
+            children = engine._scanner.direct_children(wnd)
+            parent_text = get_text(wnd, pid, parent_class_name)
             main_window_has_ad_signal = False
+            # View resizes of this window's children are committed together after the child loop.
+            view_moves: List[WindowMove] = []
             child_contexts: List[Tuple[int, WindowIdentity, str, str, Optional[Rect], AdDecision]] = []
 
             for child in children:
-                if self.engine._is_stopping():
+                if is_stopping():
                     return
-                if not self.engine.api.is_window(child):
-                    continue
-                if self.engine.api.get_parent(child) != wnd:
+                # GetClassNameW fails for a destroyed handle and every live window has a class, so
+                # the class lookup doubles as the liveness check and saves an IsWindow call per child.
+                class_name = get_class(child)
+                if not class_name:
                     continue
-                class_name = self.engine._get_class(child)
                 identity = (child, pid, class_name)
-                window_text = self.engine._get_text(child, pid, class_name)
+                window_text = get_text(child, pid, class_name)
                 child_rect: Optional[Rect] = None
-                aggressive_decision = self.engine._signals.decision_none()
+                aggressive_decision = signals.decision_none()
                 legacy_kind = ""
-                if self.engine.settings.aggressive_mode:
-                    child_rect = self.engine.api.get_window_rect(child)
+                if aggressive_mode:
+                    child_rect = get_window_rect(child)
                     if child_rect:
-                        has_prior_state = (
-                            self.engine._candidate_state(identity) is not None
-                            or self.engine._is_hidden_identity(identity)
-                        )
-                        has_ad_token = self.engine._signals.subtree_contains_ad_token(
-                            child,
-                            memo=ad_token_memo,
-                            fresh_text=has_prior_state,
-                        )
-                        aggressive_decision = self.engine._signals.aggressive_hide_decision(
+                        has_ad_token = False
+                        # Every aggressive hide requires a Chrome widget, so other subtrees are never walked.
+                        if layout.is_chrome_widget_class(class_name):
+                            has_prior_state = has_tracked_state(identity)
+                            has_ad_token = signals.subtree_contains_ad_token(
+                                child,
+                                memo=ad_token_memo,
+                                fresh_text=has_prior_state,
+                            )
+                        aggressive_decision = signals.aggressive_hide_decision(
                             class_name,
                             child_rect,
                             parent_rect,
                             has_ad_token,
                         )
-                if self.engine.rules.close_empty_eva_child_requires_ad_signal:
-                    legacy_kind = self.engine._signals.legacy_signature_kind(
+                if check_legacy_signal:
+                    legacy_kind = signals.legacy_signature_kind(
                         child,
-                        memo_exact=legacy_text_memo,
-                        memo_contains=legacy_contains_memo,
+                        memo=legacy_memo,
                     )
                 if legacy_kind or aggressive_decision.matched:
                     main_window_has_ad_signal = True
+                tree_signature.append((identity, window_text, child_rect))
                 child_contexts.append(
                     (
                         child,
@@ -115,49 +136,50 @@ class WindowActionExecutor:
                     )
                 )
 
+            tree_signature.append((wnd, parent_rect, parent_text))
+
             for child, identity, class_name, window_text, child_rect, aggressive_decision in child_contexts:
-                if self.engine._is_stopping():
+                if is_stopping():
                     return
-                if class_name == self.engine.rules.eva_child_class and window_text == "" and parent_text != "":
+                if class_name == eva_child_class and window_text == "" and parent_text != "":
                     has_custom_scroll = custom_scroll_memo.get(identity)
                     if has_custom_scroll is None:
-                        has_custom_scroll = self.engine._signals.class_name_starts_with(
+                        has_custom_scroll = signals.class_name_starts_with(
                             child,
-                            self.engine.rules.custom_scroll_prefix,
+                            engine.rules.custom_scroll_prefix,
                         )
                         custom_scroll_memo[identity] = has_custom_scroll
-                    close_decision = self.engine._signals.empty_eva_close_decision(
+                    close_decision = signals.empty_eva_close_decision(
                         class_name,
                         window_text,
                         parent_text,
                         has_custom_scroll,
                         main_window_has_ad_signal,
                     )
-                    if close_decision.matched or self.engine._candidate_state(identity) is not None:
-                        _close_state, close_confirmed = self.engine._update_candidate_state(identity, close_decision, now)
+                    if close_decision.matched or engine._candidate_state(identity) is not None:
+                        _close_state, close_confirmed = engine._update_candidate_state(identity, close_decision, now)
                         if close_confirmed:
-                            if not self.engine._can_mutate_windows():
+                            if not engine._can_mutate_windows():
                                 return
                             if self.close_window(child, "empty-eva-close"):
                                 closed += 1
-                    elif self.engine._signals.has_relevant_signal(close_decision):
-                        self.engine._update_candidate_state(identity, close_decision, now)
-                    if close_decision.matched and self.engine._is_hidden_identity(identity):
+                    elif signals.has_relevant_signal(close_decision):
+                        engine._update_candidate_state(identity, close_decision, now)
+                    if close_decision.matched and engine._is_hidden_identity(identity):
                         matched_hidden_identities.add(identity)
 
-                if not self.engine._can_mutate_windows():
-                    return
-                if self.engine._layout.apply_view_resize(child, window_text, parent_rect):
-                    resized += 1
+                view_move = layout.view_resize_move(child, window_text, parent_rect, current_rect=child_rect)
+                if view_move is not None:
+                    view_moves.append(view_move)
 
-                if not self.engine.settings.aggressive_mode or child_rect is None:
+                if not aggressive_mode or child_rect is None:
                     continue
-                if aggressive_decision.matched or self.engine._candidate_state(identity) is not None or self.engine._is_hidden_identity(identity):
-                    _aggressive_state, aggressive_confirmed = self.engine._update_candidate_state(identity, aggressive_decision, now)
-                    if aggressive_decision.matched and self.engine._is_hidden_identity(identity):
+                if aggressive_decision.matched or has_tracked_state(identity):
+                    _aggressive_state, aggressive_confirmed = engine._update_candidate_state(identity, aggressive_decision, now)
+                    if aggressive_decision.matched and engine._is_hidden_identity(identity):
                         matched_hidden_identities.add(identity)
                     if aggressive_confirmed and aggressive_decision.action == ACTION_HIDE:
-                        if not self.engine._can_mutate_windows():
+                        if not engine._can_mutate_windows():
                             return
                         hidden_ok, hide_applied = self.ensure_window_hidden(
                             child,
@@ -170,23 +192,27 @@ class WindowActionExecutor:
                             if hide_applied:
                                 hidden += 1
 
+            if view_moves:
+                if not engine._can_mutate_windows():
+                    return
+                resized += layout.apply_view_moves(view_moves)
+
         for wnd in candidates:
             if self.engine._is_stopping():
                 return
             if not self.engine.api.is_window(wnd):
                 continue
-            pid = self.engine.api.get_window_thread_process_id(wnd)
+            pid = self.engine._get_pid(wnd)
             if pid not in kakao_pids:
                 continue
             class_name = self.engine._get_class(wnd)
             identity = (wnd, pid, class_name)
             legacy_kind = self.engine._signals.legacy_signature_kind(
                 wnd,
-                memo_exact=legacy_text_memo,
-                memo_contains=legacy_contains_memo,
+                memo=legacy_memo,
             )
             legacy_decision = self.engine._signals.legacy_hide_decision(legacy_kind)
-            if legacy_decision.matched or self.engine._candidate_state(identity) is not None or self.engine._is_hidden_identity(identity):
+            if legacy_decision.matched or self.engine._has_tracked_state(identity):
                 _legacy_state, legacy_confirmed = self.engine._update_candidate_state(identity, legacy_decision, now)
                 if legacy_decision.matched and self.engine._is_hidden_identity(identity):
                     matched_hidden_identities.add(identity)
@@ -211,12 +237,17 @@ class WindowActionExecutor:
             popup_hide_fallbacks,
             popup_zero_size_fallbacks,
             popup_matched_identities,
-        ) = self.remove_popup_ads(kakao_pids, now=now)
+        ) = self.remove_popup_ads(kakao_pids, now=now, main_identities=main_identities)
         hidden += popup_hidden
         closed += popup_closed
         matched_hidden_identities.update(popup_matched_identities)
 
         self.restore_no_longer_matched_hidden_windows(matched_hidden_identities, now=now)
+        tree_signature.append(tuple(sorted(matched_hidden_identities)))
+        self.engine._note_tree_signature(
+            tuple(tree_signature),
+            changed=bool(resized or hidden or closed or popup_close_requests),
+        )
 
         with self.engine._state_lock:
             self.engine._state.resized_windows += resized
@@ -267,14 +298,14 @@ class WindowActionExecutor:
         self.engine._note_candidate_snapshot(identity, tracked_snapshot)
 
     def _is_hidden_with_reason(self, identity: WindowIdentity, hide_reason: str) -> bool:
-        with self.engine._cache_lock:
-            snapshot = self.engine._hidden_windows.get(identity)
+        snapshot = self.engine._hidden_windows.get(identity)
         return bool(snapshot and snapshot.hide_reason == hide_reason)
 
     def remove_popup_ads(
         self,
         kakao_pids: Set[int],
         now: Optional[float] = None,
+        main_identities: Optional[Set[WindowIdentity]] = None,
     ) -> Tuple[int, int, int, int, int, Set[WindowIdentity]]:
         if not kakao_pids or not self.engine._popup_ad_class_set or not self.engine._can_mutate_windows():
             return 0, 0, 0, 0, 0, set()
@@ -288,14 +319,16 @@ class WindowActionExecutor:
         handled_hwnds: Set[int] = set()
         decision_time = now or time.time()
 
-        for item in self.engine._scanner.collect_windows(kakao_pids):
+        for item in self.engine._scanner.collect_top_level_windows(kakao_pids):
             if self.engine._is_stopping():
                 return hidden, closed, close_requests, hide_fallbacks, zero_size_fallbacks, matched_identities
             if item.parent_hwnd != 0:
                 continue
+            host_identity = (item.hwnd, item.pid, item.class_name)
+            if main_identities and host_identity in main_identities:
+                continue
             if self.engine._scanner.is_confirmed_main_window(item.hwnd, item=item):
                 continue
-            host_identity = (item.hwnd, item.pid, item.class_name)
             host_hidden_popup = self._is_hidden_with_reason(host_identity, HIDE_REASON_POPUP)
             if not self.engine.api.is_window_visible(item.hwnd) and not host_hidden_popup:
                 continue
@@ -311,7 +344,7 @@ class WindowActionExecutor:
                     continue
                 child_identity = (
                     child,
-                    self.engine.api.get_window_thread_process_id(child),
+                    self.engine._get_pid(child),
                     class_name,
                 )
                 popup_decision = self.engine._signals.popup_dismiss_decision(popup_guard, depth)
@@ -355,7 +388,7 @@ class WindowActionExecutor:
     def dismiss_popup_window(self, hwnd: int) -> Tuple[int, int, int, int, int]:
         if not self.engine._can_mutate_windows() or hwnd <= 0 or not self.engine.api.is_window(hwnd):
             return 0, 0, 0, 0, 0
-        pid = self.engine.api.get_window_thread_process_id(hwnd)
+        pid = self.engine._get_pid(hwnd)
         class_name = self.engine._get_class(hwnd)
         identity = (hwnd, pid, class_name)
         snapshot = self._capture_hidden_snapshot(hwnd, pid, class_name, HIDE_REASON_POPUP)
@@ -507,7 +540,7 @@ class WindowActionExecutor:
                 continue
 
             current_pid = self.engine.api.get_window_thread_process_id(hwnd)
-            current_class = self.engine._get_class(hwnd)
+            current_class = self.engine._get_class_fresh(hwnd)
             if current_pid != expected_pid or current_class != expected_class:
                 self.engine.logger.debug(
                     "Skip restore for recycled hwnd=%s reason=%s expected=(%s,%s) current=(%s,%s)",
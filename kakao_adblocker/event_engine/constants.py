@@ -3,6 +3,7 @@ from __future__ import annotations
 MAX_ERROR_LOG_KEYS = 512
 ERROR_LOG_PRUNE_TARGET = 384
 DISABLED_LOOP_WAIT_SECONDS = 1.0
+MIN_LOOP_WAIT_SECONDS = 0.005
 HIDE_REASON_LEGACY = "legacy"
 HIDE_REASON_AGGRESSIVE = "aggressive"
 HIDE_REASON_POPUP = "popup"
@@ -1,14 +1,17 @@
 from __future__ import annotations
 
+import itertools
 import logging
+import re
 import threading
 import time
-from dataclasses import asdict
-from typing import Callable, Dict, Optional, Set, Tuple
+from contextlib import contextmanager
+from dataclasses import replace
+from typing import Callable, Dict, FrozenSet, Iterable, Iterator, Optional, Set, Tuple
 
 from ..config import LayoutRulesV11, LayoutSettingsV11, get_runtime_paths
 from ..layout_engine import LayoutEngine
-from ..protocols import JoinableThreadLike, WindowIdentity, Win32ApiLike
+from ..protocols import JoinableThreadLike, WindowIdentity, Win32ApiLike, WinEventWatcherLike
 from ..services import ProcessInspector
 from ..win32_api import Win32API
 from .actions import WindowActionExecutor
@@ -17,6 +20,7 @@ from .constants import (
     ERROR_LOG_PRUNE_TARGET,
     HIDE_REASON_AGGRESSIVE,
     MAX_ERROR_LOG_KEYS,
+    MIN_LOOP_WAIT_SECONDS,
 )
 from .dump import WindowDumpBuilder
 from .models import AdDecision, CandidateState, EngineState, HiddenWindowSnapshot
@@ -24,6 +28,13 @@ from .scanner import WindowScanner
 from .signals import SignalEvaluator
 
 
+def _compile_token_pattern(tokens: Tuple[str, ...]) -> Optional[re.Pattern[str]]:
+    # One alternation scans the text once for every token instead of once per token.
+    if not tokens:
+        return None
+    return re.compile("|".join(re.escape(token) for token in tokens))
+
+
 class LayoutOnlyEngine:
     def __init__(
         self,
@@ -49,11 +60,29 @@ class LayoutOnlyEngine:
         self._stop_event = threading.Event()
         self._wake_event = threading.Event()
         self._watch_thread: Optional[JoinableThreadLike] = None
+        self._win_event_watcher: Optional[WinEventWatcherLike] = None
+        # (pids, monotonic time, hwnds) of the last full top-level scan for popup hosts; only reused
+        # while window events are hooked, and dropped on every event.
+        self._top_level_cache: Optional[Tuple[FrozenSet[int], float, Tuple[int, ...]]] = None
+        self._win_event_epoch = 0
 
         self._main_window_class_set = frozenset(self.rules.main_window_classes)
         self._ad_candidate_class_set = frozenset(self.rules.ad_candidate_classes)
         self._popup_ad_class_set = frozenset(self.rules.popup_ad_classes)
+        # watch_once() only looks at top-level windows of main-window and ad-candidate classes.
+        self._watch_class_set = self._main_window_class_set | self._ad_candidate_class_set
+        # Title tokens are lowercased once here instead of on every window checked.
+        self._main_title_tokens_lc = tuple(token.lower() for token in self.rules.main_window_titles if token)
+        self._popup_host_text_tokens_lc = tuple(token.lower() for token in self.rules.popup_host_text_contains if token)
+        self._legacy_title_tokens_lc = tuple(token.lower() for token in self.rules.chrome_legacy_title_contains if token)
+        self._main_title_pattern = _compile_token_pattern(self._main_title_tokens_lc)
+        self._popup_host_text_pattern = _compile_token_pattern(self._popup_host_text_tokens_lc)
+        self._legacy_title_pattern = _compile_token_pattern(self._legacy_title_tokens_lc)
+        # str.startswith() takes the tuple directly and checks both view prefixes in C.
+        self._view_prefixes = (self.rules.main_view_prefix, self.rules.lock_view_prefix)
         self._main_window_handles: Set[int] = set()
+        # (hwnd, pid, class) of each main window watch_once() confirmed, so apply_once() can skip re-confirming it.
+        self._main_window_identities: Set[WindowIdentity] = set()
         self._ad_subwindow_candidates: Set[int] = set()
         self._kakao_pids: Set[int] = set()
         self._pid_scan_cache: Set[int] = set()
@@ -63,9 +92,14 @@ class LayoutOnlyEngine:
         self._hidden_windows: Dict[WindowIdentity, HiddenWindowSnapshot] = {}
         self._candidate_states: Dict[WindowIdentity, CandidateState] = {}
         self._burst_scans_remaining = 0
+        self._tree_signature: Optional[Tuple[object, ...]] = None
+        self._stable_ticks = 0
 
         self._text_cache: Dict[WindowIdentity, Tuple[float, str]] = {}
+        # Kept in last-logged order so pruning can drop the oldest keys without sorting.
         self._last_log: Dict[str, float] = {}
+        # Per-thread hwnd -> class/pid memo that only lives for one watch/apply pass.
+        self._lookup_pass = threading.local()
 
         self._scanner = WindowScanner(self)
         self._signals = SignalEvaluator(self)
@@ -74,8 +108,9 @@ class LayoutOnlyEngine:
 
     @property
     def state(self) -> EngineState:
+        # Every field is an immutable scalar, so a shallow replace() is a full snapshot without asdict()'s deep copy.
         with self._state_lock:
-            return EngineState(**asdict(self._state))
+            return replace(self._state)
 
     def start(self) -> None:
         with self._state_lock:
@@ -100,10 +135,14 @@ class LayoutOnlyEngine:
             self._last_cache_cleanup = 0.0
             self._last_activity = time.time()
             self._burst_scans_remaining = 0
+            self._tree_signature = None
+            self._stable_ticks = 0
+            self._top_level_cache = None
         with self._cache_lock:
             self._candidate_states.clear()
         self._stop_event.clear()
         self._wake_event.clear()
+        self._start_win_event_watcher()
 
         if enabled_on_start:
             try:
@@ -118,6 +157,7 @@ class LayoutOnlyEngine:
     def stop(self) -> None:
         self._stop_event.set()
         self._wake_event.set()
+        self._stop_win_event_watcher()
         watch_thread = self._watch_thread
         timed_out = False
         if watch_thread and watch_thread.is_alive():
@@ -186,13 +226,26 @@ class LayoutOnlyEngine:
         self._apply_once()
 
     def _watch_once(self) -> None:
-        with self._scan_apply_lock:
+        with self._scan_apply_lock, self._lookup_scope():
             self._scanner.watch_once()
 
     def _apply_once(self) -> None:
-        with self._scan_apply_lock:
+        with self._scan_apply_lock, self._lookup_scope():
             self._actions.apply_once()
 
+    @contextmanager
+    def _lookup_scope(self) -> Iterator[None]:
+        if getattr(self._lookup_pass, "classes", None) is not None:
+            yield
+            return
+        self._lookup_pass.classes = {}
+        self._lookup_pass.pids = {}
+        try:
+            yield
+        finally:
+            self._lookup_pass.classes = None
+            self._lookup_pass.pids = None
+
     def _active_poll_interval_seconds(self) -> float:
         return max(int(self.settings.poll_interval_ms), 50) / 1000.0
 
@@ -208,6 +261,9 @@ class LayoutOnlyEngine:
     def _burst_scan_interval_seconds(self) -> float:
         return max(int(self.settings.burst_scan_interval_ms), 10) / 1000.0
 
+    def _stable_poll_interval_seconds(self) -> float:
+        return max(int(self.settings.stable_poll_interval_ms), 50) / 1000.0
+
     def _is_stopping(self) -> bool:
         return self._stop_event.is_set()
 
@@ -226,11 +282,93 @@ class LayoutOnlyEngine:
             last_activity = self._last_activity
         return bool(last_activity and (now_value - last_activity) <= 3.0)
 
+    def _event_keepalive_interval_seconds(self) -> float:
+        return max(int(self.settings.event_keepalive_interval_ms), 1000) / 1000.0
+
     def _current_loop_interval_seconds(self, now: Optional[float] = None) -> float:
         if self._is_active_mode(now):
+            stable_interval = self._stable_backoff_interval_seconds()
+            if stable_interval is not None:
+                interval = max(self._active_poll_interval_seconds(), stable_interval)
+                if self._win_events_active():
+                    # Window events wake the loop, so a stable tree only needs a keepalive poll.
+                    interval = max(interval, self._event_keepalive_interval_seconds())
+                return interval
             return self._active_poll_interval_seconds()
         return self._idle_poll_interval_seconds()
 
+    def _stable_backoff_interval_seconds(self) -> Optional[float]:
+        # The stable interval doubles for every further `stable_scan_ticks` unchanged ticks,
+        # capped at `stable_max_poll_interval_ms`; any change resets `_stable_ticks` to zero.
+        required_ticks = int(self.settings.stable_scan_ticks)
+        if required_ticks <= 0:
+            return None
+        with self._data_lock:
+            stable_ticks = self._stable_ticks
+        if stable_ticks < required_ticks:
+            return None
+        base = self._stable_poll_interval_seconds()
+        ceiling = max(base, max(int(self.settings.stable_max_poll_interval_ms), 50) / 1000.0)
+        doublings = min((stable_ticks - required_ticks) // required_ticks, 16)
+        return min(base * (2**doublings), ceiling)
+
+    def _note_tree_signature(self, signature: Tuple[object, ...], changed: bool) -> None:
+        # Compared by value rather than hashed: the items are the identity/rect tuples the
+        # pass already built, so equality runs in C and can never collide.
+        with self._data_lock:
+            if changed or signature != self._tree_signature:
+                self._stable_ticks = 0
+            else:
+                self._stable_ticks += 1
+            self._tree_signature = signature
+
+    def _start_win_event_watcher(self) -> None:
+        if not self.settings.win_event_hooks or self._win_event_watcher is not None:
+            return
+        try:
+            watcher = self.api.create_win_event_watcher(self._on_win_event)
+            if watcher is None:
+                return
+            if watcher.start():
+                self._win_event_watcher = watcher
+            else:
+                watcher.stop()
+        except Exception as e:
+            self._set_error(f"win-event: {e}")
+
+    def _stop_win_event_watcher(self) -> None:
+        watcher = self._win_event_watcher
+        self._win_event_watcher = None
+        if watcher is None:
+            return
+        try:
+            watcher.stop()
+        except Exception as e:
+            self._set_error(f"win-event: {e}")
+
+    def _win_events_active(self) -> bool:
+        # Hooks are installed asynchronously and can fail per process, so a watcher only stands in
+        # for polling while it reports every KakaoTalk pid as hooked.
+        watcher = self._win_event_watcher
+        return watcher is not None and watcher.is_active()
+
+    def _sync_win_event_pids(self, pids: Iterable[int]) -> None:
+        watcher = self._win_event_watcher
+        if watcher is not None:
+            watcher.set_pids(pids)
+
+    def _on_win_event(self, _event: int, _hwnd: int) -> None:
+        # Runs on the hook thread. Any window change ends the stable backoff; the loop is only
+        # woken when it was sleeping on the keepalive interval, which also debounces event bursts.
+        required_ticks = int(self.settings.stable_scan_ticks)
+        with self._data_lock:
+            was_stable = required_ticks > 0 and self._stable_ticks >= required_ticks
+            self._stable_ticks = 0
+            self._top_level_cache = None
+            self._win_event_epoch += 1
+        if was_stable:
+            self._wake_event.set()
+
     def _is_burst_mode_active(self) -> bool:
         with self._data_lock:
             return self._burst_scans_remaining > 0
@@ -248,17 +386,12 @@ class LayoutOnlyEngine:
         self._wake_event.wait(timeout)
         self._wake_event.clear()
 
-    def _mark_activity(self, now: float, wake: bool = False) -> None:
-        with self._data_lock:
-            self._last_activity = now
-        if wake:
-            self._wake_event.set()
-
     def _watch_loop(self) -> None:
         while not self._stop_event.is_set():
             if not self._is_enabled():
                 self._wait_next_tick(DISABLED_LOOP_WAIT_SECONDS)
                 continue
+            tick_started = time.monotonic()
             try:
                 self._watch_once()
             except Exception as e:
@@ -269,19 +402,25 @@ class LayoutOnlyEngine:
                 self._apply_once()
             except Exception as e:
                 self._set_error(f"apply: {e}")
-            self._wait_next_tick(self._next_wait_interval_seconds())
+            # The interval runs from the start of the pass, so slow passes do not stretch the scan
+            # period; a pass that overruns it still yields briefly instead of spinning.
+            elapsed = time.monotonic() - tick_started
+            self._wait_next_tick(max(self._next_wait_interval_seconds() - elapsed, MIN_LOOP_WAIT_SECONDS))
 
     def _update_candidate_state(self, identity: WindowIdentity, decision: AdDecision, now: float) -> tuple[CandidateState, bool]:
         with self._cache_lock:
             return self._signals.update_candidate_state_store(self._candidate_states, identity, decision, now)
 
+    # The per-child membership probes below are single dict lookups, which are atomic on their own;
+    # _cache_lock only serializes writers and multi-step updates, so the hot reads skip it.
     def _candidate_state(self, identity: WindowIdentity) -> Optional[CandidateState]:
-        with self._cache_lock:
-            return self._candidate_states.get(identity)
+        return self._candidate_states.get(identity)
 
     def _is_hidden_identity(self, identity: WindowIdentity) -> bool:
-        with self._cache_lock:
-            return identity in self._hidden_windows
+        return identity in self._hidden_windows
+
+    def _has_tracked_state(self, identity: WindowIdentity) -> bool:
+        return identity in self._candidate_states or identity in self._hidden_windows
 
     def _note_candidate_snapshot(self, identity: WindowIdentity, snapshot: Optional[HiddenWindowSnapshot]) -> None:
         with self._cache_lock:
@@ -299,11 +438,14 @@ class LayoutOnlyEngine:
         with self._data_lock:
             self._kakao_pids.clear()
             self._main_window_handles.clear()
+            self._main_window_identities.clear()
             self._ad_subwindow_candidates.clear()
             self._pid_scan_cache.clear()
             self._last_pid_scan = 0.0
             self._last_activity = 0.0
             self._burst_scans_remaining = 0
+            self._tree_signature = None
+            self._stable_ticks = 0
         with self._cache_lock:
             self._candidate_states.clear()
         with self._state_lock:
@@ -313,11 +455,9 @@ class LayoutOnlyEngine:
             self._state.last_tick = now
 
     def _is_main_title(self, title: str) -> bool:
-        title_lc = (title or "").lower()
-        for token in self.rules.main_window_titles:
-            if token and token.lower() in title_lc:
-                return True
-        return False
+        if not title or self._main_title_pattern is None:
+            return False
+        return self._main_title_pattern.search(title.lower()) is not None
 
     def _get_cached(self, cache: Dict[WindowIdentity, Tuple[float, str]], key: WindowIdentity, loader: Callable[[], str]) -> str:
         now = time.time()
@@ -339,7 +479,7 @@ class LayoutOnlyEngine:
         return min(self.rules.cache_ttl_seconds, active_ttl)
 
     def _window_identity(self, hwnd: int, pid: Optional[int] = None, class_name: Optional[str] = None) -> Optional[WindowIdentity]:
-        resolved_pid = pid if pid is not None else self.api.get_window_thread_process_id(hwnd)
+        resolved_pid = pid if pid is not None else self._get_pid(hwnd)
         if resolved_pid <= 0:
             return None
         resolved_class = class_name if class_name is not None else self._get_class(hwnd)
@@ -360,15 +500,35 @@ class LayoutOnlyEngine:
         return value
 
     def _get_class(self, hwnd: int) -> str:
+        memo: Optional[Dict[int, str]] = getattr(self._lookup_pass, "classes", None)
+        if memo is None:
+            return self._get_class_fresh(hwnd)
+        class_name = memo.get(hwnd)
+        if class_name is None:
+            class_name = self._get_class_fresh(hwnd)
+            memo[hwnd] = class_name
+        return class_name
+
+    def _get_class_fresh(self, hwnd: int) -> str:
         return self.api.get_class_name(hwnd) or ""
 
+    def _get_pid(self, hwnd: int) -> int:
+        memo: Optional[Dict[int, int]] = getattr(self._lookup_pass, "pids", None)
+        if memo is None:
+            return self.api.get_window_thread_process_id(hwnd)
+        pid = memo.get(hwnd)
+        if pid is None:
+            pid = self.api.get_window_thread_process_id(hwnd)
+            memo[hwnd] = pid
+        return pid
+
     def _is_identity_alive(self, identity: WindowIdentity) -> bool:
         hwnd, pid, class_name = identity
         if not self.api.is_window(hwnd):
             return False
         if self.api.get_window_thread_process_id(hwnd) != pid:
             return False
-        if self._get_class(hwnd) != class_name:
+        if self._get_class_fresh(hwnd) != class_name:
             return False
         return True
 
@@ -406,6 +566,7 @@ class LayoutOnlyEngine:
         with self._error_log_lock:
             last = self._last_log.get(message, 0.0)
             if now - last >= self.rules.log_rate_limit_seconds:
+                self._last_log.pop(message, None)
                 self._last_log[message] = now
                 self._prune_error_log_keys_locked()
                 should_log = True
@@ -428,8 +589,7 @@ class LayoutOnlyEngine:
         trim_count = size - ERROR_LOG_PRUNE_TARGET
         if trim_count <= 0:
             return
-        oldest = sorted(self._last_log.items(), key=lambda item: item[1])[:trim_count]
-        for key, _timestamp in oldest:
+        for key in list(itertools.islice(self._last_log, trim_count)):
             self._last_log.pop(key, None)
 
     def _prune_error_log_keys(self) -> None:
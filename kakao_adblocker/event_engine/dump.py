@@ -8,12 +8,19 @@ from typing import TYPE_CHECKING, Dict, List, Set, Tuple, cast
 
 from ..protocols import Rect, WindowIdentity
 from .constants import POPUP_GUARD_ALLOW
-from .models import AdDecision, CandidateState
+from .models import AdDecision, CandidateState, WindowInfo
 
 if TYPE_CHECKING:
     from .controller import LayoutOnlyEngine
 
 
+def _write_json(path: str, data: Dict[str, object]) -> None:
+    # Serialize in one go (json.dump() with indent issues a write() per token) and write the
+    # encoded bytes directly, skipping the text layer's newline translation.
+    with open(path, "wb") as f:
+        f.write(json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8"))
+
+
 class WindowDumpBuilder:
     def __init__(self, engine: "LayoutOnlyEngine") -> None:
         self.engine = engine
@@ -29,8 +36,7 @@ class WindowDumpBuilder:
         dump_dir = out_dir or self.engine._runtime_paths().appdata_dir
         os.makedirs(dump_dir, exist_ok=True)
         path = os.path.join(dump_dir, f"window_dump_{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        _write_json(path, data)
         return path
 
     def dump_window_tree_series(
@@ -77,8 +83,7 @@ class WindowDumpBuilder:
         dump_dir = out_dir or self.engine._runtime_paths().appdata_dir
         os.makedirs(dump_dir, exist_ok=True)
         path = os.path.join(dump_dir, f"window_dump_series_{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        _write_json(path, data)
         return path
 
     def build_window_dump_payload(self, pids: Set[int]) -> Dict[str, object]:
@@ -88,7 +93,7 @@ class WindowDumpBuilder:
             "timestamp": datetime.now().isoformat(),
             "pids": sorted(pids),
             "main_windows": self.inspect_main_windows_for_dump(pids),
-            "windows": [self.dump_node(root.hwnd, 0, 6) for root in roots],
+            "windows": [self.dump_node(root.hwnd, 0, 6, item=root) for root in roots],
         }
 
     def inspect_main_windows_for_dump(self, pids: Set[int]) -> List[Dict[str, object]]:
@@ -110,9 +115,8 @@ class WindowDumpBuilder:
         windows = self.engine._scanner.collect_windows(pids) if pids else []
         main_handles: Set[int] = set()
         candidates: Set[int] = set()
-        legacy_text_memo: Dict[Tuple[int, str, int], bool] = {}
-        legacy_contains_memo: Dict[Tuple[int, str, int], bool] = {}
-        ad_token_memo: Dict[Tuple[int, int, bool], bool] = {}
+        legacy_memo: Dict[int, str] = {}
+        ad_token_memo: Dict[Tuple[int, bool], bool] = {}
         payloads: List[Dict[str, object]] = []
 
         for item in windows:
@@ -131,8 +135,7 @@ class WindowDumpBuilder:
                 continue
             if item.parent_hwnd == 0 and self.engine._signals.matches_legacy_signature(
                 item.hwnd,
-                memo_exact=legacy_text_memo,
-                memo_contains=legacy_contains_memo,
+                memo=legacy_memo,
             ):
                 candidates.add(item.hwnd)
 
@@ -146,13 +149,13 @@ class WindowDumpBuilder:
             if not parent_rect or not self.engine._scanner.is_confirmed_main_window(wnd):
                 continue
             parent_class_name = self.engine._get_class(wnd)
-            children = self.engine._scanner.enum_children(wnd)
+            children = self.engine._scanner.direct_children(wnd)
             parent_text = self.engine._get_text(wnd, pid, parent_class_name)
             main_window_has_ad_signal = False
             child_contexts: List[Tuple[int, WindowIdentity, str, str, Rect | None, AdDecision]] = []
 
             for child in children:
-                if not self.engine.api.is_window(child) or self.engine.api.get_parent(child) != wnd:
+                if not self.engine.api.is_window(child):
                     continue
                 class_name = self.engine._get_class(child)
                 window_text = self.engine._get_text(child, pid, class_name)
@@ -172,8 +175,7 @@ class WindowDumpBuilder:
                 if self.engine.rules.close_empty_eva_child_requires_ad_signal:
                     legacy_kind = self.engine._signals.legacy_signature_kind(
                         child,
-                        memo_exact=legacy_text_memo,
-                        memo_contains=legacy_contains_memo,
+                        memo=legacy_memo,
                     )
                 if legacy_kind or aggressive_decision.matched:
                     main_window_has_ad_signal = True
@@ -245,8 +247,7 @@ class WindowDumpBuilder:
             identity = (wnd, pid, class_name)
             legacy_kind = self.engine._signals.legacy_signature_kind(
                 wnd,
-                memo_exact=legacy_text_memo,
-                memo_contains=legacy_contains_memo,
+                memo=legacy_memo,
             )
             legacy_decision = self.engine._signals.legacy_hide_decision(legacy_kind)
             if legacy_decision.matched or identity in preview_states or self.engine._signals.has_relevant_signal(legacy_decision):
@@ -311,21 +312,43 @@ class WindowDumpBuilder:
         )
         return payloads
 
-    def dump_node(self, hwnd: int, depth: int, max_depth: int) -> Dict[str, object]:
-        class_name = self.engine._get_class(hwnd)
-        pid = self.engine.api.get_window_thread_process_id(hwnd)
-        node: Dict[str, object] = {
+    def dump_node(self, hwnd: int, depth: int, max_depth: int, item: WindowInfo | None = None) -> Dict[str, object]:
+        root = self.dump_node_attributes(hwnd, depth, item=item)
+        # Iterative pre-order walk; children are pushed reversed so they are emitted in enumeration order.
+        stack: List[Tuple[Dict[str, object], int]] = [(root, hwnd)]
+        while stack:
+            node, node_hwnd = stack.pop()
+            node_depth = cast(int, node["depth"])
+            if node_depth >= max_depth:
+                continue
+            children = cast(List[Dict[str, object]], node["children"])
+            pending: List[Tuple[Dict[str, object], int]] = []
+            for child in self.engine._scanner.enum_children(node_hwnd):
+                child_node = self.dump_node_attributes(child, node_depth + 1)
+                children.append(child_node)
+                pending.append((child_node, child))
+            stack.extend(reversed(pending))
+        return root
+
+    def dump_node_attributes(self, hwnd: int, depth: int, item: WindowInfo | None = None) -> Dict[str, object]:
+        if item is not None:
+            # Roots reuse the geometry snapshot collect_windows() already read for them.
+            class_name, pid, text = item.class_name, item.pid, item.text
+            visible = item.visible
+            rect = item.rect
+        else:
+            class_name = self.engine._get_class(hwnd)
+            pid = self.engine.api.get_window_thread_process_id(hwnd)
+            text = self.engine._get_text(hwnd, pid, class_name)
+            visible = bool(self.engine.api.is_window_visible(hwnd))
+            rect = self.engine.api.get_window_rect(hwnd)
+        return {
             "hwnd": hwnd,
             "class": class_name,
-            "text": self.engine._get_text(hwnd, pid, class_name),
+            "text": text,
             "pid": pid,
-            "visible": self.engine.api.is_window_visible(hwnd),
-            "rect": self.engine.api.get_window_rect(hwnd),
+            "visible": visible,
+            "rect": rect,
             "depth": depth,
             "children": [],
         }
-        if depth >= max_depth:
-            return node
-        children = self.engine._scanner.enum_children(hwnd)
-        node["children"] = [self.dump_node(child, depth + 1, max_depth) for child in children]
-        return node
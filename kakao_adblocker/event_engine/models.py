@@ -7,7 +7,7 @@ from ..protocols import Rect, WindowIdentity
 from .constants import ACTION_NONE, DECISION_NONE
 
 
-@dataclass
+@dataclass(slots=True)
 class WindowInfo:
     hwnd: int
     pid: int
@@ -37,7 +37,7 @@ class EngineState:
     last_restore_error: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class HiddenWindowSnapshot:
     was_visible: bool
     rect: Optional[Rect]
@@ -58,7 +58,7 @@ class AdDecision:
         return self.decision != DECISION_NONE and self.action != ACTION_NONE
 
 
-@dataclass
+@dataclass(slots=True)
 class CandidateState:
     match_streak: int = 0
     miss_streak: int = 0
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import time
-from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
+from typing import TYPE_CHECKING, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
 
+from ..protocols import WindowIdentity
 from .models import WindowInfo
 
 if TYPE_CHECKING:
@@ -29,16 +30,24 @@ class WindowScanner:
             self.engine._last_pid_scan = now
         return pids
 
-    def collect_windows(self, pids: Set[int], include_geometry: bool = False) -> List[WindowInfo]:
+    def collect_windows(
+        self,
+        pids: Set[int],
+        include_geometry: bool = False,
+        class_names: Optional[FrozenSet[str]] = None,
+        handles: Optional[Iterable[int]] = None,
+    ) -> List[WindowInfo]:
         if not pids:
             return []
         result: List[WindowInfo] = []
 
         def cb(hwnd: int) -> bool:
-            pid = self.engine.api.get_window_thread_process_id(hwnd)
+            pid = self.engine._get_pid(hwnd)
             if pid not in pids:
                 return True
             class_name = self.engine._get_class(hwnd)
+            if class_names is not None and class_name not in class_names:
+                return True
             result.append(
                 WindowInfo(
                     hwnd=hwnd,
@@ -52,19 +61,66 @@ class WindowScanner:
             )
             return True
 
+        if handles is not None:
+            for hwnd in handles:
+                cb(hwnd)
+            return result
+
+        if class_names is not None:
+            # Class-filtered scans look the classes up directly instead of walking every desktop window.
+            seen: Set[int] = set()
+            for class_name in sorted(class_names):
+                for hwnd in self.engine.api.find_top_level_windows(class_name):
+                    if hwnd not in seen:
+                        seen.add(hwnd)
+                        cb(hwnd)
+            return result
+
         self.engine.api.enum_windows(cb)
         return result
 
+    def collect_top_level_windows(self, pids: Set[int]) -> List[WindowInfo]:
+        # Popup hosts can be any top-level window of the KakaoTalk processes, which needs a full
+        # EnumWindows walk over the desktop. With window events hooked, a create/show in those processes
+        # drops the cached handle list, so in between the known handles are revalidated instead.
+        engine = self.engine
+        if not pids or not engine._win_events_active():
+            # Events from unhooked processes can be missed, so nothing cached across that gap is trusted.
+            with engine._data_lock:
+                engine._top_level_cache = None
+            return self.collect_windows(pids)
+        key = frozenset(pids)
+        now = time.monotonic()
+        with engine._data_lock:
+            cached = engine._top_level_cache
+            epoch = engine._win_event_epoch
+        if cached is not None and cached[0] == key and now - cached[1] <= engine._event_keepalive_interval_seconds():
+            return self.collect_windows(pids, handles=cached[2])
+        windows = self.collect_windows(pids)
+        with engine._data_lock:
+            # An event that arrived during the walk may describe a window it missed; don't cache that walk.
+            if engine._win_event_epoch == epoch:
+                engine._top_level_cache = (key, now, tuple(item.hwnd for item in windows))
+        return windows
+
     def enum_children(self, parent_hwnd: int) -> List[int]:
-        children: List[int] = []
-        self.engine.api.enum_child_windows(parent_hwnd, lambda hwnd: children.append(hwnd) or True)
-        return children
+        return self.engine.api.enum_child_handles(parent_hwnd)
+
+    def direct_children(self, parent_hwnd: int) -> List[int]:
+        return self.engine.api.enum_direct_children(parent_hwnd)
 
     def enum_descendants(self, parent_hwnd: int, max_depth: int) -> List[Tuple[int, int]]:
         if max_depth <= 0 or not self.engine.api.is_window(parent_hwnd):
             return []
         descendants: List[Tuple[int, int]] = []
-        queue: List[Tuple[int, int]] = [(child, 1) for child in self.enum_children(parent_hwnd)]
+        # EnumChildWindows reports whole subtrees, so deeper levels re-report handles already queued;
+        # each hwnd is kept once, at the shallowest depth it was seen.
+        seen: Set[int] = {parent_hwnd}
+        queue: List[Tuple[int, int]] = []
+        for child in self.enum_children(parent_hwnd):
+            if child not in seen:
+                seen.add(child)
+                queue.append((child, 1))
         index = 0
         while index < len(queue):
             hwnd, depth = queue[index]
@@ -73,7 +129,9 @@ class WindowScanner:
             if depth >= max_depth:
                 continue
             for child in self.enum_children(hwnd):
-                queue.append((child, depth + 1))
+                if child not in seen:
+                    seen.add(child)
+                    queue.append((child, depth + 1))
         return descendants
 
     def find_popup_matches(self, host_hwnd: int, require_visible: bool = True) -> List[Tuple[int, int, str]]:
@@ -81,11 +139,12 @@ class WindowScanner:
         for hwnd, depth in self.enum_descendants(host_hwnd, int(self.engine.rules.popup_search_depth)):
             if not self.engine.api.is_window(hwnd):
                 continue
-            if require_visible and not self.engine.api.is_window_visible(hwnd):
-                continue
+            # Class reads are memoized per pass, so filter on them before paying for IsWindowVisible.
             class_name = self.engine._get_class(hwnd)
             if class_name not in self.engine._popup_ad_class_set:
                 continue
+            if require_visible and not self.engine.api.is_window_visible(hwnd):
+                continue
             matches.append((hwnd, depth, class_name))
         return matches
 
@@ -102,7 +161,7 @@ class WindowScanner:
 
     def main_window_debug_payload(self, hwnd: int, item: Optional[WindowInfo] = None) -> Dict[str, object]:
         if item is None:
-            pid = self.engine.api.get_window_thread_process_id(hwnd)
+            pid = self.engine._get_pid(hwnd)
             if pid <= 0:
                 return {
                     "hwnd": hwnd,
@@ -152,15 +211,19 @@ class WindowScanner:
             class_name = self.engine._get_class(hwnd)
             if class_name != self.engine.rules.eva_child_class:
                 continue
-            pid = self.engine.api.get_window_thread_process_id(hwnd)
+            pid = self.engine._get_pid(hwnd)
             txt = self.engine._get_text(hwnd, pid, class_name)
-            if txt.startswith(self.engine.rules.main_view_prefix) or txt.startswith(self.engine.rules.lock_view_prefix):
+            if txt.startswith(self.engine._view_prefixes):
                 return True
         return False
 
     def has_main_view_signature(self, parent_hwnd: int) -> bool:
         if not self.engine.api.is_window(parent_hwnd):
             return False
+        # The main/lock view is normally a direct EVA child, which user32 can find by class without
+        # walking the whole subtree; anything else still gets the full descendant check.
+        if self.is_main_window(self.engine.api.find_child_windows(parent_hwnd, self.engine.rules.eva_child_class)):
+            return True
         return self.is_main_window(self.enum_children(parent_hwnd))
 
     def watch_once(self) -> None:
@@ -169,14 +232,14 @@ class WindowScanner:
         now = time.time()
         was_active = self.engine._is_active_mode(now)
         pids = self.get_kakao_pids(now)
-        windows = self.collect_windows(pids) if pids else []
+        windows = self.collect_windows(pids, class_names=self.engine._watch_class_set) if pids else []
         if self.engine._is_stopping():
             return
         candidate_main_handles: Set[int] = set()
         main_handles: Set[int] = set()
+        main_identities: Set[WindowIdentity] = set()
         candidates: Set[int] = set()
-        legacy_text_memo: Dict[Tuple[int, str, int], bool] = {}
-        legacy_contains_memo: Dict[Tuple[int, str, int], bool] = {}
+        legacy_memo: Dict[int, str] = {}
 
         for item in windows:
             if self.engine._is_stopping():
@@ -187,6 +250,7 @@ class WindowScanner:
             detection = self.main_window_debug_payload(item.hwnd, item=item)
             if bool(detection["confirmed"]):
                 main_handles.add(item.hwnd)
+                main_identities.add((item.hwnd, item.pid, item.class_name))
                 if str(detection["confirmation"]) == "child-signature-fallback":
                     self.engine.logger.debug(
                         "main window confirmed by child signature fallback hwnd=%s title=%r",
@@ -205,17 +269,18 @@ class WindowScanner:
                 continue
             if item.parent_hwnd == 0 and self.engine._signals.matches_legacy_signature(
                 item.hwnd,
-                memo_exact=legacy_text_memo,
-                memo_contains=legacy_contains_memo,
+                memo=legacy_memo,
             ):
                 candidates.add(item.hwnd)
 
+        # One _data_lock round-trip publishes the scan, arms burst mode and records activity.
         with self.engine._data_lock:
-            previous_pids = set(self.engine._kakao_pids)
-            previous_main_handles = set(self.engine._main_window_handles)
-            previous_candidates = set(self.engine._ad_subwindow_candidates)
+            previous_pids = self.engine._kakao_pids
+            previous_main_handles = self.engine._main_window_handles
+            previous_candidates = self.engine._ad_subwindow_candidates
             self.engine._kakao_pids = pids
             self.engine._main_window_handles = main_handles
+            self.engine._main_window_identities = main_identities
             self.engine._ad_subwindow_candidates = candidates
             if (
                 self.engine.settings.burst_scan_iterations > 0
@@ -229,9 +294,12 @@ class WindowScanner:
                     self.engine._burst_scans_remaining,
                     int(self.engine.settings.burst_scan_iterations),
                 )
+            if pids:
+                self.engine._last_activity = now
 
-        if pids:
-            self.engine._mark_activity(now, wake=not was_active)
+        if pids and not was_active:
+            self.engine._wake_event.set()
+        self.engine._sync_win_event_pids(pids)
 
         with self.engine._state_lock:
             self.engine._state.kakao_pid_count = len(pids)
@@ -28,8 +28,8 @@ class SignalEvaluator:
         normalized = (text or "").strip()
         if not normalized:
             return True
-        text_lc = normalized.lower()
-        if any(token and token.lower() in text_lc for token in self.engine.rules.popup_host_text_contains):
+        pattern = self.engine._popup_host_text_pattern
+        if pattern is not None and pattern.search(normalized.lower()):
             return True
         return not self.engine.rules.popup_host_require_empty_text
 
@@ -136,17 +136,31 @@ class SignalEvaluator:
     def legacy_signature_kind(
         self,
         hwnd: int,
-        memo_exact: Optional[Dict[Tuple[int, str, int], bool]] = None,
-        memo_contains: Optional[Dict[Tuple[int, str, int], bool]] = None,
+        memo: Optional[Dict[int, str]] = None,
     ) -> str:
-        if self.has_window_text(hwnd, self.engine.rules.chrome_legacy_title, memo=memo_exact):
-            return "exact"
-        for token in self.engine.rules.chrome_legacy_title_contains:
-            if not token:
-                continue
-            if self.has_window_text_contains(hwnd, token, memo=memo_contains):
-                return "substring"
-        return ""
+        # One walk reads each descendant's text once and checks the exact title and every
+        # substring token together; an exact match anywhere in the subtree, at any depth, wins.
+        if memo is not None and hwnd in memo:
+            return memo[hwnd]
+        kind = ""
+        if self.engine.api.is_window(hwnd):
+            text = self.engine.api.get_window_text(hwnd) or ""
+            if text == self.engine.rules.chrome_legacy_title:
+                kind = "exact"
+            else:
+                pattern = self.engine._legacy_title_pattern
+                if pattern is not None and pattern.search(text.lower()):
+                    kind = "substring"
+                for child in self.engine._scanner.direct_children(hwnd):
+                    child_kind = self.legacy_signature_kind(child, memo=memo)
+                    if child_kind == "exact":
+                        kind = "exact"
+                        break
+                    if child_kind:
+                        kind = "substring"
+        if memo is not None:
+            memo[hwnd] = kind
+        return kind
 
     def legacy_hide_decision(self, legacy_kind: str) -> AdDecision:
         signals = self.blank_signals()
@@ -210,18 +224,19 @@ class SignalEvaluator:
     def subtree_contains_ad_token(
         self,
         hwnd: int,
-        max_depth: int = 8,
-        memo: Optional[Dict[Tuple[int, int, bool], bool]] = None,
+        memo: Optional[Dict[Tuple[int, bool], bool]] = None,
         fresh_text: bool = False,
     ) -> bool:
-        cache_key = (hwnd, max_depth, fresh_text)
+        # Recursing over direct children reaches every descendant once, at any depth, like the
+        # EnumChildWindows walk it replaces.
+        cache_key = (hwnd, fresh_text)
         if memo is not None and cache_key in memo:
             return memo[cache_key]
-        if max_depth < 0 or not self.engine.api.is_window(hwnd):
+        if not self.engine.api.is_window(hwnd):
             if memo is not None:
                 memo[cache_key] = False
             return False
-        pid = self.engine.api.get_window_thread_process_id(hwnd)
+        pid = self.engine._get_pid(hwnd)
         class_name = self.engine._get_class(hwnd)
         text = (
             self.engine._get_text_fresh(hwnd, pid, class_name)
@@ -232,8 +247,8 @@ class SignalEvaluator:
             if memo is not None:
                 memo[cache_key] = True
             return True
-        for child in self.engine._scanner.enum_children(hwnd):
-            if self.subtree_contains_ad_token(child, max_depth - 1, memo=memo, fresh_text=fresh_text):
+        for child in self.engine._scanner.direct_children(hwnd):
+            if self.subtree_contains_ad_token(child, memo=memo, fresh_text=fresh_text):
                 if memo is not None:
                     memo[cache_key] = True
                 return True
@@ -241,84 +256,19 @@ class SignalEvaluator:
             memo[cache_key] = False
         return False
 
-    def class_name_starts_with(self, hwnd: int, prefix: str, max_depth: int = 8) -> bool:
-        if max_depth < 0 or not self.engine.api.is_window(hwnd):
+    def class_name_starts_with(self, hwnd: int, prefix: str) -> bool:
+        if not self.engine.api.is_window(hwnd):
             return False
         if self.engine._get_class(hwnd).startswith(prefix):
             return True
-        for child in self.engine._scanner.enum_children(hwnd):
-            if self.class_name_starts_with(child, prefix, max_depth - 1):
-                return True
-        return False
-
-    def has_window_text(
-        self,
-        hwnd: int,
-        target: str,
-        max_depth: int = 8,
-        memo: Optional[Dict[Tuple[int, str, int], bool]] = None,
-    ) -> bool:
-        cache_key = (hwnd, target, max_depth)
-        if memo is not None and cache_key in memo:
-            return memo[cache_key]
-        if max_depth < 0 or not self.engine.api.is_window(hwnd):
-            if memo is not None:
-                memo[cache_key] = False
-            return False
-
-        if (self.engine.api.get_window_text(hwnd) or "") == target:
-            if memo is not None:
-                memo[cache_key] = True
-            return True
-
-        for child in self.engine._scanner.enum_children(hwnd):
-            if self.has_window_text(child, target, max_depth - 1, memo=memo):
-                if memo is not None:
-                    memo[cache_key] = True
-                return True
-
-        if memo is not None:
-            memo[cache_key] = False
-        return False
-
-    def has_window_text_contains(
-        self,
-        hwnd: int,
-        target: str,
-        max_depth: int = 8,
-        memo: Optional[Dict[Tuple[int, str, int], bool]] = None,
-    ) -> bool:
-        needle = (target or "").lower()
-        if not needle:
-            return False
-        cache_key = (hwnd, needle, max_depth)
-        if memo is not None and cache_key in memo:
-            return memo[cache_key]
-        if max_depth < 0 or not self.engine.api.is_window(hwnd):
-            if memo is not None:
-                memo[cache_key] = False
-            return False
-
-        text = (self.engine.api.get_window_text(hwnd) or "").lower()
-        if needle in text:
-            if memo is not None:
-                memo[cache_key] = True
-            return True
-
-        for child in self.engine._scanner.enum_children(hwnd):
-            if self.has_window_text_contains(child, needle, max_depth - 1, memo=memo):
-                if memo is not None:
-                    memo[cache_key] = True
+        for child in self.engine._scanner.direct_children(hwnd):
+            if self.class_name_starts_with(child, prefix):
                 return True
-
-        if memo is not None:
-            memo[cache_key] = False
         return False
 
     def matches_legacy_signature(
         self,
         hwnd: int,
-        memo_exact: Optional[Dict[Tuple[int, str, int], bool]] = None,
-        memo_contains: Optional[Dict[Tuple[int, str, int], bool]] = None,
+        memo: Optional[Dict[int, str]] = None,
     ) -> bool:
-        return bool(self.legacy_signature_kind(hwnd, memo_exact=memo_exact, memo_contains=memo_contains))
+        return bool(self.legacy_signature_kind(hwnd, memo=memo))
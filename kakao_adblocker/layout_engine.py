@@ -2,13 +2,34 @@ from __future__ import annotations
 
 import logging
 import re
-from typing import Iterable, Optional
+from functools import lru_cache
+from typing import Iterable, List, Optional
 
 from .config import LayoutRulesV11
-from .protocols import LayoutApiLike, Rect
+from .protocols import LayoutApiLike, Rect, WindowMove
 from .win32_api import SWP_NOMOVE
 
-_ASCII_WORD_RE = re.compile(r"[a-z0-9]+")
+
+@lru_cache(maxsize=16)
+def _compile_ad_token_pattern(tokens: tuple[str, ...]) -> Optional[re.Pattern[str]]:
+    parts = []
+    for token in tokens:
+        if not token:
+            continue
+        # Very short ASCII tokens like "ad" should match whole words only.
+        if token.isascii() and token.isalnum() and len(token) <= 2:
+            parts.append(rf"(?<![a-z0-9]){re.escape(token)}(?![a-z0-9])")
+        else:
+            parts.append(re.escape(token))
+    if not parts:
+        return None
+    return re.compile("|".join(parts))
+
+
+@lru_cache(maxsize=256)
+def _class_has_prefix(class_name: str, prefixes: tuple[str, ...]) -> bool:
+    # KakaoTalk reuses a handful of class names across every hwnd and tick.
+    return class_name.startswith(prefixes)
 
 
 def _rect_width(rect: Rect) -> int:
@@ -25,7 +46,25 @@ class LayoutEngine:
         self.rules = rules
         self.logger = logger
 
-    def apply_view_resize(self, child_hwnd: int, window_text: str, parent_rect: Rect) -> bool:
+    def apply_view_resize(
+        self,
+        child_hwnd: int,
+        window_text: str,
+        parent_rect: Rect,
+        current_rect: Optional[Rect] = None,
+    ) -> bool:
+        move = self.view_resize_move(child_hwnd, window_text, parent_rect, current_rect=current_rect)
+        if move is None:
+            return False
+        return self.apply_view_moves([move]) == 1
+
+    def view_resize_move(
+        self,
+        child_hwnd: int,
+        window_text: str,
+        parent_rect: Rect,
+        current_rect: Optional[Rect] = None,
+    ) -> Optional[WindowMove]:
         width = _rect_width(parent_rect) - self.rules.layout_shadow_padding_px
         height: Optional[int] = None
         if window_text.startswith(self.rules.main_view_prefix):
@@ -33,12 +72,21 @@ class LayoutEngine:
         elif window_text.startswith(self.rules.lock_view_prefix):
             height = _rect_height(parent_rect)
         if height is None or width < 1 or height < 1:
-            return False
-        current = self.api.get_window_rect(child_hwnd)
+            return None
+        current = current_rect or self.api.get_window_rect(child_hwnd)
         if current and _rect_width(current) == width and _rect_height(current) == height:
-            return False
-        self.api.update_window(child_hwnd)
-        return bool(self.api.set_window_pos(child_hwnd, 0, 0, width, height, SWP_NOMOVE))
+            return None
+        return (child_hwnd, 0, 0, width, height, SWP_NOMOVE)
+
+    def apply_view_moves(self, moves: List[WindowMove]) -> int:
+        if not moves:
+            return 0
+        for move in moves:
+            self.api.update_window(move[0])
+        # Sibling views are resized in one DeferWindowPos transaction when the API can build the batch.
+        if len(moves) > 1 and self.api.defer_window_positions(moves):
+            return len(moves)
+        return sum(1 for hwnd, x, y, width, height, flags in moves if self.api.set_window_pos(hwnd, x, y, width, height, flags))
 
     def should_close_empty_eva_child(
         self,
@@ -60,26 +108,30 @@ class LayoutEngine:
             return False
         return True
 
+    def _ad_token_pattern(self) -> Optional[re.Pattern[str]]:
+        # aggressive_ad_tokens_lc follows the current token values, so in-place edits of the rule
+        # list take effect; the lru_cache keeps that to a hash per call.
+        return _compile_ad_token_pattern(self.rules.aggressive_ad_tokens_lc)
+
+    def _chrome_widget_prefixes(self) -> tuple[str, ...]:
+        return tuple(self.rules.chrome_widget_prefixes)
+
     def contains_ad_token(self, text: str) -> bool:
-        low = (text or "").lower()
-        words = set(_ASCII_WORD_RE.findall(low))
-        for token in self.rules.aggressive_ad_tokens_lc:
-            if not token:
-                continue
-            # Very short ASCII tokens like "ad" should match whole words only.
-            if token.isascii() and token.isalnum() and len(token) <= 2:
-                if token in words:
-                    return True
-                continue
-            if token in low:
-                return True
-        return False
+        pattern = self._ad_token_pattern()
+        if pattern is None:
+            return False
+        return pattern.search((text or "").lower()) is not None
 
     def contains_ad_token_in_texts(self, texts: Iterable[str]) -> bool:
-        return any(self.contains_ad_token(text) for text in texts)
+        pattern = self._ad_token_pattern()
+        if pattern is None:
+            return False
+        # One lower() and one regex scan over the newline-joined texts; no token spans a newline, and
+        # the short-token guards treat it like the start/end of a text.
+        return pattern.search("\n".join(text or "" for text in texts).lower()) is not None
 
     def is_chrome_widget_class(self, class_name: str) -> bool:
-        return any(class_name.startswith(prefix) for prefix in self.rules.chrome_widget_prefixes)
+        return _class_has_prefix(class_name, self._chrome_widget_prefixes())
 
     def is_aggressive_chrome_ad(self, class_name: str, has_ad_token: bool) -> bool:
         return self.is_chrome_widget_class(class_name) and has_ad_token
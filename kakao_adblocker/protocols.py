@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from typing import Callable, Protocol
+from typing import Callable, Iterable, Protocol, Sequence
 
 Rect = tuple[int, int, int, int]
 WindowIdentity = tuple[int, int, str]
+# (hwnd, x, y, width, height, SWP_* flags) as passed to SetWindowPos.
+WindowMove = tuple[int, int, int, int, int, int]
 
 
 class LayoutApiLike(Protocol):
@@ -21,12 +23,24 @@ class LayoutApiLike(Protocol):
         flags: int,
     ) -> bool: ...
 
+    def defer_window_positions(self, moves: Sequence[WindowMove]) -> bool: ...
+
 
 class Win32ApiLike(LayoutApiLike, Protocol):
     def enum_windows(self, callback: Callable[[int], bool]) -> bool: ...
 
     def enum_child_windows(self, parent_hwnd: int, callback: Callable[[int], bool]) -> bool: ...
 
+    def enum_child_handles(self, parent_hwnd: int) -> list[int]: ...
+
+    def enum_direct_children(self, parent_hwnd: int) -> list[int]: ...
+
+    def find_top_level_windows(self, class_name: str) -> list[int]: ...
+
+    def find_child_windows(self, parent_hwnd: int, class_name: str) -> list[int]: ...
+
+    def create_win_event_watcher(self, on_event: Callable[[int, int], None]) -> WinEventWatcherLike | None: ...
+
     def get_window_thread_process_id(self, hwnd: int) -> int: ...
 
     def get_class_name(self, hwnd: int) -> str: ...
@@ -55,6 +69,16 @@ class Win32ApiLike(LayoutApiLike, Protocol):
     def get_last_error(self) -> int: ...
 
 
+class WinEventWatcherLike(Protocol):
+    def start(self) -> bool: ...
+
+    def stop(self, timeout: float = 1.0) -> None: ...
+
+    def set_pids(self, pids: Iterable[int]) -> None: ...
+
+    def is_active(self) -> bool: ...
+
+
 class JoinableThreadLike(Protocol):
     def join(self, timeout: float | None = None) -> object: ...
 
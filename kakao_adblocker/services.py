@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-import csv
 import ctypes
-import io
+import functools
+import importlib
+import importlib.util
 import os
 import shlex
 import subprocess
@@ -10,16 +11,27 @@ import sys
 import threading
 import time
 import webbrowser
+from contextlib import contextmanager
 from ctypes import wintypes
 from pathlib import Path
-from typing import Any, Optional, Set, Tuple
+from typing import Any, Dict, FrozenSet, Iterator, Optional, Set, Tuple
 
-try:
-    import psutil as _psutil
-except Exception:
-    _psutil = None
-PSUTIL_AVAILABLE = _psutil is not None
-psutil: Any = _psutil
+# psutil is imported on the first process lookup rather than at module import, so CLI paths that never
+# look up a process (self-check, startup registration, ...) skip its import cost.
+_PSUTIL_UNLOADED: Any = object()
+psutil: Any = _PSUTIL_UNLOADED
+PSUTIL_AVAILABLE = importlib.util.find_spec("psutil") is not None
+
+
+def _load_psutil() -> Any:
+    global psutil, PSUTIL_AVAILABLE
+    if psutil is _PSUTIL_UNLOADED:
+        try:
+            psutil = importlib.import_module("psutil")
+        except Exception:
+            psutil = None
+        PSUTIL_AVAILABLE = psutil is not None
+    return psutil
 
 try:
     import winreg as _winreg
@@ -28,10 +40,60 @@ except Exception:
 WINREG_AVAILABLE = _winreg is not None
 winreg: Any = _winreg
 
+_TH32CS_SNAPPROCESS = 0x00000002
+_PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+_STILL_ACTIVE = 259
+_INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+
+
+class _PROCESSENTRY32W(ctypes.Structure):
+    _fields_ = [
+        ("dwSize", wintypes.DWORD),
+        ("cntUsage", wintypes.DWORD),
+        ("th32ProcessID", wintypes.DWORD),
+        ("th32DefaultHeapID", ctypes.c_size_t),
+        ("th32ModuleID", wintypes.DWORD),
+        ("cntThreads", wintypes.DWORD),
+        ("th32ParentProcessID", wintypes.DWORD),
+        ("pcPriClassBase", ctypes.c_long),
+        ("dwFlags", wintypes.DWORD),
+        ("szExeFile", ctypes.c_wchar * 260),
+    ]
+
+
+@functools.lru_cache(maxsize=1)
+def _kernel32_process_api() -> Any:
+    if os.name != "nt":
+        return None
+    try:
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        kernel32.CreateToolhelp32Snapshot.argtypes = [wintypes.DWORD, wintypes.DWORD]
+        kernel32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+        kernel32.Process32FirstW.argtypes = [wintypes.HANDLE, ctypes.POINTER(_PROCESSENTRY32W)]
+        kernel32.Process32FirstW.restype = wintypes.BOOL
+        kernel32.Process32NextW.argtypes = [wintypes.HANDLE, ctypes.POINTER(_PROCESSENTRY32W)]
+        kernel32.Process32NextW.restype = wintypes.BOOL
+        kernel32.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+        kernel32.OpenProcess.restype = wintypes.HANDLE
+        kernel32.GetExitCodeProcess.argtypes = [wintypes.HANDLE, ctypes.POINTER(wintypes.DWORD)]
+        kernel32.GetExitCodeProcess.restype = wintypes.BOOL
+        kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+        kernel32.CloseHandle.restype = wintypes.BOOL
+    except Exception:
+        return None
+    return kernel32
+
 
 class ProcessInspector:
     _warning_lock = threading.Lock()
     _last_warning = ""
+    # A psutil hit is revalidated pid-by-pid for this long before paying for another full process_iter().
+    _PID_CACHE_TTL_SECONDS = 2.0
+    _pid_cache_lock = threading.Lock()
+    _pid_cache: Dict[str, Tuple[float, FrozenSet[int]]] = {}
+    # Without psutil, snapshot hits are kept alive by open process handles: a held handle pins the pid,
+    # so GetExitCodeProcess() == STILL_ACTIVE proves the same process is still running.
+    _pid_handles: Dict[str, Dict[int, int]] = {}
 
     @staticmethod
     def _set_warning(message: str) -> None:
@@ -52,6 +114,110 @@ class ProcessInspector:
             return ""
         return name if name.endswith(".exe") else f"{name}.exe"
 
+    @staticmethod
+    def _cached_process_ids(normalized: str) -> Optional[Set[int]]:
+        with ProcessInspector._pid_cache_lock:
+            entry = ProcessInspector._pid_cache.get(normalized)
+        if entry is None:
+            return None
+        cached_at, cached_pids = entry
+        if time.monotonic() - cached_at > ProcessInspector._PID_CACHE_TTL_SECONDS:
+            return None
+        with ProcessInspector._pid_cache_lock:
+            handles = ProcessInspector._pid_handles.get(normalized)
+            if handles is not None:
+                return set(cached_pids) if ProcessInspector._handles_alive(cached_pids, handles) else None
+        psutil_mod: Any = _load_psutil()
+        if psutil_mod is None:
+            return None
+        try:
+            for pid in cached_pids:
+                # Also catches a pid reused by another image since the scan.
+                if (psutil_mod.Process(pid).name() or "").strip().lower() != normalized:
+                    return None
+        except Exception:
+            return None
+        return set(cached_pids)
+
+    @staticmethod
+    def _handles_alive(pids: FrozenSet[int], handles: Dict[int, int]) -> bool:
+        kernel32 = _kernel32_process_api()
+        if kernel32 is None:
+            return False
+        exit_code = wintypes.DWORD(0)
+        for pid in pids:
+            handle = handles.get(pid)
+            if not handle or not kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code)):
+                return False
+            if exit_code.value != _STILL_ACTIVE:
+                return False
+        return True
+
+    @staticmethod
+    def _store_process_ids(normalized: str, pids: Set[int], hold_handles: bool = False) -> None:
+        handles: Optional[Dict[int, int]] = None
+        if pids and hold_handles:
+            kernel32 = _kernel32_process_api()
+            if kernel32 is not None:
+                handles = {}
+                for pid in pids:
+                    handle = kernel32.OpenProcess(_PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+                    if handle:
+                        handles[pid] = handle
+        with ProcessInspector._pid_cache_lock:
+            stale_handles = ProcessInspector._pid_handles.pop(normalized, None)
+            if handles is not None:
+                ProcessInspector._pid_handles[normalized] = handles
+            if pids and (not hold_handles or handles is not None):
+                ProcessInspector._pid_cache[normalized] = (time.monotonic(), frozenset(pids))
+            else:
+                ProcessInspector._pid_cache.pop(normalized, None)
+        if stale_handles:
+            kernel32 = _kernel32_process_api()
+            if kernel32 is not None:
+                for handle in stale_handles.values():
+                    kernel32.CloseHandle(handle)
+
+    @staticmethod
+    def _snapshot_process_ids(normalized: str) -> Optional[Set[int]]:
+        # Toolhelp32 walks the process list in-process; spawning tasklist.exe costs tens of ms.
+        kernel32 = _kernel32_process_api()
+        if kernel32 is None:
+            return None
+        snapshot = kernel32.CreateToolhelp32Snapshot(_TH32CS_SNAPPROCESS, 0)
+        if not snapshot or snapshot == _INVALID_HANDLE_VALUE:
+            return None
+        pids: Set[int] = set()
+        try:
+            entry = _PROCESSENTRY32W()
+            entry.dwSize = ctypes.sizeof(_PROCESSENTRY32W)
+            ok = kernel32.Process32FirstW(snapshot, ctypes.byref(entry))
+            if not ok:
+                return None
+            while ok:
+                if entry.szExeFile.strip().lower() == normalized:
+                    pids.add(int(entry.th32ProcessID))
+                ok = kernel32.Process32NextW(snapshot, ctypes.byref(entry))
+        finally:
+            kernel32.CloseHandle(snapshot)
+        return pids
+
+    @staticmethod
+    def _parse_tasklist_pids(stdout: bytes, normalized: str) -> Set[int]:
+        # tasklist writes in the OEM code page (CP949 on Korean Windows); matching the ASCII image name
+        # and pid columns as bytes avoids decoding the whole output.
+        target = normalized.encode("ascii", "replace")
+        pids: Set[int] = set()
+        for line in stdout.splitlines():
+            fields = line.split(b'","')
+            if len(fields) < 2 or fields[0].lstrip(b'"').strip().lower() != target:
+                continue
+            try:
+                pids.add(int(fields[1]))
+            except ValueError:
+                continue
+        return pids
+
     @staticmethod
     def get_process_ids(image_name: str = "kakaotalk.exe") -> Set[int]:
         normalized = ProcessInspector._normalize_image_name(image_name)
@@ -59,12 +225,26 @@ class ProcessInspector:
             ProcessInspector._set_warning("")
             return set()
 
+        cached_pids = ProcessInspector._cached_process_ids(normalized)
+        if cached_pids is not None:
+            ProcessInspector._set_warning("")
+            return cached_pids
+
+        # Toolhelp32 is tried first on Windows: it needs no psutil import, and the process handles it
+        # keeps make revalidation a GetExitCodeProcess() call instead of a psutil name lookup.
+        snapshot_pids = ProcessInspector._snapshot_process_ids(normalized)
+        if snapshot_pids is not None:
+            ProcessInspector._store_process_ids(normalized, snapshot_pids, hold_handles=True)
+            ProcessInspector._set_warning("")
+            return snapshot_pids
+
         pids: Set[int] = set()
         warning_messages: list[str] = []
-        psutil_mod: Any = psutil
+        psutil_mod: Any = _load_psutil()
         if psutil_mod is not None:
             try:
-                proc_iter = psutil_mod.process_iter(["pid", "name"])
+                # A bare process_iter() skips the per-process as_dict() build; only name() is queried.
+                proc_iter = psutil_mod.process_iter()
             except Exception as exc:
                 proc_iter = None
                 warning_messages.append(f"psutil init failed ({exc.__class__.__name__})")
@@ -72,41 +252,31 @@ class ProcessInspector:
                 try:
                     for proc in proc_iter:
                         try:
-                            proc_info = proc.info or {}
-                            proc_name = (proc_info.get("name") or "").strip().lower()
+                            proc_name = (proc.name() or "").strip().lower()
                             if proc_name == normalized:
-                                pids.add(int(proc_info["pid"]))
+                                pids.add(int(proc.pid))
                         except Exception:
                             continue
+                    ProcessInspector._store_process_ids(normalized, pids)
                     ProcessInspector._set_warning("")
                     return pids
                 except Exception as exc:
                     # Fall through to tasklist fallback on psutil loop failure.
                     warning_messages.append(f"psutil loop failed ({exc.__class__.__name__})")
-            if warning_messages:
-                warning_messages.append("using tasklist fallback")
+
+        if warning_messages:
+            warning_messages.append("using tasklist fallback")
 
         try:
             result = subprocess.run(
                 ["tasklist", "/FI", f"IMAGENAME eq {normalized}", "/FO", "CSV", "/NH"],
                 capture_output=True,
-                text=True,
                 creationflags=0x08000000,
                 timeout=3,
             )
             if result.returncode != 0:
                 warning_messages.append(f"tasklist returncode={result.returncode}")
-            parser = csv.reader(io.StringIO(result.stdout))
-            for row in parser:
-                if len(row) < 2:
-                    continue
-                image = row[0].strip().lower()
-                if image != normalized:
-                    continue
-                try:
-                    pids.add(int(row[1]))
-                except Exception:
-                    continue
+            pids.update(ProcessInspector._parse_tasklist_pids(result.stdout or b"", normalized))
         except Exception as exc:
             warning_messages.append(f"tasklist failed ({exc.__class__.__name__})")
 
@@ -133,6 +303,26 @@ class ProcessInspector:
 class StartupManager:
     KEY = r"SOFTWARE\Microsoft\Windows\CurrentVersion\Run"
     NAME = "KakaoTalkAdBlockerLayout"
+    # The tray menu re-evaluates is_enabled() on every render; keep the answer briefly and
+    # refresh it whenever this process writes the Run value.
+    _ENABLED_CACHE_TTL_SECONDS = 5.0
+    _enabled_cache_lock = threading.Lock()
+    _enabled_cache: Optional[Tuple[float, bool]] = None
+
+    @staticmethod
+    @contextmanager
+    def _open_run_key(access: int) -> Iterator[Any]:
+        winreg_mod: Any = winreg
+        key = winreg_mod.OpenKey(winreg_mod.HKEY_CURRENT_USER, StartupManager.KEY, 0, access)
+        try:
+            yield key
+        finally:
+            winreg_mod.CloseKey(key)
+
+    @staticmethod
+    def _store_enabled(enabled: Optional[bool]) -> None:
+        with StartupManager._enabled_cache_lock:
+            StartupManager._enabled_cache = None if enabled is None else (time.monotonic(), enabled)
 
     @staticmethod
     def build_command() -> str:
@@ -147,17 +337,9 @@ class StartupManager:
         if winreg_mod is None:
             return None
         try:
-            key = winreg_mod.OpenKey(
-                winreg_mod.HKEY_CURRENT_USER,
-                StartupManager.KEY,
-                0,
-                winreg_mod.KEY_READ,
-            )
-            try:
+            with StartupManager._open_run_key(winreg_mod.KEY_READ) as key:
                 value, _reg_type = winreg_mod.QueryValueEx(key, StartupManager.NAME)
                 return str(value or "")
-            finally:
-                winreg_mod.CloseKey(key)
         except Exception:
             return None
 
@@ -216,18 +398,12 @@ class StartupManager:
         if current == expected:
             return True
         try:
-            key = winreg_mod.OpenKey(
-                winreg_mod.HKEY_CURRENT_USER,
-                StartupManager.KEY,
-                0,
-                winreg_mod.KEY_SET_VALUE,
-            )
-            try:
+            with StartupManager._open_run_key(winreg_mod.KEY_SET_VALUE) as key:
                 winreg_mod.SetValueEx(key, StartupManager.NAME, 0, winreg_mod.REG_SZ, expected)
-            finally:
-                winreg_mod.CloseKey(key)
+            StartupManager._store_enabled(True)
             return True
         except Exception:
+            StartupManager._store_enabled(None)
             return False
 
     @staticmethod
@@ -262,20 +438,18 @@ class StartupManager:
         winreg_mod: Any = winreg
         if winreg_mod is None:
             return False
+        with StartupManager._enabled_cache_lock:
+            entry = StartupManager._enabled_cache
+        if entry is not None and time.monotonic() - entry[0] <= StartupManager._ENABLED_CACHE_TTL_SECONDS:
+            return entry[1]
         try:
-            key = winreg_mod.OpenKey(
-                winreg_mod.HKEY_CURRENT_USER,
-                StartupManager.KEY,
-                0,
-                winreg_mod.KEY_READ,
-            )
-            try:
+            with StartupManager._open_run_key(winreg_mod.KEY_READ) as key:
                 winreg_mod.QueryValueEx(key, StartupManager.NAME)
-                return True
-            finally:
-                winreg_mod.CloseKey(key)
+            enabled = True
         except Exception:
-            return False
+            enabled = False
+        StartupManager._store_enabled(enabled)
+        return enabled
 
     @staticmethod
     def set_enabled(enable: bool) -> bool:
@@ -283,13 +457,7 @@ class StartupManager:
         if winreg_mod is None:
             return False
         try:
-            key = winreg_mod.OpenKey(
-                winreg_mod.HKEY_CURRENT_USER,
-                StartupManager.KEY,
-                0,
-                winreg_mod.KEY_SET_VALUE,
-            )
-            try:
+            with StartupManager._open_run_key(winreg_mod.KEY_SET_VALUE) as key:
                 if enable:
                     cmd = StartupManager.build_command()
                     winreg_mod.SetValueEx(key, StartupManager.NAME, 0, winreg_mod.REG_SZ, cmd)
@@ -298,10 +466,10 @@ class StartupManager:
                         winreg_mod.DeleteValue(key, StartupManager.NAME)
                     except FileNotFoundError:
                         pass
-            finally:
-                winreg_mod.CloseKey(key)
+            StartupManager._store_enabled(bool(enable))
             return True
         except Exception:
+            StartupManager._store_enabled(None)
             return False
 
     @staticmethod
@@ -310,29 +478,13 @@ class StartupManager:
         if winreg_mod is None:
             return False, "winreg unavailable"
         try:
-            key = winreg_mod.OpenKey(
-                winreg_mod.HKEY_CURRENT_USER,
-                StartupManager.KEY,
-                0,
-                winreg_mod.KEY_READ,
-            )
-            try:
+            with StartupManager._open_run_key(winreg_mod.KEY_READ):
                 pass
-            finally:
-                winreg_mod.CloseKey(key)
         except Exception as exc:
             return False, f"read failed ({exc.__class__.__name__}: {exc})"
         try:
-            key = winreg_mod.OpenKey(
-                winreg_mod.HKEY_CURRENT_USER,
-                StartupManager.KEY,
-                0,
-                winreg_mod.KEY_SET_VALUE,
-            )
-            try:
+            with StartupManager._open_run_key(winreg_mod.KEY_SET_VALUE):
                 return True, "Run 레지스트리 읽기/쓰기 가능"
-            finally:
-                winreg_mod.CloseKey(key)
         except Exception as exc:
             return False, f"write failed ({exc.__class__.__name__}: {exc})"
 
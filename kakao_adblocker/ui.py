@@ -25,6 +25,12 @@ _TRAY_READY_TIMEOUT_MINIMIZED_SECONDS = 8.0
 _STARTUP_TRAY_REFRESH_DELAY_MS = 3000
 _TRAY_RECOVERY_RETRY_DELAY_MS = 3000
 _TRAY_RECOVERY_MAX_ATTEMPTS = 3
+_UI_QUEUE_DRAIN_INTERVAL_MS = 50
+_STATUS_TICK_INTERVAL_MS = 1000
+_STATUS_TICK_HIDDEN_INTERVAL_MS = 5000
+_TRAY_ICON_SIZE = (64, 64)
+_TRAY_ICON_SHIELD_POINTS = ((32, 4), (60, 14), (60, 32), (32, 60), (4, 32), (4, 14))
+_TRAY_ICON_CHECK_POINTS = ((18, 32), (26, 42), (46, 20))
 
 
 def _load_tray_modules(force_retry: bool = False) -> bool:
@@ -68,6 +74,8 @@ class TrayController:
         self.settings = settings
         self.logger = logger.getChild("TrayController")
         self.icon: Any = None
+        # The tray icon never changes, so it is drawn once and reused by every tray (re)start.
+        self._icon_image: Any = None
         self._tray_running = False
         self._tray_available = False
         self._tray_thread: Optional[threading.Thread] = None
@@ -76,9 +84,11 @@ class TrayController:
         self._tray_stopping = False
         self._startup_notice_shown = False
         self._last_status_text: Optional[str] = None
+        self._status_update_pending = False
         self._ui_warning = ""
         self._ui_warning_at = 0.0
-        self._ui_queue: "queue.Queue[Callable[[], None]]" = queue.Queue()
+        # SimpleQueue: the tray thread only needs put/get_nowait, not Queue's task tracking.
+        self._ui_queue: "queue.SimpleQueue[Callable[[], None]]" = queue.SimpleQueue()
         self._ui_queue_running = False
         self._ui_queue_batch_size = 32
         self._status_label: Any = None
@@ -169,14 +179,14 @@ class TrayController:
     def is_tray_available(self) -> bool:
         return bool(self._tray_available)
 
-    def _schedule_ui_queue_drain(self) -> None:
+    def _schedule_ui_queue_drain(self, delay_ms: int = _UI_QUEUE_DRAIN_INTERVAL_MS) -> None:
         if not self._ui_queue_running:
             return
         try:
             if hasattr(self.root, "winfo_exists") and not bool(self.root.winfo_exists()):
                 return
             if hasattr(self.root, "after"):
-                self.root.after(50, self._drain_ui_queue)
+                self.root.after(delay_ms, self._drain_ui_queue)
         except Exception:
             self.logger.debug("UI queue drain scheduling skipped")
 
@@ -192,15 +202,20 @@ class TrayController:
             except Exception:
                 self.logger.exception("Queued UI callback failed")
             processed += 1
-        self._schedule_ui_queue_drain()
+        # A full batch may have left a backlog; pick it up on the next event-loop turn.
+        self._schedule_ui_queue_drain(0 if processed >= self._ui_queue_batch_size else _UI_QUEUE_DRAIN_INTERVAL_MS)
 
     def _tick_status(self) -> None:
-        self._update_status()
+        # Nobody sees the label while the window sits in the tray, so skip the rebuild and tick slower;
+        # show_window() refreshes it immediately.
+        visible = self._is_window_visible()
+        if visible:
+            self._update_status()
         try:
             if hasattr(self.root, "winfo_exists") and not bool(self.root.winfo_exists()):
                 return
             if hasattr(self.root, "after"):
-                self.root.after(1000, self._tick_status)
+                self.root.after(_STATUS_TICK_INTERVAL_MS if visible else _STATUS_TICK_HIDDEN_INTERVAL_MS, self._tick_status)
         except Exception:
             self.logger.debug("Status tick scheduling skipped")
 
@@ -216,6 +231,24 @@ class TrayController:
                 pass
         self._last_status_text = text
 
+    def _request_status_update(self) -> None:
+        # A single action can warn, roll back and toggle in a row; render the label once when Tk is idle.
+        after_idle = getattr(self.root, "after_idle", None)
+        if not callable(after_idle):
+            self._update_status(force=True)
+            return
+        if self._status_update_pending:
+            return
+        try:
+            after_idle(self._flush_status_update)
+            self._status_update_pending = True
+        except Exception:
+            self._update_status(force=True)
+
+    def _flush_status_update(self) -> None:
+        self._status_update_pending = False
+        self._update_status(force=True)
+
     def _save_setting_attr(self, attr_name: str, new_value) -> bool:
         previous = getattr(self.settings, attr_name)
         setattr(self.settings, attr_name, new_value)
@@ -225,7 +258,7 @@ class TrayController:
         except Exception:
             setattr(self.settings, attr_name, previous)
             self.logger.warning("Failed to save setting '%s'; rolled back", attr_name)
-            self._update_status(force=True)
+            self._request_status_update()
             return False
 
     def _set_ui_warning(self, message: str) -> None:
@@ -235,7 +268,7 @@ class TrayController:
     def _clear_ui_warning(self, prefixes: tuple[str, ...] | None = None) -> None:
         if not self._ui_warning:
             return
-        if prefixes is not None and not any(self._ui_warning.startswith(prefix) for prefix in prefixes):
+        if prefixes is not None and not self._ui_warning.startswith(prefixes):
             return
         self._ui_warning = ""
         self._ui_warning_at = 0.0
@@ -286,7 +319,7 @@ class TrayController:
             return
         self.engine.set_enabled(new_value)
         self.logger.info("Blocking toggled: %s", "ON" if new_value else "OFF")
-        self._update_status(force=True)
+        self._request_status_update()
 
     def toggle_startup(self) -> None:
         current = StartupManager.is_enabled()
@@ -294,7 +327,7 @@ class TrayController:
         if not StartupManager.set_enabled(target):
             self.logger.warning("Failed to update startup registration")
             self._set_ui_warning("startup registry update failed")
-            self._update_status(force=True)
+            self._request_status_update()
             return
         if not self._save_setting_attr("run_on_startup", target):
             rollback_ok = StartupManager.set_enabled(current)
@@ -304,11 +337,11 @@ class TrayController:
             else:
                 self.logger.error("Failed to save startup setting and registry rollback failed")
                 self._set_ui_warning("startup rollback failed")
-            self._update_status(force=True)
+            self._request_status_update()
             return
         self._clear_ui_warning(("startup ",))
         self.logger.info("Startup registration toggled: %s", "ON" if target else "OFF")
-        self._update_status(force=True)
+        self._request_status_update()
 
     def toggle_aggressive_mode(self) -> None:
         target = not self.settings.aggressive_mode
@@ -318,17 +351,17 @@ class TrayController:
         if callable(apply_change):
             apply_change(target)
         self.logger.info("Aggressive mode toggled: %s", "ON" if self.settings.aggressive_mode else "OFF")
-        self._update_status(force=True)
+        self._request_status_update()
 
     def reset_restore_failures(self) -> None:
         self.engine.reset_restore_failures()
         self.logger.info("Restore failure counters reset")
-        self._update_status(force=True)
+        self._request_status_update()
 
     def _report_ui_action_failure(self, action: str, warning: str) -> None:
         self.logger.warning("UI action failed: %s", action)
         self._set_ui_warning(warning)
-        self._update_status(force=True)
+        self._request_status_update()
 
     def open_log_folder(self) -> None:
         if ShellService.open_folder(get_runtime_paths().appdata_dir):
@@ -345,6 +378,7 @@ class TrayController:
             self.root.deiconify()
         if hasattr(self.root, "lift"):
             self.root.lift()
+        self._request_status_update()
 
     def hide_window(self) -> None:
         if hasattr(self.root, "withdraw"):
@@ -535,18 +569,21 @@ class TrayController:
         self._tray_ready_event.clear()
 
     def _create_icon(self):
+        if self._icon_image is not None:
+            return self._icon_image
         try:
             _pystray_mod, image_mod, image_draw_mod = _require_tray_modules()
         except RuntimeError:
             return None
-        img = image_mod.new("RGBA", (64, 64), (0, 0, 0, 0))
+        img = image_mod.new("RGBA", _TRAY_ICON_SIZE, (0, 0, 0, 0))
         draw = image_draw_mod.Draw(img)
         draw.polygon(
-            [(32, 4), (60, 14), (60, 32), (32, 60), (4, 32), (4, 14)],
+            _TRAY_ICON_SHIELD_POINTS,
             fill=(254, 229, 0, 255),
             outline=(200, 180, 0, 255),
         )
-        draw.line([(18, 32), (26, 42), (46, 20)], fill=(25, 25, 25, 255), width=5)
+        draw.line(_TRAY_ICON_CHECK_POINTS, fill=(25, 25, 25, 255), width=5)
+        self._icon_image = img
         return img
 
     # Tray callbacks are called from tray thread.
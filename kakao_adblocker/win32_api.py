@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import ctypes
+import itertools
 import os
+import threading
 from ctypes import wintypes
-from typing import Any, Callable, Optional, Tuple
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
 
 SW_HIDE = 0
 SW_SHOW = 5
@@ -13,6 +15,27 @@ SWP_NOZORDER = 0x0004
 SWP_NOACTIVATE = 0x0010
 WM_CLOSE = 0x0010
 SMTO_ABORTIFHUNG = 0x0002
+GW_HWNDNEXT = 2
+GW_CHILD = 5
+# Guards the GW_HWNDNEXT / FindWindowExW walks against z-order churn looping forever.
+MAX_DIRECT_CHILDREN = 4096
+EVENT_OBJECT_CREATE = 0x8000
+EVENT_OBJECT_SHOW = 0x8002
+EVENT_OBJECT_LOCATIONCHANGE = 0x800B
+EVENT_OBJECT_NAMECHANGE = 0x800C
+WINEVENT_OUTOFCONTEXT = 0x0000
+WINEVENT_SKIPOWNPROCESS = 0x0002
+OBJID_WINDOW = 0
+CHILDID_SELF = 0
+PM_NOREMOVE = 0x0000
+WM_QUIT = 0x0012
+WM_APP = 0x8000
+# create/destroy/show and location/name change; one hook per range per watched process.
+WIN_EVENT_RANGES = (
+    (EVENT_OBJECT_CREATE, EVENT_OBJECT_SHOW),
+    (EVENT_OBJECT_LOCATIONCHANGE, EVENT_OBJECT_NAMECHANGE),
+)
+_WM_APP_REHOOK = WM_APP + 1
 
 
 class Win32API:
@@ -20,7 +43,17 @@ class Win32API:
         self.available = os.name == "nt"
         self.user32: Any = None
         self.WNDENUMPROC: Any = None
-        self._callback_refs = []
+        self.WINEVENTPROC: Any = None
+        self._dword_ptr_value_t: Any = ctypes.c_size_t
+        # One persistent thunk serves every enumeration; lparam selects the Python callback.
+        self._enum_thunk: Any = None
+        self._enum_callbacks: Dict[int, Callable[[int], bool]] = {}
+        self._enum_tokens = itertools.count(1)
+        # Handle-only enumerations append straight into a list without a per-hwnd Python callback hop.
+        self._collect_thunk: Any = None
+        self._enum_collectors: Dict[int, List[int]] = {}
+        # Out-parameter buffers are reused per thread instead of allocated per call.
+        self._buffers = threading.local()
         if not self.available:
             return
 
@@ -30,6 +63,18 @@ class Win32API:
             wintypes.HWND,
             wintypes.LPARAM,
         )
+        self.WINEVENTPROC = ctypes.WINFUNCTYPE(
+            None,
+            wintypes.HANDLE,
+            wintypes.DWORD,
+            wintypes.HWND,
+            wintypes.LONG,
+            wintypes.LONG,
+            wintypes.DWORD,
+            wintypes.DWORD,
+        )
+        self._enum_thunk = self.WNDENUMPROC(self._dispatch_enum)
+        self._collect_thunk = self.WNDENUMPROC(self._collect_enum)
         self._bind_signatures()
 
     def _bind_signatures(self) -> None:
@@ -40,6 +85,7 @@ class Win32API:
         dword_t = wintypes.DWORD
         lresult_t = getattr(wintypes, "LRESULT", ctypes.c_long)
         dword_ptr_value_t = getattr(wintypes, "DWORD_PTR", ctypes.c_size_t)
+        self._dword_ptr_value_t = dword_ptr_value_t
         rect_ptr_t = ctypes.POINTER(wintypes.RECT)
         dword_ptr_t = ctypes.POINTER(wintypes.DWORD)
         dword_ptr_value_ptr_t = ctypes.POINTER(dword_ptr_value_t)
@@ -62,6 +108,12 @@ class Win32API:
         self.user32.GetParent.argtypes = [hwnd_t]
         self.user32.GetParent.restype = hwnd_t
 
+        self.user32.GetWindow.argtypes = [hwnd_t, uint_t]
+        self.user32.GetWindow.restype = hwnd_t
+
+        self.user32.FindWindowExW.argtypes = [hwnd_t, hwnd_t, wintypes.LPCWSTR, wintypes.LPCWSTR]
+        self.user32.FindWindowExW.restype = hwnd_t
+
         self.user32.GetWindowRect.argtypes = [hwnd_t, rect_ptr_t]
         self.user32.GetWindowRect.restype = bool_t
 
@@ -110,60 +162,162 @@ class Win32API:
         self.user32.UpdateWindow.argtypes = [hwnd_t]
         self.user32.UpdateWindow.restype = bool_t
 
-    def enum_windows(self, callback: Callable[[int], bool]) -> bool:
-        if not self.available:
+        hdwp_t = wintypes.HANDLE
+
+        self.user32.BeginDeferWindowPos.argtypes = [ctypes.c_int]
+        self.user32.BeginDeferWindowPos.restype = hdwp_t
+
+        self.user32.DeferWindowPos.argtypes = [
+            hdwp_t,
+            hwnd_t,
+            hwnd_t,
+            ctypes.c_int,
+            ctypes.c_int,
+            ctypes.c_int,
+            ctypes.c_int,
+            uint_t,
+        ]
+        self.user32.DeferWindowPos.restype = hdwp_t
+
+        self.user32.EndDeferWindowPos.argtypes = [hdwp_t]
+        self.user32.EndDeferWindowPos.restype = bool_t
+
+        msg_ptr_t = ctypes.POINTER(wintypes.MSG)
+
+        self.user32.SetWinEventHook.argtypes = [
+            dword_t,
+            dword_t,
+            wintypes.HMODULE,
+            self.WINEVENTPROC,
+            dword_t,
+            dword_t,
+            dword_t,
+        ]
+        self.user32.SetWinEventHook.restype = wintypes.HANDLE
+
+        self.user32.UnhookWinEvent.argtypes = [wintypes.HANDLE]
+        self.user32.UnhookWinEvent.restype = bool_t
+
+        self.user32.GetMessageW.argtypes = [msg_ptr_t, hwnd_t, uint_t, uint_t]
+        self.user32.GetMessageW.restype = bool_t
+
+        self.user32.PeekMessageW.argtypes = [msg_ptr_t, hwnd_t, uint_t, uint_t, uint_t]
+        self.user32.PeekMessageW.restype = bool_t
+
+        self.user32.PostThreadMessageW.argtypes = [dword_t, uint_t, wintypes.WPARAM, lparam_t]
+        self.user32.PostThreadMessageW.restype = bool_t
+
+    def _dispatch_enum(self, hwnd: Any, lparam: Any) -> bool:
+        callback = self._enum_callbacks.get(int(lparam or 0))
+        if callback is None:
             return False
+        try:
+            return bool(callback(int(hwnd)))
+        except Exception:
+            return True
 
-        def _cb(hwnd, _lparam):
-            try:
-                return bool(callback(int(hwnd)))
-            except Exception:
-                return True
+    def _collect_enum(self, hwnd: Any, lparam: Any) -> bool:
+        target = self._enum_collectors.get(int(lparam or 0))
+        if target is None:
+            return False
+        target.append(int(hwnd or 0))
+        return True
 
-        c_cb = self.WNDENUMPROC(_cb)
-        self._callback_refs.append(c_cb)
+    def _run_enum(self, enumerate_with: Callable[[Any, int], Any], callback: Callable[[int], bool]) -> bool:
+        token = next(self._enum_tokens)
+        self._enum_callbacks[token] = callback
         try:
-            return bool(self.user32.EnumWindows(c_cb, 0))
+            return bool(enumerate_with(self._enum_thunk, token))
         finally:
-            self._callback_refs.remove(c_cb)
+            self._enum_callbacks.pop(token, None)
 
-    def enum_child_windows(self, parent_hwnd: int, callback: Callable[[int], bool]) -> bool:
+    def enum_windows(self, callback: Callable[[int], bool]) -> bool:
         if not self.available:
             return False
+        return self._run_enum(self.user32.EnumWindows, callback)
 
-        def _cb(hwnd, _lparam):
-            try:
-                return bool(callback(int(hwnd)))
-            except Exception:
-                return True
+    def enum_child_windows(self, parent_hwnd: int, callback: Callable[[int], bool]) -> bool:
+        if not self.available:
+            return False
+        return self._run_enum(lambda thunk, token: self.user32.EnumChildWindows(parent_hwnd, thunk, token), callback)
 
-        c_cb = self.WNDENUMPROC(_cb)
-        self._callback_refs.append(c_cb)
+    def enum_child_handles(self, parent_hwnd: int) -> List[int]:
+        if not self.available:
+            return []
+        token = next(self._enum_tokens)
+        handles: List[int] = []
+        self._enum_collectors[token] = handles
         try:
-            return bool(self.user32.EnumChildWindows(parent_hwnd, c_cb, 0))
+            self.user32.EnumChildWindows(parent_hwnd, self._collect_thunk, token)
         finally:
-            self._callback_refs.remove(c_cb)
+            self._enum_collectors.pop(token, None)
+        return handles
+
+    def enum_direct_children(self, parent_hwnd: int) -> List[int]:
+        if not self.available:
+            return []
+        handles: List[int] = []
+        hwnd = int(self.user32.GetWindow(parent_hwnd, GW_CHILD) or 0)
+        while hwnd and len(handles) < MAX_DIRECT_CHILDREN:
+            handles.append(hwnd)
+            hwnd = int(self.user32.GetWindow(hwnd, GW_HWNDNEXT) or 0)
+        return handles
+
+    def _thread_buffers(self) -> Any:
+        buffers = self._buffers
+        if getattr(buffers, "class_name", None) is None:
+            buffers.class_name = ctypes.create_unicode_buffer(256)
+            buffers.text = ctypes.create_unicode_buffer(512)
+            buffers.pid = wintypes.DWORD(0)
+            buffers.rect = wintypes.RECT()
+            # byref() builds a new argument object per call; the out-params never move, so build them once.
+            buffers.pid_ref = ctypes.byref(buffers.pid)
+            buffers.rect_ref = ctypes.byref(buffers.rect)
+        return buffers
+
+    def _find_windows(self, parent_hwnd: Optional[int], class_name: str) -> List[int]:
+        if not self.available or not class_name:
+            return []
+        handles: List[int] = []
+        hwnd = int(self.user32.FindWindowExW(parent_hwnd, None, class_name, None) or 0)
+        while hwnd and len(handles) < MAX_DIRECT_CHILDREN:
+            handles.append(hwnd)
+            hwnd = int(self.user32.FindWindowExW(parent_hwnd, hwnd, class_name, None) or 0)
+        return handles
+
+    def find_top_level_windows(self, class_name: str) -> List[int]:
+        return self._find_windows(None, class_name)
+
+    def find_child_windows(self, parent_hwnd: int, class_name: str) -> List[int]:
+        # FindWindowExW filters direct children by class inside user32; no Python callback per child.
+        if not parent_hwnd:
+            return []
+        return self._find_windows(parent_hwnd, class_name)
 
     def get_window_thread_process_id(self, hwnd: int) -> int:
         if not self.available:
             return 0
-        pid = wintypes.DWORD(0)
-        self.user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+        buffers = self._thread_buffers()
+        pid = buffers.pid
+        # GetWindowThreadProcessId leaves the out-param untouched for dead windows.
+        pid.value = 0
+        self.user32.GetWindowThreadProcessId(hwnd, buffers.pid_ref)
         return int(pid.value)
 
     def get_class_name(self, hwnd: int) -> str:
         if not self.available:
             return ""
-        buf = ctypes.create_unicode_buffer(256)
-        self.user32.GetClassNameW(hwnd, buf, 256)
-        return buf.value
+        buf = self._thread_buffers().class_name
+        length = int(self.user32.GetClassNameW(hwnd, buf, 256) or 0)
+        # Slice by the returned length so a failed call never leaks the previous hwnd's value.
+        return ctypes.wstring_at(buf, length) if length > 0 else ""
 
     def get_window_text(self, hwnd: int) -> str:
         if not self.available:
             return ""
-        buf = ctypes.create_unicode_buffer(512)
-        self.user32.GetWindowTextW(hwnd, buf, 512)
-        return buf.value
+        buf = self._thread_buffers().text
+        length = int(self.user32.GetWindowTextW(hwnd, buf, 512) or 0)
+        return ctypes.wstring_at(buf, length) if length > 0 else ""
 
     def get_parent(self, hwnd: int) -> int:
         if not self.available:
@@ -173,8 +327,9 @@ class Win32API:
     def get_window_rect(self, hwnd: int) -> Optional[Tuple[int, int, int, int]]:
         if not self.available:
             return None
-        rect = wintypes.RECT()
-        ok = self.user32.GetWindowRect(hwnd, ctypes.byref(rect))
+        buffers = self._thread_buffers()
+        rect = buffers.rect
+        ok = self.user32.GetWindowRect(hwnd, buffers.rect_ref)
         if not ok:
             return None
         return (int(rect.left), int(rect.top), int(rect.right), int(rect.bottom))
@@ -182,8 +337,9 @@ class Win32API:
     def get_client_rect(self, hwnd: int) -> Optional[Tuple[int, int, int, int]]:
         if not self.available:
             return None
-        rect = wintypes.RECT()
-        ok = self.user32.GetClientRect(hwnd, ctypes.byref(rect))
+        buffers = self._thread_buffers()
+        rect = buffers.rect
+        ok = self.user32.GetClientRect(hwnd, buffers.rect_ref)
         if not ok:
             return None
         return (int(rect.left), int(rect.top), int(rect.right), int(rect.bottom))
@@ -217,6 +373,25 @@ class Win32API:
             return False
         return bool(self.user32.SetWindowPos(hwnd, insert_after, x, y, width, height, flags))
 
+    def defer_window_positions(self, moves: Sequence[Tuple[int, int, int, int, int, int]]) -> bool:
+        """Applies sibling SetWindowPos moves as one BeginDeferWindowPos/EndDeferWindowPos batch.
+
+        Returns False without moving anything if the batch could not be built, so callers can
+        fall back to per-window set_window_pos().
+        """
+        if not self.available or not moves:
+            return False
+        hdwp = self.user32.BeginDeferWindowPos(len(moves))
+        if not hdwp:
+            return False
+        for hwnd, x, y, width, height, flags in moves:
+            # On failure DeferWindowPos frees the whole batch, so nothing has been applied yet.
+            # Same insert-after handle and flags as set_window_pos(), so batching never changes z-order.
+            hdwp = self.user32.DeferWindowPos(hdwp, hwnd, 0, x, y, width, height, flags)
+            if not hdwp:
+                return False
+        return bool(self.user32.EndDeferWindowPos(hdwp))
+
     def send_message(self, hwnd: int, msg: int, wparam: int = 0, lparam: int = 0) -> int:
         if not self.available:
             return 0
@@ -232,8 +407,7 @@ class Win32API:
     ) -> tuple[bool, int]:
         if not self.available:
             return False, 0
-        result_type = getattr(wintypes, "DWORD_PTR", ctypes.c_size_t)
-        result = result_type(0)
+        result = self._dword_ptr_value_t(0)
         ok = bool(
             self.user32.SendMessageTimeoutW(
                 hwnd,
@@ -257,9 +431,135 @@ class Win32API:
             return 0
         return int(ctypes.get_last_error())
 
+    def create_win_event_watcher(self, on_event: Callable[[int, int], None]) -> Optional["WinEventWatcher"]:
+        if not self.available:
+            return None
+        return WinEventWatcher(self, on_event)
+
+
+class WinEventWatcher:
+    """Forwards window create/show/move/rename events of watched processes to ``on_event``.
+
+    Out-of-context WinEvent callbacks are delivered to the thread that installed the hook
+    while it pumps messages, so the hooks live on a dedicated message-pump thread.
+    """
+
+    def __init__(self, api: Win32API, on_event: Callable[[int, int], None]) -> None:
+        self._api = api
+        self._on_event = on_event
+        # Kept alive for as long as any hook may call it.
+        self._thunk: Any = api.WINEVENTPROC(self._dispatch) if api.WINEVENTPROC is not None else None
+        self._lock = threading.Lock()
+        self._pids: FrozenSet[int] = frozenset()
+        # Pids that got a hook for every event range on the last rehook. SetWinEventHook returns 0
+        # when the hook cannot reach the process (UIPI, an elevated KakaoTalk).
+        self._hooked_pids: FrozenSet[int] = frozenset()
+        self._hooks: List[int] = []
+        self._thread: Optional[threading.Thread] = None
+        self._thread_id = 0
+        self._stopping = False
+
+    def start(self) -> bool:
+        """Launches the pump thread without waiting for it; is_active() reports once hooks are installed."""
+        if not self._api.available or self._thunk is None or self._thread is not None or self._stopping:
+            return False
+        self._thread = threading.Thread(target=self._run, name="win-event-pump", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self, timeout: float = 1.0) -> None:
+        thread = self._thread
+        with self._lock:
+            # A pump thread that has not published its id yet sees the flag and exits before hooking.
+            self._stopping = True
+            thread_id = self._thread_id
+        if thread_id:
+            self._api.user32.PostThreadMessageW(thread_id, WM_QUIT, 0, 0)
+        if thread is not None:
+            thread.join(timeout)
+        self._thread = None
+
+    def is_active(self) -> bool:
+        """Whether the pump is running and every watched pid currently has its hooks installed."""
+        with self._lock:
+            return bool(self._thread_id) and bool(self._pids) and self._hooked_pids == self._pids
+
+    def set_pids(self, pids: Iterable[int]) -> None:
+        target = frozenset(int(pid) for pid in pids if pid)
+        with self._lock:
+            if target == self._pids:
+                return
+            self._pids = target
+            thread_id = self._thread_id
+        if thread_id:
+            self._api.user32.PostThreadMessageW(thread_id, _WM_APP_REHOOK, 0, 0)
+
+    def _run(self) -> None:
+        user32 = self._api.user32
+        msg = wintypes.MSG()
+        # PostThreadMessageW fails until the thread owns a message queue; peeking creates it.
+        user32.PeekMessageW(ctypes.byref(msg), None, 0, 0, PM_NOREMOVE)
+        with self._lock:
+            if self._stopping:
+                return
+            self._thread_id = threading.get_native_id()
+        try:
+            self._rehook()
+            while int(user32.GetMessageW(ctypes.byref(msg), None, 0, 0)) > 0:
+                if msg.message == _WM_APP_REHOOK:
+                    self._rehook()
+        finally:
+            self._unhook_all()
+            with self._lock:
+                self._thread_id = 0
+
+    def _rehook(self) -> None:
+        self._unhook_all()
+        with self._lock:
+            pids = self._pids
+        flags = WINEVENT_OUTOFCONTEXT | WINEVENT_SKIPOWNPROCESS
+        hooked: List[int] = []
+        for pid in sorted(pids):
+            installed = 0
+            for event_min, event_max in WIN_EVENT_RANGES:
+                hook = int(self._api.user32.SetWinEventHook(event_min, event_max, None, self._thunk, pid, 0, flags) or 0)
+                if hook:
+                    self._hooks.append(hook)
+                    installed += 1
+            if installed == len(WIN_EVENT_RANGES):
+                hooked.append(pid)
+        with self._lock:
+            self._hooked_pids = frozenset(hooked)
+
+    def _unhook_all(self) -> None:
+        with self._lock:
+            self._hooked_pids = frozenset()
+        hooks, self._hooks = self._hooks, []
+        for hook in hooks:
+            self._api.user32.UnhookWinEvent(hook)
+
+    def _dispatch(
+        self,
+        _hook: Any,
+        event: Any,
+        hwnd: Any,
+        id_object: Any,
+        id_child: Any,
+        _thread_id: Any,
+        _event_time: Any,
+    ) -> None:
+        # Caret/cursor/scrollbar objects report through the same events; only whole windows matter.
+        if int(id_object or 0) != OBJID_WINDOW or int(id_child or 0) != CHILDID_SELF or not hwnd:
+            return
+        try:
+            self._on_event(int(event), int(hwnd))
+        except Exception:
+            pass
+
 
 __all__ = [
     "Win32API",
+    "WinEventWatcher",
     "SW_HIDE",
     "SW_SHOW",
     "SWP_NOSIZE",
@@ -268,4 +568,10 @@ __all__ = [
     "SWP_NOACTIVATE",
     "WM_CLOSE",
     "SMTO_ABORTIFHUNG",
+    "GW_HWNDNEXT",
+    "GW_CHILD",
+    "EVENT_OBJECT_CREATE",
+    "EVENT_OBJECT_SHOW",
+    "EVENT_OBJECT_LOCATIONCHANGE",
+    "EVENT_OBJECT_NAMECHANGE",
 ]
@@ -1,6 +1,20 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+
+@pytest.fixture(autouse=True)
+def _reset_process_wide_caches(monkeypatch):
+    # These caches live on classes/modules, so without a reset one test's entries leak into the next.
+    from kakao_adblocker import services
+    from kakao_adblocker.config import storage
+
+    monkeypatch.setattr(services.ProcessInspector, "_pid_cache", {})
+    monkeypatch.setattr(services.ProcessInspector, "_pid_handles", {})
+    monkeypatch.setattr(services.StartupManager, "_enabled_cache", None)
+    monkeypatch.setattr(storage, "_ENSURED_DIRS", set())
@@ -126,6 +126,7 @@ def _patch_main_dependencies(monkeypatch, settings, load_warnings=None):
     monkeypatch.setattr(app.tk, "Tk", FakeRoot)
     monkeypatch.setattr(app, "TrayController", FakeController)
     monkeypatch.setattr(app.StartupManager, "wait_for_shell_ready", staticmethod(lambda: True))
+    monkeypatch.setattr(app, "_start_ui_prewarm", lambda: None)
     FakeController.tray_available_default = True
 
 
@@ -230,6 +231,33 @@ def test_main_fail_fast_on_non_windows(monkeypatch, capsys):
     assert called["runtime"] == 0
 
 
+def test_main_prewarms_ui_imports_before_runtime_setup(monkeypatch):
+    settings = LayoutSettingsV11(start_minimized=True)
+    _patch_main_dependencies(monkeypatch, settings)
+    order = []
+    monkeypatch.setattr(app, "_start_ui_prewarm", lambda: order.append("prewarm"))
+    monkeypatch.setattr(app, "ensure_runtime_files", lambda: order.append("runtime"))
+
+    assert app.main([]) == 0
+    assert order == ["prewarm", "runtime"]
+
+
+def test_prewarm_ui_imports_ignores_import_failures(monkeypatch):
+    imported = []
+
+    def fake_import_module(name):
+        imported.append(name)
+        if name == "pystray":
+            raise ImportError(name)
+
+    monkeypatch.setattr(app.importlib, "import_module", fake_import_module)
+
+    app._prewarm_ui_imports()
+
+    assert imported == list(app._UI_PREWARM_MODULES)
+    assert "kakao_adblocker.ui" in imported
+
+
 def test_dump_tree_path_skips_ui_loading(monkeypatch):
     class DumpEngine:
         def __init__(self, *_args, **_kwargs):
@@ -247,11 +275,13 @@ def test_dump_tree_path_skips_ui_loading(monkeypatch):
     monkeypatch.setattr(app, "setup_logging", lambda _level: logging.getLogger("test"))
     monkeypatch.setattr(app, "LayoutOnlyEngine", DumpEngine)
     monkeypatch.setattr(app, "_load_ui_dependencies", lambda: called.__setitem__("ui_load", called["ui_load"] + 1))
+    monkeypatch.setattr(app, "_start_ui_prewarm", lambda: called.__setitem__("prewarm", called.get("prewarm", 0) + 1))
 
     rc = app.main(["--dump-tree"])
 
     assert rc == 0
     assert called["ui_load"] == 0
+    assert "prewarm" not in called
 
 
 def test_dump_tree_series_path_skips_ui_loading_and_passes_timing(monkeypatch):
@@ -273,11 +303,13 @@ def test_dump_tree_series_path_skips_ui_loading_and_passes_timing(monkeypatch):
     monkeypatch.setattr(app, "setup_logging", lambda _level: logging.getLogger("test"))
     monkeypatch.setattr(app, "LayoutOnlyEngine", lambda *_args, **_kwargs: engine)
     monkeypatch.setattr(app, "_load_ui_dependencies", lambda: called.__setitem__("ui_load", called["ui_load"] + 1))
+    monkeypatch.setattr(app, "_start_ui_prewarm", lambda: called.__setitem__("prewarm", called.get("prewarm", 0) + 1))
 
     rc = app.main(["--dump-tree-series", "--dump-series-duration-ms", "250", "--dump-series-interval-ms", "25"])
 
     assert rc == 0
     assert called["ui_load"] == 0
+    assert "prewarm" not in called
     assert engine.calls == [(None, 250, 25)]
 
 
@@ -376,6 +408,7 @@ def test_self_check_path_skips_engine_and_ui(monkeypatch):
     monkeypatch.setattr(app, "ensure_runtime_files", lambda: called.__setitem__("runtime", called["runtime"] + 1))
     monkeypatch.setattr(app, "LayoutOnlyEngine", NeverEngine)
     monkeypatch.setattr(app, "_load_ui_dependencies", lambda: called.__setitem__("ui_load", called["ui_load"] + 1))
+    monkeypatch.setattr(app, "_start_ui_prewarm", lambda: called.__setitem__("prewarm", called.get("prewarm", 0) + 1))
     monkeypatch.setattr(app, "_check_appdata_writable", lambda: (True, "ok"))
     monkeypatch.setattr(app, "probe_logging_setup", lambda: (True, "ok"))
     monkeypatch.setattr(app.ProcessInspector, "probe_tasklist", staticmethod(lambda: (True, "ok")))
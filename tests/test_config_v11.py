@@ -1,3 +1,4 @@
+import dataclasses
 import importlib.util
 import json
 import sys
@@ -40,6 +41,11 @@ def test_settings_load_with_type_coercion(tmp_path: Path):
     assert cfg.cache_cleanup_interval_ms == 1000
     assert cfg.burst_scan_iterations == 3
     assert cfg.burst_scan_interval_ms == 20
+    assert cfg.stable_scan_ticks == 20
+    assert cfg.stable_poll_interval_ms == 200
+    assert cfg.stable_max_poll_interval_ms == 1000
+    assert cfg.win_event_hooks is True
+    assert cfg.event_keepalive_interval_ms == 5000
     assert cfg.aggressive_mode is True
     assert cfg.log_level == "INFO"
 
@@ -54,6 +60,11 @@ def test_settings_load_with_perf_bounds(tmp_path: Path):
                 "cache_cleanup_interval_ms": 10,
                 "burst_scan_iterations": 99,
                 "burst_scan_interval_ms": 1,
+                "stable_scan_ticks": -5,
+                "stable_poll_interval_ms": 99999,
+                "stable_max_poll_interval_ms": 99999,
+                "win_event_hooks": False,
+                "event_keepalive_interval_ms": 10,
             }
         ),
         encoding="utf-8",
@@ -65,6 +76,11 @@ def test_settings_load_with_perf_bounds(tmp_path: Path):
     assert cfg.cache_cleanup_interval_ms == 250
     assert cfg.burst_scan_iterations == 20
     assert cfg.burst_scan_interval_ms == 10
+    assert cfg.stable_scan_ticks == 0
+    assert cfg.stable_poll_interval_ms == 5000
+    assert cfg.stable_max_poll_interval_ms == 10000
+    assert cfg.win_event_hooks is False
+    assert cfg.event_keepalive_interval_ms == 1000
 
 
 def test_rules_load_with_bounds(tmp_path: Path):
@@ -101,6 +117,15 @@ def test_rules_load_with_bounds(tmp_path: Path):
     assert rules.hidden_restore_grace_ms == 250
 
 
+def test_load_schemas_cover_every_dataclass_field():
+    settings_fields = {f.name for f in dataclasses.fields(LayoutSettingsV11)}
+    assert {entry[0] for entry in LayoutSettingsV11._SCHEMA} == settings_fields
+
+    rules_fields = {f.name for f in dataclasses.fields(LayoutRulesV11)}
+    resolved_in_load = {"main_window_classes", "ad_candidate_classes", "banner_min_height_px", "banner_max_height_px"}
+    assert {entry[0] for entry in LayoutRulesV11._SCHEMA} == rules_fields - resolved_in_load
+
+
 def test_rules_load_falls_back_ad_candidate_classes_to_main_window_classes(tmp_path: Path):
     path = tmp_path / "layout_rules_v11.json"
     path.write_text(
@@ -357,6 +382,22 @@ def test_rules_default_strings_are_utf8_intact():
     assert rules.hidden_restore_grace_ms == 250
 
 
+def test_rules_lowercased_ad_tokens_are_cached_per_token_values():
+    rules = LayoutRulesV11(aggressive_ad_tokens=["AdFit", "광고"])
+
+    lowered = rules.aggressive_ad_tokens_lc
+    assert lowered == ("adfit", "광고")
+    assert rules.aggressive_ad_tokens_lc is lowered
+
+    rules.aggressive_ad_tokens.append("PROMO")
+    assert rules.aggressive_ad_tokens_lc == ("adfit", "광고", "promo")
+
+    rules.aggressive_ad_tokens = ["Sponsored"]
+    assert rules.aggressive_ad_tokens_lc == ("sponsored",)
+    assert "_aggressive_ad_tokens_lc" not in dataclasses.asdict(rules)
+    assert rules == LayoutRulesV11(aggressive_ad_tokens=["Sponsored"])
+
+
 def test_rules_load_warns_when_mojibake_signatures_detected(tmp_path: Path):
     path = tmp_path / "layout_rules_v11.json"
     path.write_text(
@@ -378,6 +419,18 @@ def test_rules_load_warns_when_mojibake_signatures_detected(tmp_path: Path):
     assert any("문자열 무결성 경고" in msg for msg in warnings)
 
 
+def test_mojibake_check_matches_signatures_literally():
+    from kakao_adblocker.config.warnings import _is_mojibake_text
+
+    assert _is_mojibake_text(f"prefix {MOJIBAKE_KAKAOTALK}") is True
+    assert _is_mojibake_text(MOJIBAKE_AD) is True
+    assert _is_mojibake_text("broken \ufffd text") is True
+    # The "?" inside a signature is literal text, not a regex quantifier.
+    assert _is_mojibake_text(MOJIBAKE_KAKAOTALK.replace("?", "")) is False
+    assert _is_mojibake_text("카카오톡") is False
+    assert _is_mojibake_text("") is False
+
+
 def test_settings_load_cleans_broken_backup_files_by_age_and_count(tmp_path: Path):
     path = tmp_path / "layout_settings_v11.json"
     path.write_text("{ not-json", encoding="utf-8")
@@ -420,6 +473,37 @@ def test_settings_load_cleans_broken_backups_even_without_new_corruption(tmp_pat
     assert not very_old.exists()
 
 
+def test_cleanup_broken_backups_keeps_newest_and_stamps_each_file_once(tmp_path: Path, monkeypatch):
+    path = tmp_path / "layout_settings_v11.json"
+    now = datetime.now()
+    stamps = [(now - timedelta(hours=hours)).strftime("%Y%m%d-%H%M%S") for hours in range(1, 13)]
+    for stamp in stamps:
+        (tmp_path / f"{path.name}.broken-{stamp}").write_text("recent", encoding="utf-8")
+    storage = config_module.storage
+    calls = []
+    original_timestamp = storage._backup_timestamp
+    monkeypatch.setattr(storage, "_backup_timestamp", lambda p: calls.append(p.name) or original_timestamp(p))
+
+    config_module._cleanup_broken_backups(str(path), path.name)
+
+    remaining = sorted(p.name for p in tmp_path.glob(f"{path.name}.broken-*"))
+    assert remaining == sorted(f"{path.name}.broken-{stamp}" for stamp in stamps[:10])
+    assert len(calls) == len(stamps)
+
+
+def test_cleanup_broken_backups_ignores_missing_directory_and_non_files(tmp_path: Path):
+    consume_load_warnings()
+    config_module._cleanup_broken_backups(str(tmp_path / "missing" / "layout_rules_v11.json"), "layout_rules_v11.json")
+    assert consume_load_warnings() == []
+
+    path = tmp_path / "layout_rules_v11.json"
+    stale_dir = tmp_path / f"{path.name}.broken-20000101-000000"
+    stale_dir.mkdir()
+    config_module._cleanup_broken_backups(str(path), path.name)
+    assert stale_dir.is_dir()
+    assert consume_load_warnings() == []
+
+
 def test_settings_save_writes_json_atomically(tmp_path: Path):
     path = tmp_path / "layout_settings_v11.json"
     settings = LayoutSettingsV11(enabled=False, start_minimized=False)
@@ -431,6 +515,38 @@ def test_settings_save_writes_json_atomically(tmp_path: Path):
     assert saved["start_minimized"] is False
 
 
+def test_settings_save_skips_rewrite_when_file_already_matches(tmp_path: Path, monkeypatch):
+    path = tmp_path / "layout_settings_v11.json"
+    settings = LayoutSettingsV11(enabled=False)
+    settings.save(str(path))
+    writes = []
+    original_atomic_write = config_module._atomic_write_text
+    monkeypatch.setattr(
+        config_module,
+        "_atomic_write_text",
+        lambda target, text: writes.append(target) or original_atomic_write(target, text),
+    )
+
+    settings.save(str(path))
+    assert writes == []
+
+    settings.enabled = True
+    settings.save(str(path))
+    assert writes == [str(path)]
+    assert json.loads(path.read_text(encoding="utf-8"))["enabled"] is True
+
+
+def test_settings_save_rewrites_same_size_file_with_different_content(tmp_path: Path):
+    path = tmp_path / "layout_settings_v11.json"
+    LayoutSettingsV11(log_level="INFO").save(str(path))
+    size_before = path.stat().st_size
+
+    LayoutSettingsV11(log_level="WARN").save(str(path))
+
+    assert path.stat().st_size == size_before
+    assert json.loads(path.read_text(encoding="utf-8"))["log_level"] == "WARN"
+
+
 def test_rules_save_writes_json_atomically(tmp_path: Path):
     path = tmp_path / "layout_rules_v11.json"
     rules = LayoutRulesV11(
@@ -493,6 +609,89 @@ def test_ensure_runtime_files_creates_missing_runtime_files(tmp_path: Path, monk
     assert (appdata_dir / "layout_adblock.log").exists()
 
 
+def test_ensure_runtime_files_falls_back_to_defaults_without_templates(tmp_path: Path, monkeypatch):
+    appdata_dir = tmp_path / "nested" / "appdata"
+
+    monkeypatch.setattr(config_module, "APPDATA_DIR", str(appdata_dir))
+    monkeypatch.setattr(config_module, "SETTINGS_FILE", str(appdata_dir / "layout_settings_v11.json"))
+    monkeypatch.setattr(config_module, "RULES_FILE", str(appdata_dir / "layout_rules_v11.json"))
+    monkeypatch.setattr(config_module, "LOG_FILE", str(appdata_dir / "layout_adblock.log"))
+    monkeypatch.setattr(config_module, "resource_base_dir", lambda: str(tmp_path / "missing-resources"))
+
+    config_module.ensure_runtime_files()
+
+    assert json.loads((appdata_dir / "layout_settings_v11.json").read_text(encoding="utf-8")) == json.loads(
+        LayoutSettingsV11.default_json()
+    )
+    assert (appdata_dir / "layout_rules_v11.json").exists()
+
+
+def test_backup_broken_json_skips_missing_source(tmp_path: Path):
+    consume_load_warnings()
+
+    assert config_module._backup_broken_json(str(tmp_path / "gone.json"), "gone.json", "parse error") is False
+    warnings = consume_load_warnings()
+    assert len(warnings) == 1
+    assert "원본 파일이 없어" in warnings[0]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_backup_broken_json_keeps_original_bytes_after_self_heal(tmp_path: Path):
+    path = tmp_path / "layout_settings_v11.json"
+    path.write_text("{ broken", encoding="utf-8")
+
+    LayoutSettingsV11.load(str(path))
+
+    backups = list(tmp_path.glob("layout_settings_v11.json.broken-*"))
+    assert len(backups) == 1
+    assert backups[0].read_text(encoding="utf-8") == "{ broken"
+    assert json.loads(path.read_text(encoding="utf-8")) == json.loads(LayoutSettingsV11.default_json())
+
+
+def test_backup_broken_json_falls_back_to_copy_when_link_fails(tmp_path: Path, monkeypatch):
+    path = tmp_path / "layout_rules_v11.json"
+    path.write_text("[]", encoding="utf-8")
+
+    def fail_link(src, dst):
+        raise OSError("hard links unsupported")
+
+    monkeypatch.setattr(config_module.storage.os, "link", fail_link)
+    consume_load_warnings()
+
+    LayoutRulesV11.load(str(path))
+    backups = list(tmp_path.glob("layout_rules_v11.json.broken-*"))
+    assert [b.read_text(encoding="utf-8") for b in backups] == ["[]"]
+
+
+def test_backup_broken_json_does_not_share_the_original_when_self_heal_fails(tmp_path: Path, monkeypatch):
+    path = tmp_path / "layout_settings_v11.json"
+    path.write_text("{ broken", encoding="utf-8")
+    monkeypatch.setattr(config_module, "_atomic_write_text", lambda _path, _text: (_ for _ in ()).throw(OSError("disk full")))
+    consume_load_warnings()
+
+    LayoutSettingsV11.load(str(path))
+
+    backups = list(tmp_path.glob("layout_settings_v11.json.broken-*"))
+    assert len(backups) == 1
+    assert backups[0].stat().st_ino != path.stat().st_ino
+    # A later in-place write to the still-broken original must not reach the backup.
+    with open(path, "r+", encoding="utf-8") as f:
+        f.write("{}")
+    assert backups[0].read_text(encoding="utf-8") == "{ broken"
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_backup_broken_json_copies_without_self_heal(tmp_path: Path):
+    path = tmp_path / "layout_rules_v11.json"
+    path.write_text("[]", encoding="utf-8")
+    consume_load_warnings()
+
+    assert config_module._backup_broken_json(str(path), "layout_rules_v11.json", "not an object") is True
+    backups = list(tmp_path.glob("layout_rules_v11.json.broken-*"))
+    assert [b.read_text(encoding="utf-8") for b in backups] == ["[]"]
+    assert backups[0].stat().st_ino != path.stat().st_ino
+
+
 def test_ensure_runtime_files_preserves_existing_runtime_files(tmp_path: Path, monkeypatch):
     appdata_dir = tmp_path / "appdata"
     appdata_dir.mkdir()
@@ -521,6 +720,85 @@ def test_ensure_runtime_files_preserves_existing_runtime_files(tmp_path: Path, m
     assert log_path.read_text(encoding="utf-8") == "existing-log"
 
 
+def test_ensure_runtime_files_skips_per_file_checks_on_warm_boot(tmp_path: Path, monkeypatch):
+    appdata_dir = tmp_path / "appdata"
+    appdata_dir.mkdir()
+    for name in ("layout_settings_v11.json", "layout_rules_v11.json", "layout_adblock.log"):
+        (appdata_dir / name).write_text("{}\n", encoding="utf-8")
+    monkeypatch.setattr(config_module, "APPDATA_DIR", str(appdata_dir))
+    monkeypatch.setattr(config_module, "SETTINGS_FILE", str(appdata_dir / "layout_settings_v11.json"))
+    monkeypatch.setattr(config_module, "RULES_FILE", str(appdata_dir / "layout_rules_v11.json"))
+    monkeypatch.setattr(config_module, "LOG_FILE", str(appdata_dir / "layout_adblock.log"))
+    templated: list[str] = []
+    monkeypatch.setattr(config_module, "_ensure_from_template", lambda dst, default_text: templated.append(dst))
+
+    config_module.ensure_runtime_files()
+    assert templated == []
+
+    (appdata_dir / "layout_rules_v11.json").unlink()
+    config_module.ensure_runtime_files()
+    assert templated == [str(appdata_dir / "layout_rules_v11.json")]
+
+
+def test_ensure_runtime_files_trusts_listing_and_never_clobbers_late_files(tmp_path: Path, monkeypatch):
+    appdata_dir = tmp_path / "appdata"
+    appdata_dir.mkdir()
+    settings_path = appdata_dir / "layout_settings_v11.json"
+    rules_path = appdata_dir / "layout_rules_v11.json"
+    log_path = appdata_dir / "layout_adblock.log"
+    monkeypatch.setattr(config_module, "APPDATA_DIR", str(appdata_dir))
+    monkeypatch.setattr(config_module, "SETTINGS_FILE", str(settings_path))
+    monkeypatch.setattr(config_module, "RULES_FILE", str(rules_path))
+    monkeypatch.setattr(config_module, "LOG_FILE", str(log_path))
+    monkeypatch.setattr(config_module, "resource_base_dir", lambda: str(tmp_path / "missing-resource"))
+    original_listed_names = config_module._listed_names
+
+    def listing_then_late_writer(directory, listings):
+        names = original_listed_names(directory, listings)
+        # Another instance creates the log right after this one listed the directory.
+        if not log_path.exists():
+            log_path.write_text("other-instance", encoding="utf-8")
+        return names
+
+    monkeypatch.setattr(config_module, "_listed_names", listing_then_late_writer)
+    exists_calls: list[str] = []
+    original_exists = config_module.os.path.exists
+    monkeypatch.setattr(
+        config_module.os.path,
+        "exists",
+        lambda path: exists_calls.append(str(path)) or original_exists(path),
+    )
+
+    config_module.ensure_runtime_files()
+
+    assert str(settings_path) not in exists_calls
+    assert str(rules_path) not in exists_calls
+    assert str(log_path) not in exists_calls
+    assert settings_path.exists() and rules_path.exists()
+    assert log_path.read_text(encoding="utf-8") == "other-instance"
+
+
+def test_runtime_writes_create_each_directory_once_and_recover_if_removed(tmp_path: Path, monkeypatch):
+    storage = config_module.storage
+    target_dir = tmp_path / "appdata"
+    calls: list[str] = []
+    original_makedirs = storage.os.makedirs
+    monkeypatch.setattr(storage.os, "makedirs", lambda name, exist_ok=False: calls.append(name) or original_makedirs(name, exist_ok=exist_ok))
+
+    LayoutSettingsV11(enabled=False).save(str(target_dir / "layout_settings_v11.json"))
+    LayoutSettingsV11(enabled=True).save(str(target_dir / "layout_settings_v11.json"))
+    config_module._write_text_if_missing(str(target_dir / "layout_adblock.log"), "")
+    assert calls == [str(target_dir)]
+
+    for child in target_dir.iterdir():
+        child.unlink()
+    target_dir.rmdir()
+    LayoutSettingsV11(enabled=False).save(str(target_dir / "layout_settings_v11.json"))
+    config_module._write_text_if_missing(str(target_dir / "layout_adblock.log"), "")
+    assert json.loads((target_dir / "layout_settings_v11.json").read_text(encoding="utf-8"))["enabled"] is False
+    assert (target_dir / "layout_adblock.log").exists()
+
+
 def test_config_import_does_not_create_appdata_dir(monkeypatch, tmp_path: Path):
     appdata_root = tmp_path / "Roaming"
     expected_dir = appdata_root / config_module.APPDATA_DIRNAME
@@ -3,6 +3,7 @@ import logging
 import threading
 import time
 from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, cast
 
 from kakao_adblocker.config import LayoutRulesV11, LayoutSettingsV11
 from kakao_adblocker.event_engine import LayoutOnlyEngine
@@ -31,6 +32,7 @@ class FakeAPI:
         self.hide_calls = []
         self.show_calls = []
         self.send_calls = []
+        self.win_event_watcher_factory: Optional[Callable[[Callable[[int, int], None]], Any]] = None
 
     def enum_windows(self, callback):
         for hwnd, info in sorted(self.windows.items()):
@@ -43,11 +45,34 @@ class FakeAPI:
             callback(child)
         return True
 
+    def enum_child_handles(self, parent_hwnd):
+        return list(self.children.get(parent_hwnd, []))
+
+    def enum_direct_children(self, parent_hwnd):
+        return [child for child in self.children.get(parent_hwnd, []) if self.windows[child]["parent"] == parent_hwnd]
+
+    def find_top_level_windows(self, class_name):
+        # FindWindowExW matches class names case-insensitively.
+        return [
+            hwnd
+            for hwnd, info in sorted(self.windows.items())
+            if info["parent"] == 0 and info["class"].lower() == class_name.lower()
+        ]
+
+    def find_child_windows(self, parent_hwnd, class_name):
+        return [
+            child
+            for child in self.enum_direct_children(parent_hwnd)
+            if self.windows[child]["class"].lower() == class_name.lower()
+        ]
+
     def get_window_thread_process_id(self, hwnd):
         return self.windows[hwnd]["pid"]
 
     def get_class_name(self, hwnd):
-        return self.windows[hwnd]["class"]
+        # Like GetClassNameW, a destroyed handle yields an empty class name.
+        window = self.windows.get(hwnd)
+        return window["class"] if window is not None else ""
 
     def get_window_text(self, hwnd):
         return self.windows[hwnd]["text"]
@@ -82,6 +107,9 @@ class FakeAPI:
     def update_window(self, hwnd):
         return hwnd in self.windows
 
+    def defer_window_positions(self, moves):
+        return False
+
     def send_message(self, hwnd, msg, wparam=0, lparam=0):
         self.send_calls.append((hwnd, msg, wparam, lparam))
         return 1
@@ -93,6 +121,11 @@ class FakeAPI:
     def get_last_error(self) -> int:
         return 0
 
+    def create_win_event_watcher(self, on_event):
+        # No hooks unless a test installs a factory; the engine then keeps plain polling.
+        factory = self.win_event_watcher_factory
+        return factory(on_event) if factory is not None else None
+
 
 def test_engine_applies_layout_only_to_kakao_pid():
     api = FakeAPI()
@@ -660,6 +693,51 @@ def test_engine_nested_popup_ad_class_is_closed_at_depth_two():
     assert 241 not in closed_handles
 
 
+def test_engine_popup_search_checks_visibility_only_for_popup_classes():
+    api = FakeAPI()
+    api.windows[240] = {"pid": 42, "class": "EVA_Window", "text": "", "parent": 0, "rect": (40, 40, 360, 240), "visible": True}
+    api.windows[241] = {"pid": 42, "class": "WrapperPanel", "text": "", "parent": 240, "rect": (40, 40, 360, 240), "visible": True}
+    api.windows[242] = {"pid": 42, "class": "AdFitWebView", "text": "", "parent": 241, "rect": (40, 40, 360, 240), "visible": False}
+    api.children[240] = [241]
+    api.children[241] = [242]
+    visible_hwnds: list[int] = []
+    original_visible = api.is_window_visible
+    api.is_window_visible = lambda hwnd: visible_hwnds.append(hwnd) or original_visible(hwnd)
+    engine = LayoutOnlyEngine(
+        logging.getLogger("test"),
+        LayoutSettingsV11(enabled=True, poll_interval_ms=100, aggressive_mode=False),
+        LayoutRulesV11(popup_ad_classes=["AdFitWebView"], popup_search_depth=2),
+        api=api,
+        process_ids_provider=lambda _name: {42},
+    )
+
+    assert engine._scanner.find_popup_matches(240) == []
+    assert visible_hwnds == [242]
+
+    api.windows[242]["visible"] = True
+    assert engine._scanner.find_popup_matches(240) == [(242, 2, "AdFitWebView")]
+
+
+def test_engine_popup_search_visits_each_descendant_once_with_subtree_enumeration():
+    api = FakeAPI()
+    api.windows[240] = {"pid": 42, "class": "EVA_Window", "text": "", "parent": 0, "rect": (40, 40, 360, 240), "visible": True}
+    api.windows[241] = {"pid": 42, "class": "WrapperPanel", "text": "", "parent": 240, "rect": (40, 40, 360, 240), "visible": True}
+    api.windows[242] = {"pid": 42, "class": "AdFitWebView", "text": "", "parent": 241, "rect": (40, 40, 360, 240), "visible": True}
+    # Like the real EnumChildWindows, report every descendant rather than only direct children.
+    api.children[240] = [241, 242]
+    api.children[241] = [242]
+    engine = LayoutOnlyEngine(
+        logging.getLogger("test"),
+        LayoutSettingsV11(enabled=True, poll_interval_ms=100, aggressive_mode=False),
+        LayoutRulesV11(popup_ad_classes=["AdFitWebView"], popup_search_depth=2),
+        api=api,
+        process_ids_provider=lambda _name: {42},
+    )
+
+    assert engine._scanner.enum_descendants(240, 2) == [(241, 1), (242, 1)]
+    assert engine._scanner.find_popup_matches(240) == [(242, 1, "AdFitWebView")]
+
+
 def test_engine_nested_popup_ad_class_is_ignored_beyond_depth_limit():
     api = FakeAPI()
     api.windows[240] = {
@@ -967,6 +1045,92 @@ def test_engine_candidate_detection_supports_legacy_substring_signature():
     assert 230 in api.hide_calls
 
 
+def test_engine_legacy_signature_reads_each_window_text_once():
+    api = FakeAPI()
+    api.windows[230] = {
+        "pid": 42,
+        "class": "AdCandidateWin",
+        "text": "Kakao Legacy Surface host",
+        "parent": 0,
+        "rect": (20, 20, 320, 320),
+        "visible": True,
+    }
+    api.windows[231] = {
+        "pid": 42,
+        "class": "Chrome_WidgetWin_1",
+        "text": "",
+        "parent": 230,
+        "rect": (20, 20, 320, 320),
+        "visible": True,
+    }
+    api.windows[232] = {
+        "pid": 42,
+        "class": "Chrome_RenderWidgetHostHWND",
+        "text": "Chrome Legacy Window",
+        "parent": 231,
+        "rect": (20, 20, 320, 320),
+        "visible": True,
+    }
+    api.children[230] = [231]
+    api.children[231] = [232]
+    rules = LayoutRulesV11(
+        chrome_legacy_title="Chrome Legacy Window",
+        chrome_legacy_title_contains=["Legacy Surface", "Legacy Window"],
+    )
+    engine = LayoutOnlyEngine(
+        logging.getLogger("test"),
+        LayoutSettingsV11(enabled=True, poll_interval_ms=100, aggressive_mode=False),
+        rules,
+        api=api,
+        process_ids_provider=lambda _name: {42},
+    )
+    original_get_window_text = api.get_window_text
+    text_reads = []
+
+    def counting_get_window_text(hwnd):
+        text_reads.append(hwnd)
+        return original_get_window_text(hwnd)
+
+    api.get_window_text = counting_get_window_text
+    memo = {}
+
+    # The substring hit on the root must not hide the exact title deeper in the subtree.
+    assert engine._signals.legacy_signature_kind(230, memo=memo) == "exact"
+    assert sorted(text_reads) == [230, 231, 232]
+    assert engine._signals.legacy_signature_kind(231, memo=memo) == "exact"
+    assert len(text_reads) == 3
+
+    api.windows[232]["text"] = "renderer"
+    assert engine._signals.legacy_signature_kind(230) == "substring"
+    api.windows[230]["text"] = "host"
+    assert engine._signals.matches_legacy_signature(230) is False
+
+
+def test_engine_legacy_signature_reaches_descendants_at_any_depth():
+    api = FakeAPI()
+    api.windows[230] = {"pid": 42, "class": "EVA_Window", "text": "", "parent": 0, "rect": (20, 20, 320, 320), "visible": True}
+    parent = 230
+    for hwnd in range(700, 712):
+        api.windows[hwnd] = {"pid": 42, "class": "Chrome_WidgetWin_0", "text": "", "parent": parent, "rect": (20, 20, 320, 320), "visible": True}
+        api.children[parent] = [hwnd]
+        parent = hwnd
+    engine = LayoutOnlyEngine(
+        logging.getLogger("test"),
+        LayoutSettingsV11(enabled=True, poll_interval_ms=100, aggressive_mode=False),
+        LayoutRulesV11(),
+        api=api,
+        process_ids_provider=lambda _name: {42},
+    )
+
+    assert engine._signals.legacy_signature_kind(230) == ""
+
+    # Twelve levels below the candidate, past the old max_depth of 8.
+    api.windows[711]["text"] = "Chrome Legacy Window"
+    assert engine._signals.legacy_signature_kind(230) == "exact"
+    engine.scan_once()
+    assert 230 in engine._ad_subwindow_candidates
+
+
 def test_engine_hides_eva_window_dblclk_legacy_candidate_with_default_rules():
     api = FakeAPI()
     api.windows[220] = {
@@ -1066,6 +1230,239 @@ def test_engine_switches_between_idle_and_active_intervals():
     assert abs(engine._current_loop_interval_seconds(now) - 0.5) < 1e-9
 
 
+def test_engine_backs_off_active_interval_while_tree_is_stable():
+    api = FakeAPI()
+    original_set_window_pos = api.set_window_pos
+
+    def resizing_set_window_pos(hwnd, x, y, width, height, flags):
+        left, top, _right, _bottom = api.windows[hwnd]["rect"]
+        api.windows[hwnd]["rect"] = (left, top, left + width, top + height)
+        return original_set_window_pos(hwnd, x, y, width, height, flags)
+
+    api.set_window_pos = resizing_set_window_pos
+    settings = LayoutSettingsV11(
+        enabled=True,
+        poll_interval_ms=50,
+        stable_scan_ticks=3,
+        stable_poll_interval_ms=200,
+        burst_scan_iterations=0,
+        aggressive_mode=True,
+    )
+    engine = LayoutOnlyEngine(
+        logging.getLogger("test"),
+        settings,
+        LayoutRulesV11(),
+        api=api,
+        process_ids_provider=lambda _name: {42},
+    )
+
+    # Tick 1 hides the banner and resizes the main view, tick 2 sees the new layout.
+    for _ in range(4):
+        engine.scan_once()
+        engine.apply_once()
+    assert engine._stable_ticks == 2
+    assert abs(engine._current_loop_interval_seconds() - 0.05) < 1e-9
+
+    engine.scan_once()
+    engine.apply_once()
+    assert abs(engine._current_loop_interval_seconds() - 0.2) < 1e-9
+
+    api.windows[102]["rect"] = (0, 600, 500, 700)
+    engine.scan_once()
+    engine.apply_once()
+    assert abs(engine._current_loop_interval_seconds() - 0.05) < 1e-9
+
+    settings.stable_scan_ticks = 0
+    for _ in range(5):
+        engine.scan_once()
+        engine.apply_once()
+    assert abs(engine._current_loop_interval_seconds() - 0.05) < 1e-9
+
+
+def test_engine_doubles_stable_interval_up_to_ceiling():
+    settings = LayoutSettingsV11(
+        enabled=True,
+        poll_interval_ms=50,
+        stable_scan_ticks=4,
+        stable_poll_interval_ms=200,
+        stable_max_poll_interval_ms=700,
+    )
+    engine = LayoutOnlyEngine(
+        logging.getLogger("test"),
+        settings,
+        LayoutRulesV11(),
+        api=FakeAPI(),
+        process_ids_provider=lambda _name: {42},
+    )
+    with engine._data_lock:
+        engine._kakao_pids = {42}
+
+    expected = {3: 0.05, 4: 0.2, 7: 0.2, 8: 0.4, 12: 0.7, 500: 0.7}
+    for ticks, interval in expected.items():
+        engine._stable_ticks = ticks
+        assert abs(engine._current_loop_interval_seconds() - interval) < 1e-9
+
+    engine._on_win_event(0x800B, 101)
+    assert abs(engine._current_loop_interval_seconds() - 0.05) < 1e-9
+
+
+class _FakeWinEventWatcher:
+    def __init__(self, on_event, start_ok=True, active=True):
+        self.on_event = on_event
+        self.start_ok = start_ok
+        self.active = active
+        self.pid_updates = []
+        self.stopped = False
+
+    def start(self):
+        return self.start_ok
+
+    def stop(self, timeout=1.0):
+        self.stopped = True
+
+    def set_pids(self, pids):
+        self.pid_updates.append(set(pids))
+
+    def is_active(self):
+        return self.active
+
+
+def test_engine_win_event_hooks_stretch_stable_interval_and_wake_on_event():
+    api = FakeAPI()
+    watchers = []
+
+    def create_win_event_watcher(on_event):
+        watcher = _FakeWinEventWatcher(on_event)
+        watchers.append(watcher)
+        return watcher
+
+    api.win_event_watcher_factory = create_win_event_watcher
+    settings = LayoutSettingsV11(
+        enabled=True,
+        poll_interval_ms=50,
+        stable_scan_ticks=1,
+        stable_poll_interval_ms=200,
+        event_keepalive_interval_ms=5000,
+        burst_scan_iterations=0,
+        aggressive_mode=False,
+    )
+    engine = LayoutOnlyEngine(
+        logging.getLogger("test"),
+        settings,
+        LayoutRulesV11(),
+        api=api,
+        process_ids_provider=lambda _name: {42},
+    )
+    engine._start_win_event_watcher()
+    assert len(watchers) == 1
+
+    engine._stable_ticks = 1
+    engine._last_activity = time.time()
+    assert abs(engine._current_loop_interval_seconds() - 5.0) < 1e-9
+
+    # Hooks that never installed (UIPI, elevated KakaoTalk) keep the stable polling cap.
+    watchers[0].active = False
+    assert abs(engine._current_loop_interval_seconds() - 0.2) < 1e-9
+    watchers[0].active = True
+
+    engine.scan_once()
+    assert watchers[0].pid_updates[-1] == {42}
+
+    engine._wake_event.clear()
+    watchers[0].on_event(0x800B, 101)
+    assert engine._stable_ticks == 0
+    assert engine._wake_event.is_set()
+    assert abs(engine._current_loop_interval_seconds() - 0.05) < 1e-9
+
+    # Events that arrive while already polling at the active interval do not wake the loop again.
+    engine._wake_event.clear()
+    watchers[0].on_event(0x800B, 101)
+    assert not engine._wake_event.is_set()
+
+    engine._stop_win_event_watcher()
+    assert watchers[0].stopped is True
+    engine._stable_ticks = 1
+    assert abs(engine._current_loop_interval_seconds() - 0.2) < 1e-9
+
+
+def test_engine_popup_host_scan_reuses_top_level_handles_until_window_event():
+    api = FakeAPI()
+    enum_calls = []
+    original_enum_windows = api.enum_windows
+
+    def tracking_enum_windows(callback):
+        enum_calls.append(1)
+        return original_enum_windows(callback)
+
+    api.enum_windows = tracking_enum_windows
+    api.win_event_watcher_factory = lambda on_event: _FakeWinEventWatcher(on_event)
+    engine = LayoutOnlyEngine(
+        logging.getLogger("test"),
+        LayoutSettingsV11(enabled=True, event_keepalive_interval_ms=5000),
+        LayoutRulesV11(),
+        api=api,
+        process_ids_provider=lambda _name: {42},
+    )
+    scanner = engine._scanner
+
+    # Without hooks every call walks the desktop.
+    scanner.collect_top_level_windows({42})
+    scanner.collect_top_level_windows({42})
+    assert len(enum_calls) == 2
+
+    engine._start_win_event_watcher()
+    first = scanner.collect_top_level_windows({42})
+    second = scanner.collect_top_level_windows({42})
+    assert len(enum_calls) == 3
+    assert [item.hwnd for item in second] == [item.hwnd for item in first]
+
+    api.windows[400] = {"pid": 42, "class": "EVA_Window", "text": "", "parent": 0, "rect": (0, 0, 10, 10), "visible": True}
+    engine._on_win_event(0x8000, 400)
+    third = scanner.collect_top_level_windows({42})
+    assert len(enum_calls) == 4
+    assert 400 in [item.hwnd for item in third]
+
+    scanner.collect_top_level_windows({42, 99})
+    assert len(enum_calls) == 5
+
+    # A watcher whose hooks are not (all) installed cannot report new windows, so every call walks again.
+    watcher = engine._win_event_watcher
+    assert isinstance(watcher, _FakeWinEventWatcher)
+    watcher.active = False
+    scanner.collect_top_level_windows({42})
+    scanner.collect_top_level_windows({42})
+    assert len(enum_calls) == 7
+    assert engine._top_level_cache is None
+
+
+def test_engine_win_event_watcher_is_dropped_when_disabled_or_start_fails():
+    api = FakeAPI()
+    watchers = []
+
+    def create_win_event_watcher(on_event):
+        watcher = _FakeWinEventWatcher(on_event, start_ok=False)
+        watchers.append(watcher)
+        return watcher
+
+    api.win_event_watcher_factory = create_win_event_watcher
+    settings = LayoutSettingsV11(enabled=True, win_event_hooks=False)
+    engine = LayoutOnlyEngine(
+        logging.getLogger("test"),
+        settings,
+        LayoutRulesV11(),
+        api=api,
+        process_ids_provider=lambda _name: {42},
+    )
+
+    engine._start_win_event_watcher()
+    assert watchers == []
+
+    settings.win_event_hooks = True
+    engine._start_win_event_watcher()
+    assert engine._win_event_watcher is None
+    assert watchers[0].stopped is True
+
+
 def test_engine_cache_cleanup_is_throttled(monkeypatch):
     api = FakeAPI()
     settings = LayoutSettingsV11(
@@ -1121,6 +1518,42 @@ def test_engine_watch_loop_runs_apply_in_same_cycle(monkeypatch):
     assert calls == ["watch", "apply"]
 
 
+def test_engine_watch_loop_subtracts_pass_duration_from_wait(monkeypatch):
+    from kakao_adblocker.event_engine.constants import MIN_LOOP_WAIT_SECONDS
+
+    engine = LayoutOnlyEngine(
+        logging.getLogger("test"),
+        LayoutSettingsV11(enabled=True, poll_interval_ms=100, burst_scan_iterations=0),
+        LayoutRulesV11(),
+        api=FakeAPI(),
+        process_ids_provider=lambda _name: {42},
+    )
+    clock = [10.0]
+    pass_durations = [0.03, 0.25]
+    waits = []
+
+    monkeypatch.setattr("kakao_adblocker.event_engine.controller.time.monotonic", lambda: clock[0])
+    monkeypatch.setattr(engine, "_watch_once", lambda: None)
+    monkeypatch.setattr(engine, "_next_wait_interval_seconds", lambda: 0.1)
+
+    def _apply_once():
+        clock[0] += pass_durations.pop(0)
+
+    def _wait(timeout):
+        waits.append(timeout)
+        if not pass_durations:
+            engine._stop_event.set()
+
+    monkeypatch.setattr(engine, "_apply_once", _apply_once)
+    monkeypatch.setattr(engine, "_wait_next_tick", _wait)
+    engine._stop_event.clear()
+
+    engine._watch_loop()
+
+    assert abs(waits[0] - 0.07) < 1e-9
+    assert waits[1] == MIN_LOOP_WAIT_SECONDS
+
+
 def test_engine_watch_loop_pauses_when_disabled(monkeypatch):
     api = FakeAPI()
     settings = LayoutSettingsV11(enabled=False, poll_interval_ms=100, aggressive_mode=True)
@@ -1260,6 +1693,429 @@ def test_engine_scan_path_skips_rect_and_visibility_calls():
     assert api.visible_calls == 0
 
 
+def test_engine_pass_reuses_class_and_pid_lookups_per_hwnd():
+    api = FakeAPI()
+    class_calls: list[int] = []
+    pid_calls: list[int] = []
+    original_class = api.get_class_name
+    original_pid = api.get_window_thread_process_id
+    api.get_class_name = lambda hwnd: class_calls.append(hwnd) or original_class(hwnd)
+    api.get_window_thread_process_id = lambda hwnd: pid_calls.append(hwnd) or original_pid(hwnd)
+    settings = LayoutSettingsV11(enabled=True, poll_interval_ms=100, aggressive_mode=True)
+    engine = LayoutOnlyEngine(
+        logging.getLogger("test"),
+        settings,
+        LayoutRulesV11(),
+        api=api,
+        process_ids_provider=lambda _name: {42},
+    )
+
+    engine.scan_once()
+    engine.apply_once()
+    assert 102 in api.hide_calls
+
+    class_calls.clear()
+    pid_calls.clear()
+    engine.apply_once()
+
+    assert class_calls.count(101) == 1
+    assert class_calls.count(102) == 1
+    assert pid_calls.count(100) == 1
+    assert engine._lookup_pass.classes is None
+
+    api.windows[101]["class"] = "Recycled"
+    assert engine._get_class(101) == "Recycled"
+
+
+def test_engine_watch_pass_skips_title_reads_for_unrelated_classes():
+    api = FakeAPI()
+    api.windows[500] = {"pid": 42, "class": "IME", "text": "Default IME", "parent": 0, "rect": (0, 0, 1, 1), "visible": False}
+    text_calls: list[int] = []
+    original_text = api.get_window_text
+    api.get_window_text = lambda hwnd: text_calls.append(hwnd) or original_text(hwnd)
+    engine = LayoutOnlyEngine(
+        logging.getLogger("test"),
+        LayoutSettingsV11(enabled=True, poll_interval_ms=100, aggressive_mode=True),
+        LayoutRulesV11(),
+        api=api,
+        process_ids_provider=lambda _name: {42},
+    )
+
+    engine._watch_once()
+
+    assert 500 not in text_calls
+    assert 100 in text_calls
+    assert engine.state.main_window_count == 1
+    assert any(w.hwnd == 500 and w.text == "Default IME" for w in engine._scanner.collect_windows({42}))
+
+
+def test_engine_enum_children_uses_handle_collector():
+    api = FakeAPI()
+
+    def fail_enum_child_windows(parent_hwnd, callback):
+        raise AssertionError("callback enumeration should not be used")
+
+    api.enum_child_windows = fail_enum_child_windows
+    engine = LayoutOnlyEngine(
+        logging.getLogger("test"),
+        LayoutSettingsV11(enabled=True, poll_interval_ms=100, aggressive_mode=True),
+        LayoutRulesV11(),
+        api=api,
+        process_ids_provider=lambda _name: {42},
+    )
+
+    engine.scan_once()
+    engine.apply_once()
+
+    assert engine._scanner.enum_children(100) == [101, 102]
+    assert 102 in api.hide_calls
+
+
+def test_engine_apply_uses_direct_children_without_parent_checks():
+    api = FakeAPI()
+    api.windows[103] = {"pid": 42, "class": "Chrome_WidgetWin_1", "text": "Advertisement", "parent": 102, "rect": (0, 620, 500, 700), "visible": True}
+    api.children[100] = [101, 102, 103]
+    parent_calls: list[int] = []
+    original_parent = api.get_parent
+    api.get_parent = lambda hwnd: parent_calls.append(hwnd) or original_parent(hwnd)
+    engine = LayoutOnlyEngine(
+        logging.getLogger("test"),
+        LayoutSettingsV11(enabled=True, poll_interval_ms=100, aggressive_mode=True),
+        LayoutRulesV11(),
+        api=api,
+        process_ids_provider=lambda _name: {42},
+    )
+
+    engine.scan_once()
+    parent_calls.clear()
+    engine.apply_once()
+
+    assert 102 in api.hide_calls
+    assert 103 not in api.hide_calls
+    assert 101 not in parent_calls and 102 not in parent_calls
+
+
+def test_engine_subtree_token_walk_visits_each_descendant_once():
+    api = FakeAPI()
+    api.windows[102]["text"] = ""
+    api.windows[103] = {"pid": 42, "class": "Chrome_RenderWidgetHostHWND", "text": "", "parent": 102, "rect": (0, 620, 500, 700), "visible": True}
+    api.windows[104] = {"pid": 42, "class": "Intermediate D3D Window", "text": "", "parent": 103, "rect": (0, 620, 500, 700), "visible": True}
+    api.children[102] = [103]
+    api.children[103] = [104]
+
+    def enum_all_descendants(parent_hwnd, callback):
+        # Mirrors user32.EnumChildWindows, which also reports grandchildren.
+        stack = list(reversed(api.children.get(parent_hwnd, [])))
+        while stack:
+            hwnd = stack.pop()
+            callback(hwnd)
+            stack.extend(reversed(api.children.get(hwnd, [])))
+        return True
+
+    api.enum_child_windows = enum_all_descendants
+    is_window_hwnds: list[int] = []
+    original_is_window = api.is_window
+    api.is_window = lambda hwnd: is_window_hwnds.append(hwnd) or original_is_window(hwnd)
+    engine = LayoutOnlyEngine(
+        logging.getLogger("test"),
+        LayoutSettingsV11(enabled=True, poll_interval_ms=100, aggressive_mode=True),
+        LayoutRulesV11(),
+        api=api,
+        process_ids_provider=lambda _name: {42},
+    )
+
+    assert engine._signals.subtree_contains_ad_token(102, memo={}) is False
+    assert is_window_hwnds == [102, 103, 104]
+
+    api.windows[104]["text"] = "AdFit"
+    assert engine._signals.subtree_contains_ad_token(102, memo={}, fresh_text=True) is True
+
+
+def test_engine_subtree_walks_reach_descendants_at_any_depth():
+    api = FakeAPI()
+    api.windows[102]["text"] = ""
+    parent = 102
+    for hwnd in range(600, 612):
+        api.windows[hwnd] = {"pid": 42, "class": "Chrome_WidgetWin_0", "text": "", "parent": parent, "rect": (0, 620, 500, 700), "visible": True}
+        api.children[parent] = [hwnd]
+        parent = hwnd
+    engine = LayoutOnlyEngine(
+        logging.getLogger("test"),
+        LayoutSettingsV11(enabled=True, poll_interval_ms=100, aggressive_mode=True),
+        LayoutRulesV11(),
+        api=api,
+        process_ids_provider=lambda _name: {42},
+    )
+
+    assert engine._signals.subtree_contains_ad_token(102, memo={}) is False
+    assert engine._signals.class_name_starts_with(102, "CustomScroll") is False
+
+    # Twelve levels below the walk root, past the old max_depth of 8.
+    api.windows[611]["text"] = "AdFit"
+    api.windows[611]["class"] = "CustomScrollBar"
+    assert engine._signals.subtree_contains_ad_token(102, memo={}) is True
+    assert engine._signals.class_name_starts_with(102, "CustomScroll") is True
+
+
+def test_engine_apply_skips_subtree_token_walk_for_non_chrome_children(monkeypatch):
+    api = FakeAPI()
+    api.windows[103] = {"pid": 42, "class": "ListItem", "text": "Advertisement", "parent": 101, "rect": (0, 0, 10, 10), "visible": True}
+    api.children[101] = [103]
+    engine = LayoutOnlyEngine(
+        logging.getLogger("test"),
+        LayoutSettingsV11(enabled=True, poll_interval_ms=100, aggressive_mode=True),
+        LayoutRulesV11(),
+        api=api,
+        process_ids_provider=lambda _name: {42},
+    )
+    walked: list[int] = []
+    original_walk = engine._signals.subtree_contains_ad_token
+
+    def recording_walk(hwnd, *args, **kwargs):
+        walked.append(hwnd)
+        return original_walk(hwnd, *args, **kwargs)
+
+    monkeypatch.setattr(engine._signals, "subtree_contains_ad_token", recording_walk)
+
+    engine.scan_once()
+    engine.apply_once()
+
+    assert walked == [102]
+    assert 102 in api.hide_calls
+    assert 101 not in api.hide_calls
+
+
+def test_engine_apply_uses_class_lookup_as_child_liveness_check():
+    class StaleChildAPI(FakeAPI):
+        stale_child = False
+
+        def enum_direct_children(self, parent_hwnd):
+            # A child destroyed between enumeration and lookup still shows up in the handle list.
+            stale = [999] if parent_hwnd == 100 and self.stale_child else []
+            return stale + super().enum_direct_children(parent_hwnd)
+
+    api = StaleChildAPI()
+    engine = LayoutOnlyEngine(
+        logging.getLogger("test"),
+        LayoutSettingsV11(enabled=True, poll_interval_ms=100, aggressive_mode=True),
+        LayoutRulesV11(),
+        api=api,
+        process_ids_provider=lambda _name: {42},
+    )
+    engine.scan_once()
+    api.stale_child = True
+    checked: list[int] = []
+    original_is_window = api.is_window
+
+    def recording_is_window(hwnd):
+        checked.append(hwnd)
+        return original_is_window(hwnd)
+
+    api.is_window = recording_is_window
+    engine.apply_once()
+
+    assert 999 not in checked
+    assert 102 in api.hide_calls
+
+
+def test_engine_has_tracked_state_covers_candidates_and_hidden_windows():
+    from kakao_adblocker.event_engine.models import CandidateState, HiddenWindowSnapshot
+
+    engine = LayoutOnlyEngine(
+        logging.getLogger("test"),
+        LayoutSettingsV11(enabled=True),
+        LayoutRulesV11(),
+        api=FakeAPI(),
+        process_ids_provider=lambda _name: {42},
+    )
+    candidate = (102, 42, "Chrome_WidgetWin_1")
+    hidden = (201, 42, "Chrome_WidgetWin_1")
+
+    assert engine._has_tracked_state(candidate) is False
+    engine._candidate_states[candidate] = CandidateState()
+    engine._hidden_windows[hidden] = HiddenWindowSnapshot(True, None, 42, "Chrome_WidgetWin_1", "aggressive")
+
+    assert engine._has_tracked_state(candidate) is True
+    assert engine._has_tracked_state(hidden) is True
+    assert engine._has_tracked_state((999, 42, "x")) is False
+
+
+def test_engine_membership_probes_do_not_take_cache_lock():
+    from kakao_adblocker.event_engine.models import CandidateState, HiddenWindowSnapshot
+
+    engine = LayoutOnlyEngine(
+        logging.getLogger("test"),
+        LayoutSettingsV11(enabled=True),
+        LayoutRulesV11(),
+        api=FakeAPI(),
+        process_ids_provider=lambda _name: {42},
+    )
+    candidate = (102, 42, "Chrome_WidgetWin_1")
+    hidden = (201, 42, "Chrome_WidgetWin_1")
+    engine._candidate_states[candidate] = CandidateState()
+    engine._hidden_windows[hidden] = HiddenWindowSnapshot(True, None, 42, "Chrome_WidgetWin_1", "aggressive")
+
+    # _cache_lock is not reentrant, so any probe that still took it would deadlock here.
+    with engine._cache_lock:
+        assert engine._candidate_state(candidate) is not None
+        assert engine._is_hidden_identity(hidden) is True
+        assert engine._has_tracked_state(candidate) is True
+        assert engine._actions._is_hidden_with_reason(hidden, "aggressive") is True
+
+
+def test_engine_per_window_models_use_slots():
+    from kakao_adblocker.event_engine.models import CandidateState, HiddenWindowSnapshot, WindowInfo
+
+    info = WindowInfo(hwnd=1, pid=42, class_name="EVA_Window", text="", parent_hwnd=0, rect=None, visible=False)
+    snapshot = HiddenWindowSnapshot(was_visible=True, rect=None, pid=42, class_name="EVA_Window", hide_reason="")
+
+    for item in (info, snapshot, CandidateState()):
+        assert not hasattr(item, "__dict__")
+
+
+def test_engine_watch_pass_looks_up_watched_classes_directly():
+    api = FakeAPI()
+
+    def fail_enum_windows(callback):
+        raise AssertionError("watch pass should not walk every top-level window")
+
+    api.enum_windows = fail_enum_windows
+    engine = LayoutOnlyEngine(
+        logging.getLogger("test"),
+        LayoutSettingsV11(enabled=True, poll_interval_ms=100, aggressive_mode=True),
+        LayoutRulesV11(),
+        api=api,
+        process_ids_provider=lambda _name: {42},
+    )
+
+    engine.scan_once()
+
+    state = engine.state
+    assert state.main_window_count == 1
+    assert engine._main_window_handles == {100}
+
+
+def test_engine_main_view_signature_finds_direct_eva_child_by_class():
+    api = FakeAPI()
+    enum_calls = []
+    original_enum_child_handles = api.enum_child_handles
+
+    def tracking_enum_child_handles(parent_hwnd):
+        enum_calls.append(parent_hwnd)
+        return original_enum_child_handles(parent_hwnd)
+
+    api.enum_child_handles = tracking_enum_child_handles
+    engine = LayoutOnlyEngine(
+        logging.getLogger("test"),
+        LayoutSettingsV11(enabled=True),
+        LayoutRulesV11(),
+        api=api,
+        process_ids_provider=lambda _name: {42},
+    )
+
+    assert engine._scanner.has_main_view_signature(100) is True
+    assert enum_calls == []
+    assert engine._scanner.has_main_view_signature(200) is False
+    assert enum_calls == [200]
+
+
+def test_engine_apply_reuses_main_window_confirmation_from_watch(monkeypatch):
+    api = FakeAPI()
+    engine = LayoutOnlyEngine(
+        logging.getLogger("test"),
+        LayoutSettingsV11(enabled=True, poll_interval_ms=100, aggressive_mode=True),
+        LayoutRulesV11(),
+        api=api,
+        process_ids_provider=lambda _name: {42},
+    )
+    engine.scan_once()
+    assert engine._main_window_identities == {(100, 42, api.windows[100]["class"])}
+
+    original_confirm = engine._scanner.is_confirmed_main_window
+
+    def guarded_confirm(hwnd, item=None):
+        assert hwnd != 100, "apply should reuse the watch pass confirmation"
+        return original_confirm(hwnd, item=item)
+
+    monkeypatch.setattr(engine._scanner, "is_confirmed_main_window", guarded_confirm)
+    engine.apply_once()
+
+    assert 101 in [x[0] for x in api.set_pos_calls]
+
+
+def test_engine_state_returns_detached_snapshot():
+    engine = LayoutOnlyEngine(
+        logging.getLogger("test"),
+        LayoutSettingsV11(enabled=True),
+        LayoutRulesV11(),
+        api=FakeAPI(),
+        process_ids_provider=lambda _name: {42},
+    )
+
+    snapshot = engine.state
+    snapshot.hidden_windows = 99
+    snapshot.last_error = "mutated"
+
+    assert snapshot is not engine._state
+    assert engine.state.hidden_windows == 0
+    assert engine.state.last_error == ""
+
+
+def test_engine_title_tokens_are_lowercased_once_at_init():
+    engine = LayoutOnlyEngine(
+        logging.getLogger("test"),
+        LayoutSettingsV11(enabled=True),
+        LayoutRulesV11(main_window_titles=["KakaoTalk", ""], popup_host_text_contains=["AD", ""]),
+        api=FakeAPI(),
+        process_ids_provider=lambda _name: {42},
+    )
+
+    assert engine._main_title_tokens_lc == ("kakaotalk",)
+    assert engine._popup_host_text_tokens_lc == ("ad",)
+    assert engine._is_main_title("My KAKAOTALK") is True
+    assert engine._is_main_title("") is False
+    assert engine._signals.popup_host_text_matches("Ad host") is True
+
+
+def test_engine_title_tokens_match_literally_in_one_pattern():
+    engine = LayoutOnlyEngine(
+        logging.getLogger("test"),
+        LayoutSettingsV11(enabled=True),
+        LayoutRulesV11(main_window_titles=["Kakao.Talk", "카카오톡"]),
+        api=FakeAPI(),
+        process_ids_provider=lambda _name: {42},
+    )
+
+    assert engine._is_main_title("kakao.talk") is True
+    assert engine._is_main_title("KakaoXTalk") is False
+    assert engine._is_main_title("카카오톡 PC") is True
+
+
+def test_engine_main_window_check_uses_both_view_prefixes():
+    api = FakeAPI()
+    for hwnd, text in ((501, "CustomLock_1"), (502, "Other"), (503, "CustomMain_2")):
+        api.windows[hwnd] = {
+            "pid": 42,
+            "class": "EVA_ChildWindow",
+            "text": text,
+            "parent": 0,
+            "rect": (0, 0, 100, 100),
+            "visible": True,
+        }
+    engine = LayoutOnlyEngine(
+        logging.getLogger("test"),
+        LayoutSettingsV11(enabled=True),
+        LayoutRulesV11(main_view_prefix="CustomMain", lock_view_prefix="CustomLock"),
+        api=api,
+        process_ids_provider=lambda _name: {42},
+    )
+
+    assert engine._view_prefixes == ("CustomMain", "CustomLock")
+    assert engine._scanner.is_main_window([502, 501]) is True
+    assert engine._scanner.is_main_window([502, 503]) is True
+    assert engine._scanner.is_main_window([502]) is False
+
+
 def test_engine_text_cache_uses_hwnd_pid_class_identity():
     api = FakeAPI()
     api.windows[400] = {
@@ -1824,6 +2680,24 @@ def test_engine_dump_tree_series_includes_candidate_decisions(tmp_path):
     assert any(candidate["action"] == "hide" for candidate in payload["frames"][0]["candidates"])
 
 
+def test_engine_dump_tree_writes_utf8_bytes_with_lf_newlines(tmp_path):
+    api = FakeAPI()
+    engine = LayoutOnlyEngine(
+        logging.getLogger("test"),
+        LayoutSettingsV11(enabled=True),
+        LayoutRulesV11(),
+        api=api,
+        process_ids_provider=lambda _name: {42},
+    )
+
+    path = engine.dump_window_tree(out_dir=str(tmp_path))
+
+    assert path is not None
+    raw = (tmp_path / Path(path).name).read_bytes()
+    assert b"\r\n" not in raw
+    assert json.loads(raw.decode("utf-8"))
+
+
 def test_engine_dump_tree_series_includes_popup_host_and_descendant_candidates(tmp_path):
     api = FakeAPI()
     api.windows[240] = {
@@ -1885,6 +2759,58 @@ def test_engine_dump_tree_records_child_signature_fallback_context(tmp_path):
     )
 
 
+def test_engine_dump_tree_reuses_collected_snapshot_for_roots(tmp_path):
+    api = FakeAPI()
+    rect_hwnds = []
+    original_get_window_rect = api.get_window_rect
+
+    def counting_get_window_rect(hwnd):
+        rect_hwnds.append(hwnd)
+        return original_get_window_rect(hwnd)
+
+    api.get_window_rect = counting_get_window_rect
+    engine = LayoutOnlyEngine(
+        logging.getLogger("test"),
+        LayoutSettingsV11(enabled=True, aggressive_mode=False),
+        LayoutRulesV11(),
+        api=api,
+        process_ids_provider=lambda _name: {42},
+    )
+
+    roots = [w for w in engine._scanner.collect_windows({42}, include_geometry=True) if w.parent_hwnd == 0]
+    rect_hwnds.clear()
+    nodes = [engine._dump.dump_node(root.hwnd, 0, 0, item=root) for root in roots]
+
+    assert rect_hwnds == []
+    assert nodes[0]["hwnd"] == roots[0].hwnd
+    assert nodes[0]["rect"] == roots[0].rect
+    assert nodes[0]["visible"] == roots[0].visible
+
+
+def test_engine_dump_node_builds_nested_children_up_to_max_depth():
+    api = FakeAPI()
+    api.windows[103] = {"pid": 42, "class": "Chrome_RenderWidgetHostHWND", "text": "", "parent": 102, "rect": (0, 620, 500, 700), "visible": True}
+    api.children[102] = [103]
+    engine = LayoutOnlyEngine(
+        logging.getLogger("test"),
+        LayoutSettingsV11(enabled=True, aggressive_mode=False),
+        LayoutRulesV11(),
+        api=api,
+        process_ids_provider=lambda _name: {42},
+    )
+
+    node = engine._dump.dump_node(100, 0, 6)
+    children = cast(List[Dict[str, Any]], node["children"])
+
+    assert [child["hwnd"] for child in children] == [101, 102]
+    assert children[1]["depth"] == 1
+    assert [grandchild["hwnd"] for grandchild in children[1]["children"]] == [103]
+    assert children[1]["children"][0]["depth"] == 2
+
+    shallow = engine._dump.dump_node(100, 0, 1)
+    assert [child["children"] for child in cast(List[Dict[str, Any]], shallow["children"])] == [[], []]
+
+
 def test_engine_error_log_map_is_pruned_when_many_unique_errors():
     api = FakeAPI()
     settings = LayoutSettingsV11(enabled=True, poll_interval_ms=100, aggressive_mode=True)
@@ -1905,6 +2831,27 @@ def test_engine_error_log_map_is_pruned_when_many_unique_errors():
     assert "error-599" in engine._last_log
 
 
+def test_engine_error_log_prune_keeps_recently_relogged_keys():
+    api = FakeAPI()
+    engine = LayoutOnlyEngine(
+        logging.getLogger("test"),
+        LayoutSettingsV11(enabled=True, poll_interval_ms=100, aggressive_mode=True),
+        LayoutRulesV11(log_rate_limit_seconds=0.0),
+        api=api,
+        process_ids_provider=lambda _name: {42},
+    )
+
+    for i in range(512):
+        engine._set_error(f"error-{i}")
+    engine._set_error("error-0")
+    engine._set_error("error-512")
+
+    assert "error-0" in engine._last_log
+    assert "error-1" not in engine._last_log
+    assert "error-512" in engine._last_log
+    assert list(engine._last_log)[-2:] == ["error-0", "error-512"]
+
+
 def test_engine_set_error_is_thread_safe_under_stress():
     api = FakeAPI()
     settings = LayoutSettingsV11(enabled=True, poll_interval_ms=100, aggressive_mode=True)
@@ -9,6 +9,8 @@ class DummyAPI:
     def __init__(self):
         self.calls = []
         self.rects = {}
+        self.batches = []
+        self.defer_ok = False
 
     def update_window(self, hwnd):
         return True
@@ -21,6 +23,12 @@ class DummyAPI:
     def get_window_rect(self, hwnd):
         return self.rects.get(hwnd)
 
+    def defer_window_positions(self, moves):
+        if not self.defer_ok:
+            return False
+        self.batches.append(list(moves))
+        return True
+
 
 def test_resize_formula_online_main_view():
     api = DummyAPI()
@@ -65,6 +73,48 @@ def test_resize_skipped_when_already_same_size():
     assert api.calls == []
 
 
+def test_resize_uses_caller_supplied_current_rect():
+    api = DummyAPI()
+
+    def fail_get_window_rect(hwnd):
+        raise AssertionError("current rect was supplied by the caller")
+
+    api.get_window_rect = fail_get_window_rect
+    rules = LayoutRulesV11()
+    engine = LayoutEngine(api, rules, logging.getLogger("test"))
+
+    ok = engine.apply_view_resize(
+        child_hwnd=301,
+        window_text="OnlineMainView_0x99",
+        parent_rect=(0, 0, 500, 700),
+        current_rect=(0, 0, 498, 669),
+    )
+    assert ok is False
+    assert api.calls == []
+
+
+def test_view_moves_are_batched_when_api_can_defer_window_positions():
+    api = DummyAPI()
+    rules = LayoutRulesV11()
+    engine = LayoutEngine(api, rules, logging.getLogger("test"))
+    online_move = engine.view_resize_move(101, "OnlineMainView_0x10", (0, 0, 500, 700))
+    lock_move = engine.view_resize_move(201, "LockModeView_0x20", (0, 0, 500, 700))
+    assert online_move == (101, 0, 0, 498, 669, SWP_NOMOVE)
+    assert lock_move == (201, 0, 0, 498, 700, SWP_NOMOVE)
+    assert engine.view_resize_move(301, "OtherView", (0, 0, 500, 700)) is None
+    assert online_move is not None and lock_move is not None
+    moves = [online_move, lock_move]
+
+    api.defer_ok = True
+    assert engine.apply_view_moves(moves) == 2
+    assert api.batches == [moves]
+    assert api.calls == []
+
+    api.defer_ok = False
+    assert engine.apply_view_moves(moves) == 2
+    assert api.calls == moves
+
+
 def test_aggressive_banner_heuristic():
     api = DummyAPI()
     rules = LayoutRulesV11()
@@ -122,3 +172,37 @@ def test_contains_ad_token_in_texts_checks_multiple_texts():
 
     assert engine.contains_ad_token_in_texts(["header", "광고 배너"]) is True
     assert engine.contains_ad_token_in_texts(["header", "footer"]) is False
+    assert engine.contains_ad_token_in_texts(["header", "ad"]) is True
+    assert engine.contains_ad_token_in_texts(["reada", "d"]) is False
+    assert engine.contains_ad_token_in_texts([]) is False
+
+
+def test_contains_ad_token_tracks_rule_token_changes():
+    rules = LayoutRulesV11(aggressive_ad_tokens=["AdFit"])
+    engine = LayoutEngine(DummyAPI(), rules, logging.getLogger("test"))
+
+    assert engine.contains_ad_token("adfit-banner") is True
+    assert engine.contains_ad_token("Sponsored") is False
+    assert engine._ad_token_pattern() is engine._ad_token_pattern()
+
+    rules.aggressive_ad_tokens = ["", "Sponsored"]
+    assert engine.contains_ad_token("adfit-banner") is False
+    assert engine.contains_ad_token("Sponsored") is True
+
+    rules.aggressive_ad_tokens = [""]
+    assert engine.contains_ad_token("anything") is False
+
+
+def test_chrome_widget_class_follows_configured_prefixes():
+    rules = LayoutRulesV11()
+    engine = LayoutEngine(DummyAPI(), rules, logging.getLogger("test"))
+
+    assert engine.is_chrome_widget_class("Chrome_WidgetWin_1") is True
+    assert engine.is_chrome_widget_class("EVA_ChildWindow") is False
+
+    rules.chrome_widget_prefixes = ["EVA_Child"]
+    assert engine.is_chrome_widget_class("Chrome_WidgetWin_1") is False
+    assert engine.is_chrome_widget_class("EVA_ChildWindow") is True
+
+    rules.chrome_widget_prefixes.append("Chrome_WidgetWin_")
+    assert engine.is_chrome_widget_class("Chrome_WidgetWin_1") is True
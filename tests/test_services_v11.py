@@ -12,16 +12,20 @@ def test_startup_manager_build_command_includes_startup_launch(monkeypatch):
 
 def test_process_inspector_isolates_per_process_psutil_errors(monkeypatch):
     class BrokenProc:
-        @property
-        def info(self):
+        pid = 13
+
+        def name(self):
             raise RuntimeError("denied")
 
     class GoodProc:
-        info = {"pid": 4242, "name": "kakaotalk.exe"}
+        pid = 4242
+
+        def name(self):
+            return "kakaotalk.exe"
 
     class FakePsutil:
         @staticmethod
-        def process_iter(_attrs):
+        def process_iter():
             return [BrokenProc(), GoodProc()]
 
     monkeypatch.setattr(services, "PSUTIL_AVAILABLE", True)
@@ -33,17 +37,81 @@ def test_process_inspector_isolates_per_process_psutil_errors(monkeypatch):
     assert services.ProcessInspector.consume_last_warning() == ""
 
 
+def test_psutil_is_imported_once_on_first_process_lookup(monkeypatch):
+    class FakePsutil:
+        @staticmethod
+        def process_iter():
+            return []
+
+    imports = []
+
+    def fake_import_module(name):
+        imports.append(name)
+        return FakePsutil
+
+    monkeypatch.setattr(services, "psutil", services._PSUTIL_UNLOADED)
+    monkeypatch.setattr(services, "PSUTIL_AVAILABLE", False)
+    monkeypatch.setattr(services.importlib, "import_module", fake_import_module)
+
+    assert imports == []
+    assert services._load_psutil() is FakePsutil
+    assert services._load_psutil() is FakePsutil
+    assert imports == ["psutil"]
+    assert services.PSUTIL_AVAILABLE is True
+
+
+def test_process_inspector_revalidates_cached_pids_instead_of_full_scan(monkeypatch):
+    calls = {"iter": 0}
+    names = {4242: "KakaoTalk.exe"}
+
+    class Proc:
+        def __init__(self, pid):
+            if pid not in names:
+                raise RuntimeError("no such process")
+            self.pid = pid
+
+        def name(self):
+            return names[self.pid]
+
+    class FakePsutil:
+        Process = Proc
+
+        @staticmethod
+        def process_iter():
+            calls["iter"] += 1
+            return [Proc(pid) for pid in names]
+
+    monkeypatch.setattr(services, "PSUTIL_AVAILABLE", True)
+    monkeypatch.setattr(services, "psutil", FakePsutil)
+
+    assert services.ProcessInspector.get_process_ids("kakaotalk.exe") == {4242}
+    assert services.ProcessInspector.get_process_ids("kakaotalk.exe") == {4242}
+    assert calls["iter"] == 1
+
+    names[4242] = "notepad.exe"
+    assert services.ProcessInspector.get_process_ids("kakaotalk.exe") == set()
+    assert calls["iter"] == 2
+    assert "kakaotalk.exe" not in services.ProcessInspector._pid_cache
+
+    names[4242] = "kakaotalk.exe"
+    services.ProcessInspector.get_process_ids("kakaotalk.exe")
+    cached_at, cached_pids = services.ProcessInspector._pid_cache["kakaotalk.exe"]
+    services.ProcessInspector._pid_cache["kakaotalk.exe"] = (cached_at - 60.0, cached_pids)
+    services.ProcessInspector.get_process_ids("kakaotalk.exe")
+    assert calls["iter"] == 4
+
+
 def test_process_inspector_falls_back_to_tasklist_when_psutil_init_fails(monkeypatch):
     class BrokenPsutil:
         @staticmethod
-        def process_iter(_attrs):
+        def process_iter():
             raise RuntimeError("psutil unavailable")
 
     called = {"tasklist": 0}
 
     class Result:
         returncode = 0
-        stdout = '"kakaotalk.exe","5000","Console","1","10,000 K"\n'
+        stdout = b'"KakaoTalk.exe","5000","Console","1","10,000 K"\r\n"other.exe","6000","Console","1","1 K"\r\n'
 
     def fake_run(*_args, **_kwargs):
         called["tasklist"] += 1
@@ -62,15 +130,83 @@ def test_process_inspector_falls_back_to_tasklist_when_psutil_init_fails(monkeyp
     assert "tasklist fallback" in warning
 
 
+def test_process_inspector_prefers_toolhelp_snapshot_over_psutil_and_tasklist(monkeypatch):
+    class UnusedPsutil:
+        @staticmethod
+        def process_iter():
+            raise AssertionError("psutil should not run when the snapshot succeeds")
+
+    def fail_run(*_args, **_kwargs):
+        raise AssertionError("tasklist should not run when the snapshot succeeds")
+
+    monkeypatch.setattr(services, "PSUTIL_AVAILABLE", True)
+    monkeypatch.setattr(services, "psutil", UnusedPsutil)
+    monkeypatch.setattr(services.subprocess, "run", fail_run)
+    monkeypatch.setattr(services.ProcessInspector, "_snapshot_process_ids", staticmethod(lambda _name: {7000}))
+
+    pids = services.ProcessInspector.get_process_ids("kakaotalk.exe")
+
+    assert pids == {7000}
+    assert services.ProcessInspector.consume_last_warning() == ""
+
+
+def test_process_inspector_revalidates_snapshot_pids_with_held_handles(monkeypatch):
+    class FakeKernel32:
+        exit_codes = {}
+        closed = []
+
+        @staticmethod
+        def OpenProcess(_access, _inherit, pid):
+            handle = 9000 + pid
+            FakeKernel32.exit_codes[handle] = services._STILL_ACTIVE
+            return handle
+
+        @staticmethod
+        def GetExitCodeProcess(handle, exit_code_ref):
+            exit_code_ref._obj.value = FakeKernel32.exit_codes[handle]
+            return True
+
+        @staticmethod
+        def CloseHandle(handle):
+            FakeKernel32.closed.append(handle)
+            return True
+
+    snapshots = []
+
+    def fake_snapshot(_name):
+        snapshots.append(1)
+        return {7000}
+
+    monkeypatch.setattr(services, "PSUTIL_AVAILABLE", False)
+    monkeypatch.setattr(services, "psutil", None)
+    monkeypatch.setattr(services, "_kernel32_process_api", lambda: FakeKernel32)
+    monkeypatch.setattr(services.ProcessInspector, "_snapshot_process_ids", staticmethod(fake_snapshot))
+
+    assert services.ProcessInspector.get_process_ids("kakaotalk.exe") == {7000}
+    assert services.ProcessInspector.get_process_ids("kakaotalk.exe") == {7000}
+    assert len(snapshots) == 1
+
+    FakeKernel32.exit_codes[16000] = 0
+    assert services.ProcessInspector.get_process_ids("kakaotalk.exe") == {7000}
+    assert len(snapshots) == 2
+    assert FakeKernel32.closed == [16000]
+
+
+def test_process_inspector_snapshot_is_skipped_off_windows(monkeypatch):
+    monkeypatch.setattr(services.os, "name", "posix")
+
+    assert services.ProcessInspector._snapshot_process_ids("kakaotalk.exe") is None
+
+
 def test_process_inspector_consume_warning_clears_buffer(monkeypatch):
     class BrokenPsutil:
         @staticmethod
-        def process_iter(_attrs):
+        def process_iter():
             raise RuntimeError("psutil unavailable")
 
     class Result:
         returncode = 0
-        stdout = ""
+        stdout = b""
 
     monkeypatch.setattr(services, "PSUTIL_AVAILABLE", True)
     monkeypatch.setattr(services, "psutil", BrokenPsutil)
@@ -84,6 +220,13 @@ def test_process_inspector_consume_warning_clears_buffer(monkeypatch):
     assert second == ""
 
 
+def test_process_inspector_parses_tasklist_bytes_without_decoding():
+    stdout = "정보: 지정된 조건에 일치하는 작업이 없습니다.\r\n".encode("cp949") + b'"kakaotalk.exe","77","Console","1","1 K"\r\n'
+
+    assert services.ProcessInspector._parse_tasklist_pids(stdout, "kakaotalk.exe") == {77}
+    assert services.ProcessInspector._parse_tasklist_pids(b'"kakaotalk.exe","N/A"\r\n', "kakaotalk.exe") == set()
+
+
 def test_process_inspector_probe_tasklist_success(monkeypatch):
     class Result:
         returncode = 0
@@ -180,6 +323,52 @@ def test_startup_manager_probe_access_failure_on_write(monkeypatch):
     assert "write failed" in detail
 
 
+def test_startup_manager_is_enabled_caches_until_written(monkeypatch):
+    class FakeWinreg:
+        HKEY_CURRENT_USER = object()
+        KEY_READ = 0x20019
+        KEY_SET_VALUE = 0x0002
+        REG_SZ = 1
+        values = {"KakaoTalkAdBlockerLayout": "cmd"}
+        queries = 0
+        closed = 0
+
+        @staticmethod
+        def OpenKey(*_args, **_kwargs):
+            return "k"
+
+        @staticmethod
+        def QueryValueEx(_key, name):
+            FakeWinreg.queries += 1
+            return (FakeWinreg.values[name], FakeWinreg.REG_SZ)
+
+        @staticmethod
+        def DeleteValue(_key, name):
+            FakeWinreg.values.pop(name)
+
+        @staticmethod
+        def CloseKey(_key):
+            FakeWinreg.closed += 1
+
+    monkeypatch.setattr(services, "WINREG_AVAILABLE", True)
+    monkeypatch.setattr(services, "winreg", FakeWinreg)
+
+    assert services.StartupManager.is_enabled() is True
+    assert services.StartupManager.is_enabled() is True
+    assert FakeWinreg.queries == 1
+
+    assert services.StartupManager.set_enabled(False) is True
+    assert services.StartupManager.is_enabled() is False
+    assert FakeWinreg.queries == 1
+    assert FakeWinreg.closed == 2
+
+    assert services.StartupManager._enabled_cache is not None
+    cached_at, enabled = services.StartupManager._enabled_cache
+    services.StartupManager._enabled_cache = (cached_at - 60.0, enabled)
+    assert services.StartupManager.is_enabled() is False
+    assert FakeWinreg.queries == 2
+
+
 def test_startup_manager_sync_registration_command_updates_stale_value(monkeypatch):
     class FakeWinreg:
         HKEY_CURRENT_USER = object()
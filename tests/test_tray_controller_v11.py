@@ -533,6 +533,41 @@ def test_status_update_skips_redundant_set(monkeypatch):
     assert calls["set"] == 1
 
 
+def test_forced_status_updates_coalesce_until_idle(monkeypatch):
+    monkeypatch.setattr(TrayController, "_build_window", lambda self: None)
+
+    class IdleRoot(FakeRoot):
+        def __init__(self):
+            super().__init__()
+            self.idle_calls = []
+
+        def after_idle(self, fn):
+            self.idle_calls.append(fn)
+
+    root = IdleRoot()
+    settings = LayoutSettingsV11(enabled=True)
+    monkeypatch.setattr(settings, "save", lambda _path=None: None)
+    controller = TrayController(root, FakeEngine(), settings, logging.getLogger("test"))
+    sets = []
+    monkeypatch.setattr(controller._status_var, "set", sets.append)
+
+    controller.toggle_blocking()
+    controller.reset_restore_failures()
+    controller._report_ui_action_failure("open_log_folder", "log folder open failed")
+
+    assert len(root.idle_calls) == 1
+    assert sets == []
+
+    root.idle_calls.pop()()
+
+    assert len(sets) == 1
+    assert "상태: OFF" in sets[0]
+    assert "log folder open failed" in sets[0]
+
+    controller.toggle_blocking()
+    assert len(root.idle_calls) == 1
+
+
 def test_queue_bridge_processes_callbacks_in_order(monkeypatch):
     monkeypatch.setattr(TrayController, "_build_window", lambda self: None)
     root = FakeRoot()
@@ -550,6 +585,28 @@ def test_queue_bridge_processes_callbacks_in_order(monkeypatch):
     assert calls == ["a", "b", "c"]
 
 
+def test_queue_bridge_drains_backlog_in_batches_without_waiting(monkeypatch):
+    monkeypatch.setattr(TrayController, "_build_window", lambda self: None)
+    root = FakeRoot()
+    engine = FakeEngine()
+    settings = LayoutSettingsV11(enabled=True)
+    controller = TrayController(root, engine, settings, logging.getLogger("test"))
+
+    calls = []
+    controller._ui_queue_running = True
+    controller._ui_queue_batch_size = 2
+    for index in range(3):
+        controller._safe_after(lambda index=index: calls.append(index))
+
+    controller._drain_ui_queue()
+    assert calls == [0, 1]
+    assert root._after_calls[-1] == (0, controller._drain_ui_queue)
+
+    controller._drain_ui_queue()
+    assert calls == [0, 1, 2]
+    assert root._after_calls[-1] == (50, controller._drain_ui_queue)
+
+
 def test_menu_reset_restore_failures_calls_engine(monkeypatch):
     monkeypatch.setattr(TrayController, "_build_window", lambda self: None)
     root = FakeRoot()
@@ -629,6 +686,26 @@ def test_tick_status_swallow_after_error(monkeypatch):
     assert True
 
 
+def test_tick_status_skips_label_refresh_while_window_hidden(monkeypatch):
+    monkeypatch.setattr(TrayController, "_build_window", lambda self: None)
+    root = FakeRoot()
+    controller = TrayController(root, FakeEngine(), LayoutSettingsV11(enabled=True), logging.getLogger("test"))
+    sets = []
+    monkeypatch.setattr(controller._status_var, "set", sets.append)
+
+    controller.hide_window()
+    controller._tick_status()
+
+    assert sets == []
+    assert root._after_calls[-1][0] == 5000
+
+    controller.show_window()
+    assert len(sets) == 1
+
+    controller._tick_status()
+    assert root._after_calls[-1][0] == 1000
+
+
 def test_load_tray_modules_retries_after_ttl(monkeypatch):
     import kakao_adblocker.ui as ui
 
@@ -719,6 +796,36 @@ def test_setup_tray_marks_available_when_ready(monkeypatch):
     controller.stop_tray()
 
 
+def test_create_icon_draws_once_and_reuses_image(monkeypatch):
+    import kakao_adblocker.ui as ui
+
+    monkeypatch.setattr(TrayController, "_build_window", lambda self: None)
+    created = []
+
+    class FakeDraw:
+        def polygon(self, *_args, **_kwargs):
+            pass
+
+        def line(self, *_args, **_kwargs):
+            pass
+
+    def new_image(*args, **_kwargs):
+        created.append(args)
+        return object()
+
+    image_mod = types.SimpleNamespace(new=new_image)
+    draw_mod = types.SimpleNamespace(Draw=lambda _img: FakeDraw())
+    monkeypatch.setattr(ui, "_require_tray_modules", lambda: (types.SimpleNamespace(), image_mod, draw_mod))
+
+    controller = TrayController(FakeRoot(), FakeEngine(), LayoutSettingsV11(enabled=True), logging.getLogger("test"))
+
+    first = controller._create_icon()
+    second = controller._create_icon()
+
+    assert first is second
+    assert len(created) == 1
+
+
 def test_setup_tray_marks_unavailable_on_ready_timeout(monkeypatch):
     import kakao_adblocker.ui as ui
 
@@ -1,7 +1,20 @@
 import ctypes
+import threading
+import time
 from ctypes import wintypes
 
-from kakao_adblocker.win32_api import Win32API
+from kakao_adblocker.win32_api import (
+    EVENT_OBJECT_CREATE,
+    EVENT_OBJECT_LOCATIONCHANGE,
+    EVENT_OBJECT_NAMECHANGE,
+    EVENT_OBJECT_SHOW,
+    GW_CHILD,
+    GW_HWNDNEXT,
+    SWP_NOMOVE,
+    SWP_NOZORDER,
+    Win32API,
+    WinEventWatcher,
+)
 
 
 class _FakeFunc:
@@ -18,6 +31,8 @@ class _FakeUser32:
         self.GetClassNameW = _FakeFunc()
         self.GetWindowTextW = _FakeFunc()
         self.GetParent = _FakeFunc()
+        self.GetWindow = _FakeFunc()
+        self.FindWindowExW = _FakeFunc()
         self.GetWindowRect = _FakeFunc()
         self.GetClientRect = _FakeFunc()
         self.IsWindow = _FakeFunc()
@@ -27,21 +42,35 @@ class _FakeUser32:
         self.SendMessageW = _FakeFunc()
         self.SendMessageTimeoutW = _FakeFunc()
         self.UpdateWindow = _FakeFunc()
+        self.BeginDeferWindowPos = _FakeFunc()
+        self.DeferWindowPos = _FakeFunc()
+        self.EndDeferWindowPos = _FakeFunc()
+        self.SetWinEventHook = _FakeFunc()
+        self.UnhookWinEvent = _FakeFunc()
+        self.GetMessageW = _FakeFunc()
+        self.PeekMessageW = _FakeFunc()
+        self.PostThreadMessageW = _FakeFunc()
 
 
 def test_bind_signatures_sets_argtypes_and_restypes():
     api = Win32API.__new__(Win32API)
     api.user32 = _FakeUser32()
     api.WNDENUMPROC = object()
+    api.WINEVENTPROC = object()
 
     api._bind_signatures()
 
     assert api.user32.EnumWindows.argtypes == [api.WNDENUMPROC, wintypes.LPARAM]
     assert api.user32.EnumChildWindows.argtypes == [wintypes.HWND, api.WNDENUMPROC, wintypes.LPARAM]
     assert api.user32.GetClassNameW.restype == ctypes.c_int
+    assert api.user32.GetWindow.argtypes == [wintypes.HWND, wintypes.UINT]
     assert api.user32.GetWindowTextW.restype == ctypes.c_int
     assert api.user32.SetWindowPos.restype == wintypes.BOOL
     assert api.user32.SendMessageTimeoutW.restype == getattr(wintypes, "LRESULT", ctypes.c_long)
+    assert api._dword_ptr_value_t is getattr(wintypes, "DWORD_PTR", ctypes.c_size_t)
+    assert api.user32.SetWinEventHook.argtypes[3] is api.WINEVENTPROC
+    assert api.user32.DeferWindowPos.restype == wintypes.HANDLE
+    assert api.user32.PostThreadMessageW.restype == wintypes.BOOL
 
 
 def test_get_last_error_returns_zero_when_unavailable():
@@ -58,3 +87,361 @@ def test_get_last_error_reads_ctypes_when_available(monkeypatch):
     monkeypatch.setattr(ctypes, "get_last_error", lambda: 321)
 
     assert api.get_last_error() == 321
+
+
+def test_enum_windows_reuses_one_thunk_and_dispatches_by_lparam():
+    api = Win32API()
+    api.available = True
+    api._enum_thunk = api._dispatch_enum
+    api.user32 = _FakeUser32()
+    thunks = []
+
+    def fake_enum_windows(thunk, lparam):
+        thunks.append(thunk)
+        return all(thunk(hwnd, lparam) for hwnd in (1, 2, 3))
+
+    def fake_enum_child_windows(parent, thunk, lparam):
+        thunks.append(thunk)
+        for hwnd in (parent + 1, parent + 2):
+            thunk(hwnd, lparam)
+        return True
+
+    api.user32.EnumWindows = fake_enum_windows
+    api.user32.EnumChildWindows = fake_enum_child_windows
+    seen = []
+    children = []
+
+    def top_level(hwnd):
+        seen.append(hwnd)
+        api.enum_child_windows(hwnd * 10, lambda child: children.append(child) or True)
+        return hwnd < 2
+
+    assert api.enum_windows(top_level) is False
+    assert seen == [1, 2]
+    assert children == [11, 12, 21, 22]
+    assert all(thunk is api._enum_thunk for thunk in thunks)
+    assert api._enum_callbacks == {}
+    assert api._dispatch_enum(1, 999) is False
+
+
+def test_enum_child_handles_collects_without_python_callback():
+    api = Win32API()
+    api.available = True
+    api._collect_thunk = api._collect_enum
+    api.user32 = _FakeUser32()
+
+    def fake_enum_child_windows(parent, thunk, lparam):
+        assert thunk is api._collect_thunk
+        for hwnd in (parent + 1, parent + 2):
+            thunk(hwnd, lparam)
+        return True
+
+    api.user32.EnumChildWindows = fake_enum_child_windows
+
+    assert api.enum_child_handles(100) == [101, 102]
+    assert api._enum_collectors == {}
+    assert api._collect_enum(1, 999) is False
+    assert Win32API().enum_child_handles(100) == []
+
+
+def test_enum_direct_children_walks_sibling_chain():
+    api = Win32API()
+    api.available = True
+    api.user32 = _FakeUser32()
+    links = {(100, GW_CHILD): 101, (101, GW_HWNDNEXT): 102, (102, GW_HWNDNEXT): None, (101, GW_CHILD): 103}
+    api.user32.GetWindow = lambda hwnd, cmd: links.get((hwnd, cmd))
+
+    assert api.enum_direct_children(100) == [101, 102]
+    assert api.enum_direct_children(102) == []
+    assert Win32API().enum_direct_children(100) == []
+
+
+def test_string_and_pid_reads_reuse_thread_buffers_without_stale_values():
+    api = Win32API()
+    api.available = True
+    api.user32 = _FakeUser32()
+    class_names = {100: "EVA_Window_Dblclk"}
+    pids = {100: 42}
+
+    def fake_get_class_name(hwnd, buf, size):
+        value = class_names.get(hwnd, "")
+        for index, char in enumerate(value):
+            buf[index] = char
+        if value:
+            buf[len(value)] = "\0"
+        return len(value)
+
+    def fake_get_pid(hwnd, pid_ref):
+        if hwnd in pids:
+            pid_ref._obj.value = pids[hwnd]
+        return 1
+
+    api.user32.GetClassNameW = fake_get_class_name
+    api.user32.GetWindowThreadProcessId = fake_get_pid
+
+    assert api.get_class_name(100) == "EVA_Window_Dblclk"
+    first_buffer = api._buffers.class_name
+    assert api.get_class_name(999) == ""
+    assert api._buffers.class_name is first_buffer
+    assert api.get_window_thread_process_id(100) == 42
+    assert api.get_window_thread_process_id(999) == 0
+
+
+def test_rect_and_pid_reads_reuse_prebuilt_out_param_refs():
+    api = Win32API()
+    api.available = True
+    api.user32 = _FakeUser32()
+    rects = {100: (1, 2, 30, 40)}
+    refs = []
+
+    def fake_get_window_rect(hwnd, rect_ref):
+        refs.append(rect_ref)
+        if hwnd not in rects:
+            return False
+        rect = rect_ref._obj
+        rect.left, rect.top, rect.right, rect.bottom = rects[hwnd]
+        return True
+
+    def fake_get_pid(hwnd, pid_ref):
+        refs.append(pid_ref)
+        pid_ref._obj.value = 42
+        return 1
+
+    api.user32.GetWindowRect = fake_get_window_rect
+    api.user32.GetWindowThreadProcessId = fake_get_pid
+
+    assert api.get_window_rect(100) == (1, 2, 30, 40)
+    assert api.get_window_rect(999) is None
+    assert api.get_window_thread_process_id(100) == 42
+    assert api.get_window_thread_process_id(100) == 42
+    assert refs[0] is refs[1]
+    assert refs[2] is refs[3]
+
+
+def test_find_top_level_windows_walks_find_window_ex_chain():
+    api = Win32API()
+    api.available = True
+    api.user32 = _FakeUser32()
+    chain = {None: 500, 500: 600, 600: None}
+    calls = []
+
+    def fake_find_window_ex(parent, after, class_name, title):
+        calls.append((parent, after, class_name, title))
+        return chain.get(after)
+
+    api.user32.FindWindowExW = fake_find_window_ex
+
+    assert api.find_top_level_windows("EVA_Window") == [500, 600]
+    assert calls[0] == (None, None, "EVA_Window", None)
+    assert api.find_top_level_windows("") == []
+    assert Win32API().find_top_level_windows("EVA_Window") == []
+
+
+def test_find_child_windows_filters_direct_children_by_class():
+    api = Win32API()
+    api.available = True
+    api.user32 = _FakeUser32()
+    chain = {None: 701, 701: 702, 702: None}
+    calls = []
+
+    def fake_find_window_ex(parent, after, class_name, title):
+        calls.append((parent, after, class_name, title))
+        return chain.get(after)
+
+    api.user32.FindWindowExW = fake_find_window_ex
+
+    assert api.find_child_windows(700, "EVA_ChildWindow") == [701, 702]
+    assert calls == [
+        (700, None, "EVA_ChildWindow", None),
+        (700, 701, "EVA_ChildWindow", None),
+        (700, 702, "EVA_ChildWindow", None),
+    ]
+    assert api.find_child_windows(0, "EVA_ChildWindow") == []
+
+
+def test_defer_window_positions_batches_moves_and_reports_failed_batches():
+    api = Win32API()
+    api.available = True
+    api.user32 = _FakeUser32()
+    deferred = []
+    ended = []
+    api.user32.BeginDeferWindowPos = lambda count: 500
+    api.user32.DeferWindowPos = lambda hdwp, hwnd, after, x, y, w, h, flags: deferred.append((hdwp, hwnd, w, h, flags)) or hdwp + 1
+    api.user32.EndDeferWindowPos = lambda hdwp: ended.append(hdwp) or True
+
+    moves = [(101, 0, 0, 498, 669, SWP_NOMOVE), (102, 0, 0, 498, 700, SWP_NOMOVE)]
+    assert api.defer_window_positions(moves) is True
+    assert deferred == [
+        (500, 101, 498, 669, SWP_NOMOVE),
+        (501, 102, 498, 700, SWP_NOMOVE),
+    ]
+    assert ended == [502]
+
+    api.user32.DeferWindowPos = lambda *args: None
+    assert api.defer_window_positions(moves) is False
+    assert ended == [502]
+    assert api.defer_window_positions([]) is False
+    assert Win32API().defer_window_positions(moves) is False
+
+
+def test_defer_window_positions_keeps_single_window_z_order_semantics():
+    api = Win32API()
+    api.available = True
+    api.user32 = _FakeUser32()
+    single = []
+    batched = []
+    api.user32.SetWindowPos = lambda hwnd, after, x, y, w, h, flags: single.append((hwnd, after, flags)) or True
+    api.user32.BeginDeferWindowPos = lambda count: 500
+    api.user32.DeferWindowPos = lambda hdwp, hwnd, after, x, y, w, h, flags: batched.append((hwnd, after, flags)) or hdwp + 1
+    api.user32.EndDeferWindowPos = lambda hdwp: True
+
+    moves = [(101, 0, 0, 498, 669, SWP_NOMOVE), (102, 0, 0, 498, 700, SWP_NOMOVE | SWP_NOZORDER)]
+    for hwnd, x, y, width, height, flags in moves:
+        assert api.set_window_pos(hwnd, x, y, width, height, flags) is True
+    assert api.defer_window_positions(moves) is True
+
+    assert batched == single
+
+
+def test_win_event_watcher_forwards_window_events_and_rehooks_on_pid_change():
+    api = Win32API()
+    api.available = True
+    api.user32 = _FakeUser32()
+    api.WINEVENTPROC = lambda fn: fn
+    posted = []
+    hooks = []
+    unhooked = []
+    api.user32.PostThreadMessageW = lambda thread_id, msg, wparam, lparam: posted.append((thread_id, msg)) or True
+
+    def fake_set_hook(event_min, event_max, module, thunk, pid, thread_id, flags):
+        hooks.append((event_min, event_max, pid, flags))
+        return len(hooks)
+
+    api.user32.SetWinEventHook = fake_set_hook
+    api.user32.UnhookWinEvent = lambda hook: unhooked.append(hook) or True
+    events = []
+    watcher = api.create_win_event_watcher(lambda event, hwnd: events.append((event, hwnd)))
+    assert isinstance(watcher, WinEventWatcher)
+
+    watcher._dispatch(1, EVENT_OBJECT_SHOW, 100, 0, 0, 7, 0)
+    watcher._dispatch(1, EVENT_OBJECT_LOCATIONCHANGE, 100, -9, 0, 7, 0)
+    watcher._dispatch(1, EVENT_OBJECT_LOCATIONCHANGE, 0, 0, 0, 7, 0)
+    assert events == [(EVENT_OBJECT_SHOW, 100)]
+
+    watcher.set_pids({42, 0})
+    assert posted == []
+    watcher._thread_id = 77
+    watcher._rehook()
+    assert [(hook[0], hook[1], hook[2]) for hook in hooks] == [
+        (EVENT_OBJECT_CREATE, EVENT_OBJECT_SHOW, 42),
+        (EVENT_OBJECT_LOCATIONCHANGE, EVENT_OBJECT_NAMECHANGE, 42),
+    ]
+    watcher.set_pids({42})
+    assert posted == []
+    watcher.set_pids({43})
+    assert len(posted) == 1 and posted[0][0] == 77
+    watcher._rehook()
+    assert unhooked == [1, 2]
+    assert Win32API().create_win_event_watcher(lambda event, hwnd: None) is None
+
+
+def test_win_event_watcher_reports_active_only_when_every_pid_is_hooked():
+    api = Win32API()
+    api.available = True
+    api.user32 = _FakeUser32()
+    api.WINEVENTPROC = lambda fn: fn
+    api.user32.PostThreadMessageW = lambda thread_id, msg, wparam, lparam: True
+    api.user32.UnhookWinEvent = lambda hook: True
+    denied_pids = {43}
+    hooks = []
+
+    def fake_set_hook(event_min, event_max, module, thunk, pid, thread_id, flags):
+        # SetWinEventHook returns NULL when UIPI keeps the hook from reaching the process.
+        if pid in denied_pids:
+            return 0
+        hooks.append(pid)
+        return len(hooks)
+
+    api.user32.SetWinEventHook = fake_set_hook
+    watcher = api.create_win_event_watcher(lambda event, hwnd: None)
+    assert watcher is not None
+
+    watcher._thread_id = 77
+    assert watcher.is_active() is False
+    watcher.set_pids({42})
+    assert watcher.is_active() is False
+    watcher._rehook()
+    assert watcher.is_active() is True
+
+    watcher.set_pids({42, 43})
+    assert watcher.is_active() is False
+    watcher._rehook()
+    assert watcher._hooked_pids == {42}
+    assert watcher.is_active() is False
+
+    denied_pids.clear()
+    watcher._rehook()
+    assert watcher.is_active() is True
+    watcher._thread_id = 0
+    assert watcher.is_active() is False
+
+
+def test_win_event_watcher_start_returns_without_waiting_for_the_pump_thread():
+    api = Win32API()
+    api.available = True
+    api.user32 = _FakeUser32()
+    api.WINEVENTPROC = lambda fn: fn
+    release = threading.Event()
+    peeked = threading.Event()
+
+    def slow_peek(msg, hwnd, first, last, remove):
+        # The pump thread is held up before it owns a queue or hooks anything.
+        peeked.set()
+        release.wait(5.0)
+        return False
+
+    api.user32.PeekMessageW = slow_peek
+    api.user32.PostThreadMessageW = lambda thread_id, msg, wparam, lparam: True
+    api.user32.GetMessageW = lambda msg, hwnd, first, last: 0
+    api.user32.SetWinEventHook = lambda *args: 1
+    api.user32.UnhookWinEvent = lambda hook: True
+    watcher = api.create_win_event_watcher(lambda event, hwnd: None)
+    assert watcher is not None
+    watcher.set_pids({42})
+
+    started_at = time.monotonic()
+    assert watcher.start() is True
+    assert time.monotonic() - started_at < 0.5
+    assert peeked.wait(5.0)
+    assert watcher.is_active() is False
+
+    release.set()
+    watcher.stop()
+    assert watcher.is_active() is False
+
+
+def test_win_event_watcher_stop_before_pump_thread_id_is_published_exits_pump():
+    api = Win32API()
+    api.available = True
+    api.user32 = _FakeUser32()
+    api.WINEVENTPROC = lambda fn: fn
+    posted = []
+    api.user32.PostThreadMessageW = lambda thread_id, msg, wparam, lparam: posted.append(msg) or True
+    api.user32.PeekMessageW = lambda msg, hwnd, first, last, remove: False
+
+    def fail(*_args):
+        raise AssertionError("a stopped watcher must not hook or pump")
+
+    api.user32.SetWinEventHook = fail
+    api.user32.GetMessageW = fail
+    watcher = api.create_win_event_watcher(lambda event, hwnd: None)
+    assert watcher is not None
+    watcher.set_pids({42})
+
+    # start() does not wait for the pump thread, so stop() can run before it has published its id.
+    watcher.stop()
+    assert posted == []
+    watcher._run()
+    assert watcher._thread_id == 0
+    assert watcher.is_active() is False
+    assert watcher.start() is False
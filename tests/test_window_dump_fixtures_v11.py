@@ -47,6 +47,27 @@ class FixtureAPI:
             callback(child)
         return True
 
+    def enum_child_handles(self, parent_hwnd):
+        return list(self.children.get(parent_hwnd, []))
+
+    def enum_direct_children(self, parent_hwnd):
+        return [child for child in self.children.get(parent_hwnd, []) if self.windows[child]["parent"] == parent_hwnd]
+
+    def find_top_level_windows(self, class_name):
+        # FindWindowExW matches class names case-insensitively.
+        return [
+            hwnd
+            for hwnd, info in sorted(self.windows.items())
+            if info["parent"] == 0 and info["class"].lower() == class_name.lower()
+        ]
+
+    def find_child_windows(self, parent_hwnd, class_name):
+        return [
+            child
+            for child in self.enum_direct_children(parent_hwnd)
+            if self.windows[child]["class"].lower() == class_name.lower()
+        ]
+
     def get_window_thread_process_id(self, hwnd):
         return self.windows[hwnd]["pid"]
 
@@ -84,6 +105,9 @@ class FixtureAPI:
     def update_window(self, hwnd):
         return hwnd in self.windows
 
+    def defer_window_positions(self, moves):
+        return False
+
     def send_message(self, hwnd, msg, wparam=0, lparam=0):
         self.send_calls.append((hwnd, msg, wparam, lparam))
         return 1
@@ -95,6 +119,9 @@ class FixtureAPI:
     def get_last_error(self):
         return 0
 
+    def create_win_event_watcher(self, on_event):
+        return None
+
 
 def _run_fixture(
     fixture_name: str,